@@ -10,9 +10,20 @@ except:
     from PySide6 import QtGui, QtWidgets, QtCore
     from shiboken6 import wrapInstance
 
+import bisect
+import fnmatch
+import json
+import os
+import re
 import sys
+import time
+try:
+    import numpy as np
+except ImportError:
+    np = None
 from maya.OpenMayaUI import MQtUtil
 import maya.cmds as cmds
+import maya.api.OpenMaya as om
 
 class HybridToolboxGUI(QtWidgets.QMainWindow):
     def __init__(self, windowName, parent = None):
@@ -26,18 +37,74 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
 
         # Variables
         self.deformersGroup = None
+        # Cached scene lookups for the selection tools, kept current by Maya callbacks while the window exists
+        self.sceneIndex = SceneIndex()
+        self.sceneIndex.install()
+        sceneIndex = self.sceneIndex
+        self.destroyed.connect(lambda: sceneIndex.uninstall())
+        self.blendShapeIndex = BlendShapeIndex(self.sceneIndex)
+        blendShapeIndex = self.blendShapeIndex
+        self.destroyed.connect(lambda: blendShapeIndex.uninstall())
+        self.nameAllocator = NameAllocator(self.sceneIndex)
+        self.controlShapes = ControlShapeLibrary()
+        self.controlShapeChoice = "circle"
+        self.customControlModeChoice = "selection"
         self.groupType = None
+        # UUIDs of the organizational groups found or created by checkGroups, keyed by group name
+        self.groupHandles = {}
         self.customColorChoice = 0
         self.useCustomColorChoice = False
+        self.colorOverrideChoice = "index"
+        self.customRGBChoice = (1.0, 1.0, 0.0)
+        self.colorScopeChoice = "selection"
+        # Control color presets as (name pattern, color) rules, first match wins. Colors are a palette index
+        # or an (r, g, b) tuple of 0-1 floats. Patterns are matched against the curve's transform name.
+        self.colorPresetRegistry = {
+            "Sides (Index)": [("L_*", 6), ("*_L_*", 6), ("*_L", 6), ("R_*", 13), ("*_R_*", 13), ("*_R", 13),
+                              ("C_*", 17), ("*_C_*", 17), ("*_C", 17)],
+            "Sides (RGB)": [("L_*", (0.0, 0.4, 1.0)), ("*_L_*", (0.0, 0.4, 1.0)), ("*_L", (0.0, 0.4, 1.0)),
+                            ("R_*", (1.0, 0.1, 0.1)), ("*_R_*", (1.0, 0.1, 0.1)), ("*_R", (1.0, 0.1, 0.1)),
+                            ("C_*", (1.0, 0.85, 0.0)), ("*_C_*", (1.0, 0.85, 0.0)), ("*_C", (1.0, 0.85, 0.0))],
+            "Global And Root": [("Global*", 17), ("*Root*", 21)],
+        }
+        self.colorPresetChoice = "Sides (Index)"
         self.selectSearchCurrentChoice = False
         self.addToSelectionChoice = False
+        self.chunkedSelectionChoice = False
+        self.chunkedTask = None
+        self.animPlaybackRangeChoice = False
+        self.animCurveTypeChoice = None
+        # Opt-in Maya call recording per toolbox action, shown in the Info tab
+        self.commandRecorder = CommandRecorder(cmds)
+        self.instrumentCallsChoice = False
+        self.instrumentHistoryChoice = 10
+        commandRecorder = self.commandRecorder
+        self.destroyed.connect(lambda: commandRecorder.uninstall())
+        # Every scene editing tool undoes as one step, or skips undo entirely in fast bulk mode
+        self.undoRunner = UndoRunner()
+        self.undoModeChoice = "chunk"
+        self.suspendRefreshChoice = False
+        # Light node types per renderer. Renderer specific types come first so they win over Maya's base "light" type.
+        self.lightTypeRegistry = {
+            "Redshift": ["RedshiftPhysicalLight", "RedshiftDomeLight", "RedshiftIESLight", "RedshiftPortalLight"],
+            "VRay": ["VRayLightRectShape", "VRayLightDomeShape", "VRayLightIESShape", "VRayLightSphereShape"],
+            "Maya": ["light"],
+        }
         self.objectCleanup = False
+        self.clusterModeChoice = "cluster"
+        self.curveFitChoice = "none"
+        self.curveFitCountChoice = 8
+        self.curveFitToleranceChoice = 0.1
+        self.centerModeChoice = "average"
+        self.centerPerIslandChoice = False
+        self.locatorOutputChoice = "locators"
 
         self.jointAxisChoice = "X"
         self.jointNumberChoice = 10
         self.jointSpacingChoice = 1.0000
         self.jointOrientationChoice = "xyz"
         self.jointSecondaryChoice = "yup"
+        self.jointResampleChoice = False
 
         self.transformsArray = []
         self.locatorsArray = []
@@ -93,7 +160,31 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
         self.sceneInfoCreateGUI()
         self.getSceneInfo()
 
+        sceneEditingTools = [
+            "createLocatorsAtVerts", "expandMarkers", "locatorAtCenterVerts", "setCustomControlColor",
+            "createGlobalControl", "createLibraryControls", "createCustomControl", "applyColorPreset",
+            "createCurveAtObjects", "clusterAtCV", "jointsAtCVs", "jointsAtObjects", "createJointChain",
+            "createMultipleConstraints", "convertConstraintsToAnim", "bakeLocatorsForAE",
+        ]
+        self.nameAllocator.install(self, sceneEditingTools)
+        self.undoRunner.install(self, sceneEditingTools)
+
         self.show()
+
+    # Scene callbacks only run while the window is open. A window shown again missed the changes made while
+    # it was closed, so its index starts over.
+    def showEvent(self, event):
+        if not self.sceneIndex.callbackIds:
+            self.sceneIndex.install()
+            self.sceneIndex.invalidate()
+        super().showEvent(event)
+
+    def closeEvent(self, event):
+        self.cancelSelectionTask(quiet=True)
+        self.sceneIndex.uninstall()
+        self.blendShapeIndex.uninstall()
+        super().closeEvent(event)
+
     # UI Tools GUI
     def uiToolsCreateGUI(self):
     # Widgets
@@ -113,6 +204,15 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
         self.threePaneSplitBottomButton = QtWidgets.QPushButton("Three Panes Split Bottom")
         self.threePaneSplitRightButton = QtWidgets.QPushButton("Three Panes Split Right")
         self.fourPaneButton = QtWidgets.QPushButton("Four Panes")
+        # Undo mode for every scene editing tool
+        self.undoModeLabel = QtWidgets.QLabel("Undo Mode :")
+        self.undoModeSelector = QtWidgets.QComboBox()
+        self.undoModeSelector.addItems(["One Undo Step Per Tool", "Fast Bulk (Clears Undo)"])
+        self.undoModeSelector.setStatusTip("How the toolbox records undo for its tools.")
+        self.undoModeSelector.setWhatsThis("One Undo Step Per Tool lets a single undo revert everything a tool did. Fast Bulk turns undo recording off while a tool runs, which is much faster for very large batches, but the result cannot be undone and the whole undo history is cleared every time a tool runs.")
+        self.suspendRefreshCheckbox = QtWidgets.QCheckBox("Pause Viewport Refresh")
+        self.suspendRefreshCheckbox.setStatusTip("Stop viewport redraws while a tool runs in fast bulk mode.")
+        self.suspendRefreshCheckbox.setEnabled(False)
     # Layouts
         self.fixViewportLayout = QtWidgets.QHBoxLayout()
         self.fixViewportLayout.addWidget(self.fixViewportButton)
@@ -131,10 +231,16 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
         self.windowArrangementsLayout.addWidget(self.threePaneSplitRightButton, 1, 2)
         self.windowArrangementsLayout.addWidget(self.fourPaneButton, 1, 3)
         
+        self.undoModeLayout = QtWidgets.QHBoxLayout()
+        self.undoModeLayout.addWidget(self.undoModeLabel)
+        self.undoModeLayout.addWidget(self.undoModeSelector)
+        self.undoModeLayout.addWidget(self.suspendRefreshCheckbox)
+
         self.uiToolsMainLayout = QtWidgets.QFormLayout(self.uiToolsTab)
         self.uiToolsMainLayout.addRow("",self.fixViewportLayout)
         self.uiToolsMainLayout.addRow("",self.dispalyInfoLayout)
         self.uiToolsMainLayout.addRow("",self.windowArrangementsLayout)
+        self.uiToolsMainLayout.addRow("",self.undoModeLayout)
     # Connections
         self.fixViewportButton.clicked.connect(lambda: self.fixViewport())
         self.infoButton.clicked.connect(lambda: self.toggleInfoDisplay())
@@ -147,6 +253,8 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
         self.threePaneSplitBottomButton.clicked.connect(lambda: self.arrangeThreeWindowsBottom())
         self.threePaneSplitRightButton.clicked.connect(lambda: self.arrangeThreeWindowsRight())
         self.fourPaneButton.clicked.connect(lambda: self.arrangeFourWindows())
+        self.undoModeSelector.currentIndexChanged.connect(lambda: self.setUndoMode())
+        self.suspendRefreshCheckbox.stateChanged.connect(lambda: self.setSuspendRefresh())
     
     # Creation Tools GUI
     def creationToolsCreateGUI(self):
@@ -154,13 +262,34 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
         self.locatorAtVertsButton = QtWidgets.QPushButton("Locator at Verts")
         self.locatorAtVertsButton.setStatusTip("Create locator per selected vertex")
         self.locatorAtVertsButton.setWhatsThis("Creates a locator at each selected vertex. Locators are placed in \"VertexLocators_Grp\".")
+        self.locatorOutputSelector = QtWidgets.QComboBox()
+        self.locatorOutputSelector.addItems(["Locators", "Single Marker Node"])
+        self.locatorOutputSelector.setStatusTip("Create a locator per vertex, or store every position on one marker node.")
+        self.locatorOutputSelector.setWhatsThis("Single Marker Node creates one locator holding all vertex positions in its \"markerPositions\" attribute, so the scene doesn't grow with the vertex count. Chosen markers can be turned into real locators with Expand Markers.")
+        self.markerIndicesInput = QtWidgets.QLineEdit()
+        self.markerIndicesInput.setPlaceholderText("Marker indices e.g. 0-9, 42")
+        self.markerIndicesInput.setStatusTip("Marker indices to expand into locators. Use commas and ranges.")
+        self.expandMarkersButton = QtWidgets.QPushButton("Expand Markers")
+        self.expandMarkersButton.setStatusTip("Create real locators for the chosen markers of the selected marker nodes.")
+        self.expandMarkersButton.setWhatsThis("Creates a locator at each listed marker position of the selected marker nodes. Locators are placed in \"VertexLocators_Grp\".")
         self.locatorAtCenterVertsButton = QtWidgets.QPushButton("Locator at Center Verts")
         self.locatorAtCenterVertsButton.setStatusTip("Create locator at center position of selected vertices.")
         self.locatorAtCenterVertsButton.setWhatsThis("Creates a locator at the center of selected vertices. Locator is placed in \"VertexLocators_Grp\".")
+        self.centerModeSelector = QtWidgets.QComboBox()
+        self.centerModeSelector.addItems(["Average", "Bounding Box Center", "Area Weighted"])
+        self.centerModeSelector.setStatusTip("How the center of the selected vertices is found.")
+        self.centerPerIslandCheckbox = QtWidgets.QCheckBox("Per Island")
+        self.centerPerIslandCheckbox.setStatusTip("Create one center locator per connected island of selected vertices.")
+        self.centerPerIslandCheckbox.setWhatsThis("When checked, selected vertices are split into islands connected by edges and a locator is created at the center of each island.")
+        self.centerModeSelector.setWhatsThis("Average uses the mean vertex position, Bounding Box Center the middle of the vertices' bounds, and Area Weighted weights each vertex by its share of the surrounding polygon area.")
         self.globalControlButton = QtWidgets.QPushButton("Global Control")
         self.customControlButton = QtWidgets.QPushButton("Custom Control")
         self.customControlButton.setStatusTip("Create custom control from selected curves")
         self.customControlButton.setWhatsThis("Combines selected curves into 1 transform node and prepares them for use as an animation control object. Control placed in \"Controls_Grp\".")
+        self.customControlModeSelector = QtWidgets.QComboBox()
+        self.customControlModeSelector.addItems(["Combine Selection", "Combine By Name Prefix", "Combine By Selection Set"])
+        self.customControlModeSelector.setStatusTip("Which selected curves are combined into each custom control.")
+        self.customControlModeSelector.setWhatsThis("Combine Selection makes one control from all selected curves. Combine By Name Prefix makes a control per group of selected curves sharing the name before their last underscore. Combine By Selection Set makes a control per selected set from the curves in it.")
         self.useCustomColorCheckBox = QtWidgets.QCheckBox("Use CustomColor")
         self.customColorDialog = QtWidgets.QLineEdit()
         self.customColorDialog.setReadOnly(True)
@@ -171,32 +300,89 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
         self.customColorSlider.setMaximum(31)
         self.customColorSlider.setSliderPosition(17)
         self.setCustomColorButton = QtWidgets.QPushButton("Set Custom Color")
+        self.colorScopeSelector = QtWidgets.QComboBox()
+        self.colorScopeSelector.addItems(["Selected Curves", "Selected Hierarchy"])
+        self.colorScopeSelector.setStatusTip("Which curves Set Custom Color changes.")
+        self.colorScopeSelector.setWhatsThis("Selected Curves recolors the selected curves. Selected Hierarchy recolors every NURBS curve under the selected objects, e.g. a whole rig from its top group.")
+        self.colorOverrideSelector = QtWidgets.QComboBox()
+        self.colorOverrideSelector.addItems(["Index Color", "RGB Color"])
+        self.colorOverrideSelector.setStatusTip("Use the 32 color palette index or any RGB color.")
+        self.pickRGBColorButton = QtWidgets.QPushButton("Pick RGB Color")
+        self.pickRGBColorButton.setStatusTip("Choose the RGB color used when RGB Color is selected.")
+        self.colorPresetSelector = QtWidgets.QComboBox()
+        self.colorPresetSelector.addItems(list(self.colorPresetRegistry))
+        self.colorPresetSelector.setStatusTip("Control color preset applied by name pattern.")
+        self.applyColorPresetButton = QtWidgets.QPushButton("Apply Color Preset")
+        self.applyColorPresetButton.setStatusTip("Color curves by name with the chosen preset.")
+        self.applyColorPresetButton.setWhatsThis("Colors every NURBS curve under the selected objects, or in the whole scene when nothing is selected, by matching its name against the preset's patterns, e.g. L_* blue, R_* red and C_* yellow.")
+        self.controlShapeSelector = QtWidgets.QComboBox()
+        self.controlShapeSelector.addItems(self.controlShapes.names())
+        self.controlShapeSelector.setCurrentText(self.controlShapeChoice)
+        self.controlShapeSelector.setStatusTip("Control shape from the shape library.")
+        self.createLibraryControlsButton = QtWidgets.QPushButton("Create Controls")
+        self.createLibraryControlsButton.setStatusTip("Create a control of the chosen shape at each selected object.")
+        self.createLibraryControlsButton.setWhatsThis("Creates a control of the chosen library shape at each selected object, or one at the origin when nothing is selected. Controls get a null group, use the custom color when checked, and are placed in \"Controls_Grp\". Shapes are read from hybrid_toolbox_shapes.json next to the toolbox script.")
     
     # Layouts
         self.createLocatorsLayout = QtWidgets.QHBoxLayout()
         self.createLocatorsLayout.addWidget(self.locatorAtVertsButton)
+        self.createLocatorsLayout.addWidget(self.locatorOutputSelector)
         self.createLocatorsLayout.addWidget(self.locatorAtCenterVertsButton)
+        self.createLocatorsLayout.addWidget(self.centerModeSelector)
+        self.createLocatorsLayout.addWidget(self.centerPerIslandCheckbox)
+
+        self.markerLayout = QtWidgets.QHBoxLayout()
+        self.markerLayout.addWidget(self.markerIndicesInput)
+        self.markerLayout.addWidget(self.expandMarkersButton)
 
         self.createControlsLayout = QtWidgets.QHBoxLayout()
         self.createControlsLayout.addWidget(self.globalControlButton)
         self.createControlsLayout.addWidget(self.customControlButton)
+        self.createControlsLayout.addWidget(self.customControlModeSelector)
         self.createControlsLayout.addWidget(self.useCustomColorCheckBox)
         self.createControlsLayout.addWidget(self.customColorDialog)
         self.createControlsLayout.addWidget(self.customColorSlider)
         self.createControlsLayout.addWidget(self.setCustomColorButton)
 
+        self.controlColorLayout = QtWidgets.QHBoxLayout()
+        self.controlColorLayout.addWidget(self.colorScopeSelector)
+        self.controlColorLayout.addWidget(self.colorOverrideSelector)
+        self.controlColorLayout.addWidget(self.pickRGBColorButton)
+        self.controlColorLayout.addWidget(self.colorPresetSelector)
+        self.controlColorLayout.addWidget(self.applyColorPresetButton)
+
+        self.controlLibraryLayout = QtWidgets.QHBoxLayout()
+        self.controlLibraryLayout.addWidget(self.controlShapeSelector)
+        self.controlLibraryLayout.addWidget(self.createLibraryControlsButton)
+
         self.creationToolsMainLayout = QtWidgets.QFormLayout(self.creationToolsTab)
         self.creationToolsMainLayout.addRow("", self.createLocatorsLayout)
+        self.creationToolsMainLayout.addRow("", self.markerLayout)
         self.creationToolsMainLayout.addRow("", self.createControlsLayout)
+        self.creationToolsMainLayout.addRow("", self.controlColorLayout)
+        self.creationToolsMainLayout.addRow("", self.controlLibraryLayout)
     
     # Connections
         self.locatorAtVertsButton.clicked.connect(lambda: self.createLocatorsAtVerts())
+        self.locatorOutputSelector.currentIndexChanged.connect(lambda: self.setLocatorOutput())
+        self.expandMarkersButton.clicked.connect(lambda: self.expandMarkers())
         self.locatorAtCenterVertsButton.clicked.connect(lambda: self.locatorAtCenterVerts())
+        self.centerModeSelector.currentIndexChanged.connect(lambda: self.setCenterMode())
+        self.centerPerIslandCheckbox.stateChanged.connect(lambda: self.setCenterPerIsland())
         self.globalControlButton.clicked.connect(lambda: self.createGlobalControl())
         self.customControlButton.clicked.connect(lambda: self.createCustomControl())
+        self.customControlModeSelector.currentIndexChanged.connect(lambda: self.setCustomControlMode())
         self.useCustomColorCheckBox.stateChanged.connect(lambda: self.setUseCustomColor())
         self.customColorSlider.valueChanged.connect(lambda: self.setColorSlider())
+        self.customColorSlider.valueChanged.connect(lambda: self.colorOverrideSelector.setCurrentIndex(0))
         self.setCustomColorButton.clicked.connect(lambda: self.setCustomControlColor())
+        self.colorScopeSelector.currentIndexChanged.connect(lambda: self.setColorScope())
+        self.colorOverrideSelector.currentIndexChanged.connect(lambda: self.setColorOverride())
+        self.pickRGBColorButton.clicked.connect(lambda: self.pickRGBColor())
+        self.colorPresetSelector.currentIndexChanged.connect(lambda: self.setColorPreset())
+        self.applyColorPresetButton.clicked.connect(lambda: self.applyColorPreset())
+        self.controlShapeSelector.currentIndexChanged.connect(lambda: self.setControlShape())
+        self.createLibraryControlsButton.clicked.connect(lambda: self.createLibraryControls())
     
     # Selection Tools GUI
     def selectionToolsCreateGUI(self):
@@ -207,6 +393,9 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
         self.selectAddToCheckbox = QtWidgets.QCheckBox("Add To Selection")
         self.selectAddToCheckbox.setStatusTip("Add to current selection.")
         self.selectAddToCheckbox.setWhatsThis("When checked, selections will be added to current selection.")
+        self.selectChunkedCheckbox = QtWidgets.QCheckBox("Chunked Mode")
+        self.selectChunkedCheckbox.setStatusTip("Process large selections in batches so Maya stays responsive.")
+        self.selectChunkedCheckbox.setWhatsThis("When checked, selection tools gather the scene in one step after the button returns, then work through it in small time slices, showing progress and allowing the search to be cancelled. Gathering a very large scene can still pause Maya briefly. The final selection is still applied at once.")
         
         # Hierarchy Selections
         self.selectionHierarchyLabel = QtWidgets.QLabel("Hierarchy Selections")
@@ -240,9 +429,23 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
         self.selectAllConstraintsButton = QtWidgets.QPushButton("Select Constraints")
         self.selectAllIKHandlesButton = QtWidgets.QPushButton("Select IK Handles")
         self.selectBlendShapeMeshesButton = QtWidgets.QPushButton("Select BlendShape Meshes")
+        self.selectAnimRangeCheckbox = QtWidgets.QCheckBox("Playback Range Only")
+        self.selectAnimRangeCheckbox.setStatusTip("Only select animation curves with keys in the playback range.")
+        self.selectAnimTypeSelector = QtWidgets.QComboBox()
+        self.selectAnimTypeSelector.addItems([
+            "All Curve Types",
+            "Translate (TL)",
+            "Rotate (TA)",
+            "Unitless (TU)",
+            "TL / TA / TU",
+        ])
+        self.selectAnimTypeSelector.setStatusTip("Only select animation curves of this type.")
 
         self.selectFeedbackLabel = QtWidgets.QLabel("Number of objects :")
         self.selectFeedbackOutput = QtWidgets.QLabel("")
+        self.selectCancelButton = QtWidgets.QPushButton("Cancel")
+        self.selectCancelButton.setStatusTip("Cancels the running chunked selection.")
+        self.selectCancelButton.setEnabled(False)
 
     # Layouts
         self.selectionColumnWidth = 115
@@ -250,6 +453,7 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
         self.selectionOptionsLayout = QtWidgets.QHBoxLayout()
         self.selectionOptionsLayout.addWidget(self.selectSearchCurrentCheckbox)
         self.selectionOptionsLayout.addWidget(self.selectAddToCheckbox)
+        self.selectionOptionsLayout.addWidget(self.selectChunkedCheckbox)
 
         # Selection Hierarchy Layout
         self.selectionHierarchyLayout = QtWidgets.QGridLayout()
@@ -298,11 +502,14 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
         self.selectionAnimationLayout.addWidget(self.selectAllConstraintsButton, 1, 1)
         self.selectionAnimationLayout.addWidget(self.selectAllIKHandlesButton, 1, 2)
         self.selectionAnimationLayout.addWidget(self.selectBlendShapeMeshesButton, 1, 3)
+        self.selectionAnimationLayout.addWidget(self.selectAnimRangeCheckbox, 2, 0)
+        self.selectionAnimationLayout.addWidget(self.selectAnimTypeSelector, 2, 1)
 
         # Selection Feedback Layout
         self.selectionFeedbackLayout = QtWidgets.QHBoxLayout()
         self.selectionFeedbackLayout.addWidget(self.selectFeedbackLabel)
         self.selectionFeedbackLayout.addWidget(self.selectFeedbackOutput)
+        self.selectionFeedbackLayout.addWidget(self.selectCancelButton)
 
         # Selection tools main layout
         self.selectionToolsMainLayout = QtWidgets.QFormLayout(self.selectionToolsTab)
@@ -316,6 +523,8 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
     # Connections
         self.selectSearchCurrentCheckbox.stateChanged.connect(lambda: self.getSearchCurrent())
         self.selectAddToCheckbox.stateChanged.connect(lambda: self.getAddToSelection())
+        self.selectChunkedCheckbox.stateChanged.connect(lambda: self.getChunkedSelection())
+        self.selectCancelButton.clicked.connect(lambda: self.cancelSelectionTask())
         self.selectHierarchyButton.clicked.connect(lambda: self.selectHierarchy())
         self.findRootButton.clicked.connect(lambda: self.findRoot())
         self.selectAllMeshesButton.clicked.connect(lambda: self.selectAllMeshes())
@@ -328,6 +537,8 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
         self.selectAllVRayLightsButton.clicked.connect(lambda: self.selectAllVRayLights())
         self.selectAllLightsButton.clicked.connect(lambda: self.selectAllLights())
         self.selectAnimCurvesButton.clicked.connect(lambda: self.selectAnimationCurves())
+        self.selectAnimRangeCheckbox.stateChanged.connect(lambda: self.setAnimPlaybackRange())
+        self.selectAnimTypeSelector.currentIndexChanged.connect(lambda: self.setAnimCurveType())
         self.selectAllConstraintsButton.clicked.connect(lambda: self.selectAllConstraints())
         self.selectAllIKHandlesButton.clicked.connect(lambda: self.selectAllIKHandles())
         self.selectBlendShapeMeshesButton.clicked.connect(lambda: self.selectBlendshapeMeshes())
@@ -341,18 +552,49 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
         self.cleanupObjectsCheckbox = QtWidgets.QCheckBox("Cleanup Objects")
         self.cleanupObjectsCheckbox.setStatusTip("Delete objects after creating")
         self.cleanupObjectsCheckbox.setWhatsThis("When checked, objects used to create the curve will be deleted immediately.")
+        self.curveFitSelector = QtWidgets.QComboBox()
+        self.curveFitSelector.addItems(["CV At Each Object", "Fit CV Count", "Fit Tolerance"])
+        self.curveFitSelector.setStatusTip("Place a CV at every object, or fit a lighter cubic curve through them.")
+        self.curveFitSelector.setWhatsThis("Fit CV Count fits a cubic curve with the given number of CVs that passes as close as possible to the objects. Fit Tolerance uses the fewest CVs that keep every object within the tolerance of the curve. Both need NumPy.")
+        # Fitting is solved with NumPy, so the fit modes can't be picked without it
+        if np is None:
+            for curveFitIndex in (1, 2):
+                self.curveFitSelector.model().item(curveFitIndex).setEnabled(False)
+        self.curveFitCountInput = QtWidgets.QLineEdit()
+        self.curveFitCountInput.setText("8")
+        self.curveFitCountInput.setStatusTip("Number of CVs of the fitted curve.")
+        curveFitCountValidator = QtGui.QIntValidator()
+        curveFitCountValidator.setBottom(4)
+        self.curveFitCountInput.setValidator(curveFitCountValidator)
+        self.curveFitCountInput.setEnabled(False)
+        self.curveFitToleranceInput = QtWidgets.QLineEdit()
+        self.curveFitToleranceInput.setText("0.1")
+        self.curveFitToleranceInput.setStatusTip("Largest allowed distance between an object and the fitted curve.")
+        curveFitToleranceValidator = QtGui.QDoubleValidator()
+        curveFitToleranceValidator.setDecimals(4)
+        curveFitToleranceValidator.setBottom(0.0001)
+        self.curveFitToleranceInput.setValidator(curveFitToleranceValidator)
+        self.curveFitToleranceInput.setEnabled(False)
         self.clusterAtCVsButton = QtWidgets.QPushButton("Cluster at CVs")
         self.clusterAtCVsButton.setStatusTip("Creates a cluster at each CV of selected curve")
         self.clusterAtCVsButton.setWhatsThis("Creates a cluster at each CV of selected curve. Clusters placed in \"Clusters_Grp\".")
+        self.clusterModeSelector = QtWidgets.QComboBox()
+        self.clusterModeSelector.addItems(["Clusters", "Joints + One SkinCluster"])
+        self.clusterModeSelector.setStatusTip("Drive each CV with its own cluster, or with a joint through a single skinCluster.")
+        self.clusterModeSelector.setWhatsThis("Clusters creates one cluster deformer per CV. Joints + One SkinCluster creates a joint at each CV and binds the curve to them with one skinCluster, each CV fully weighted to its joint, so playback cost doesn't grow with a deformer per CV. Joints are placed in \"Clusters_Grp\".")
     # Layouts
         # Curve at selection layout
         self.curveAtObjectsLayout = QtWidgets.QHBoxLayout()
         self.curveAtObjectsLayout.addWidget(self.curveAtObjectsButton)
         self.curveAtObjectsLayout.addWidget(self.cleanupObjectsCheckbox)
+        self.curveAtObjectsLayout.addWidget(self.curveFitSelector)
+        self.curveAtObjectsLayout.addWidget(self.curveFitCountInput)
+        self.curveAtObjectsLayout.addWidget(self.curveFitToleranceInput)
 
         # Cluster at CVs layout
         self.clusterAtCVsLayout = QtWidgets.QHBoxLayout()
         self.clusterAtCVsLayout.addWidget(self.clusterAtCVsButton)
+        self.clusterAtCVsLayout.addWidget(self.clusterModeSelector)
 
         # Create Curve tools main layout and connect sub layouts
         self.curveToolsMainLayout = QtWidgets.QFormLayout(self.curveToolsTab)
@@ -361,7 +603,11 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
     # Connections
         self.curveAtObjectsButton.clicked.connect(lambda: self.createCurveAtObjects())
         self.cleanupObjectsCheckbox.stateChanged.connect(lambda:self.setCurveObjectCleanup())
+        self.curveFitSelector.currentIndexChanged.connect(lambda: self.setCurveFit())
+        self.curveFitCountInput.textEdited.connect(lambda: self.setCurveFitCount())
+        self.curveFitToleranceInput.textEdited.connect(lambda: self.setCurveFitTolerance())
         self.clusterAtCVsButton.clicked.connect(lambda: self.clusterAtCV())
+        self.clusterModeSelector.currentIndexChanged.connect(lambda: self.setClusterMode())
     
     # Joint Tools GUI
     def jointToolsCreateGUI(self):
@@ -371,6 +617,9 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
         # Create Joints at
         self.jointAtCVsButton = QtWidgets.QPushButton("Joints at CVs")
         self.jointAtObjectsButton = QtWidgets.QPushButton("Joints at Objects")
+        self.jointResampleCheckbox = QtWidgets.QCheckBox("Even Spacing")
+        self.jointResampleCheckbox.setStatusTip("Place Number of Joints evenly along the objects or curve.")
+        self.jointResampleCheckbox.setWhatsThis("When checked, Joints at CVs and Joints at Objects place the Number of Joints evenly spaced by length along the selected curve or the path through the selected objects, instead of one joint per CV or object.")
         # Joint axis
         column1_fixedWidth = 100
         column2_fixedWidth = 100
@@ -450,6 +699,7 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
         self.jointCreateAtLayout = QtWidgets.QHBoxLayout()
         self.jointCreateAtLayout.addWidget(self.jointAtCVsButton)
         self.jointCreateAtLayout.addWidget(self.jointAtObjectsButton)
+        self.jointCreateAtLayout.addWidget(self.jointResampleCheckbox)
         # Joint create chain layout
         self.jointCreateChainLayout = QtWidgets.QGridLayout()
         self.jointCreateChainLayout.addWidget(self.jointCreationAxisLabel, 0,0)
@@ -474,6 +724,7 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
         self.jointHierarchyButton.clicked.connect(lambda: self.selectJointHierarchy())
         self.jointAtCVsButton.clicked.connect(lambda: self.jointsAtCVs())
         self.jointAtObjectsButton.clicked.connect(lambda: self.jointsAtObjects())
+        self.jointResampleCheckbox.stateChanged.connect(lambda: self.setJointResample())
         self.jointCreateChainButton.clicked.connect(lambda: self.createJointChain())
         self.jointAxisSelector.currentIndexChanged.connect(lambda: self.setJointAxis())
         self.jointNumberInput.textEdited.connect(lambda: self.setJointNumber())
@@ -615,7 +866,20 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
         self.sceneCutLabel = QtWidgets.QLabel("Cut :")
         self.sceneCutFeedback = QtWidgets.QLabel("")
 
+        self.sceneIndexLabel = QtWidgets.QLabel("Scene Index :")
+        self.sceneIndexFeedback = QtWidgets.QLabel("")
+
+        self.instrumentCallsCheckbox = QtWidgets.QCheckBox("Record Maya Calls")
+        self.instrumentCallsCheckbox.setStatusTip("Record how many Maya commands each tool runs and how long they take.")
+        self.instrumentHistorySelector = QtWidgets.QComboBox()
+        self.instrumentHistorySelector.addItems(["Last 5 Actions", "Last 10 Actions", "Last 25 Actions"])
+        self.instrumentHistorySelector.setCurrentIndex(1)
+        self.instrumentActionsLabel = QtWidgets.QLabel("Recent Actions :")
+        self.instrumentActionsFeedback = QtWidgets.QLabel("Recording off")
+        self.instrumentActionsFeedback.setTextInteractionFlags(QtCore.Qt.TextSelectableByMouse)
+
         self.sceneInfoButton = QtWidgets.QPushButton("Scene Info")
+        self.instrumentClearButton = QtWidgets.QPushButton("Clear Recorded Actions")
     # Layouts
         self.sceneFeedbackLayout = QtWidgets.QGridLayout()
         self.sceneFeedbackLayout.addWidget(self.sceneApplicationLabel, 0, 0)
@@ -628,15 +892,30 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
         self.sceneFeedbackLayout.addWidget(self.sceneOSVersionFeedback,3,1)
         self.sceneFeedbackLayout.addWidget(self.sceneCutLabel,4,0)
         self.sceneFeedbackLayout.addWidget(self.sceneCutFeedback,4,1)
+        self.sceneFeedbackLayout.addWidget(self.sceneIndexLabel,5,0)
+        self.sceneFeedbackLayout.addWidget(self.sceneIndexFeedback,5,1)
+
+        self.instrumentOptionsLayout = QtWidgets.QHBoxLayout()
+        self.instrumentOptionsLayout.addWidget(self.instrumentCallsCheckbox)
+        self.instrumentOptionsLayout.addWidget(self.instrumentHistorySelector)
+        self.instrumentLayout = QtWidgets.QGridLayout()
+        self.instrumentLayout.addLayout(self.instrumentOptionsLayout, 0, 0, 1, 2)
+        self.instrumentLayout.addWidget(self.instrumentActionsLabel, 1, 0, QtCore.Qt.AlignTop)
+        self.instrumentLayout.addWidget(self.instrumentActionsFeedback, 1, 1)
 
         self.sceneFeedbackButtonLayout = QtWidgets.QHBoxLayout()
         self.sceneFeedbackButtonLayout.addWidget(self.sceneInfoButton)
+        self.sceneFeedbackButtonLayout.addWidget(self.instrumentClearButton)
 
         self.sceneInfoMainLayout = QtWidgets.QFormLayout(self.sceneInfoTab)
         self.sceneInfoMainLayout.addRow("", self.sceneFeedbackLayout)
         self.sceneInfoMainLayout.addRow("", self.sceneFeedbackButtonLayout)
+        self.sceneInfoMainLayout.addRow("", self.instrumentLayout)
     # Connections
         self.sceneInfoButton.clicked.connect(lambda:self.getSceneInfo())
+        self.instrumentCallsCheckbox.stateChanged.connect(lambda: self.setInstrumentCalls())
+        self.instrumentHistorySelector.currentIndexChanged.connect(lambda: self.setInstrumentHistory())
+        self.instrumentClearButton.clicked.connect(lambda: self.clearRecordedActions())
 
     # UI Tools Methods______________________
     def fixViewport(self):
@@ -669,47 +948,130 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
     def arrangeThreeWindowsRight(self):
         cmds.ThreeRightSplitViewArrangement()
 
+    def setUndoMode(self):
+        undoModeIndex = self.undoModeSelector.currentIndex()
+
+        undoModeDictionary = {
+            0 : "chunk",
+            1 : "suspend",
+        }
+
+        self.undoModeChoice = undoModeDictionary[undoModeIndex]
+        self.undoRunner.mode = self.undoModeChoice
+        self.suspendRefreshCheckbox.setEnabled(self.undoModeChoice == "suspend")
+        if self.undoModeChoice == "suspend":
+            cmds.warning("Fast Bulk mode clears the undo history each time a toolbox tool runs.")
+        self.setSuspendRefresh()
+        return self.undoModeChoice
+
+    # Refresh is only paused in fast bulk mode
+    def setSuspendRefresh(self):
+        self.suspendRefreshChoice = self.suspendRefreshCheckbox.isChecked() and self.undoModeChoice == "suspend"
+        self.undoRunner.suspendRefresh = self.suspendRefreshChoice
+        return self.suspendRefreshChoice
+
     def arrangeFourWindows(self):
         cmds.FourViewArrangement()   
     
 # Creation Tools methods________________________
-    # Ensures vertices are selected for further tools usage
-    def selectVertices(self):
-        self.vertexArray = cmds.filterExpand(selectionMask=31) or []
+    def setLocatorOutput(self):
+        locatorOutputIndex = self.locatorOutputSelector.currentIndex()
+
+        locatorOutputDictionary = {
+            0 : "locators",
+            1 : "markers",
+        }
+
+        self.locatorOutputChoice = locatorOutputDictionary[locatorOutputIndex]
+        return self.locatorOutputChoice
+
+    # Creates a locator at each world position, then parents them all to the current group at once
+    def createLocatorsAtPositions(self, positions):
+        locators = []
+        for pos in positions:
+            currentLocator = cmds.spaceLocator()[0]
+            cmds.setAttr(f"{currentLocator}.translate", pos[0], pos[1], pos[2])
+            locators.append(currentLocator)
+        if locators:
+            cmds.parent(locators, self.groupType)
+        return locators
+
+    # Stores every position in the vectorArray attribute of a single locator, keeping the node count flat
+    def createMarkerNode(self, positions):
+        markerNode = cmds.spaceLocator(name="VertexMarkers")[0]
+        cmds.addAttr(markerNode, longName="markerPositions", dataType="vectorArray")
+        cmds.setAttr(f"{markerNode}.markerPositions", len(positions), *(tuple(pos) for pos in positions), type="vectorArray")
+        cmds.parent(markerNode, self.groupType)
+        return markerNode
 
     def createLocatorsAtVerts(self):
-        self.selectVertices()
+        meshVertices = getSelectedMeshVertices()
 
-        if not self.vertexArray:
+        if not any(indices for dagPath, indices in meshVertices):
             openErrorWindow("Select at least one vertex to place locator.")
             raise ValueError("Select at least one vertex to place locator.")
         self.checkGroups("locator")
         
-        positions = [cmds.pointPosition(vert) for vert in self.vertexArray]
-        # Create locators at each selected vertex position 
-        for pos in positions:
-            currentLocator = cmds.spaceLocator()[0]
-            cmds.move(pos[0], pos[1], pos[2], currentLocator)
-            cmds.xform(currentLocator, pivots=(pos[0], pos[1], pos[2]), worldSpace=True)
-            cmds.parent(currentLocator, self.groupType)
+        positions = getSelectedVertexPositions(meshVertices)
+        if self.locatorOutputChoice == "markers":
+            self.createMarkerNode(positions)
+        else:
+            self.createLocatorsAtPositions(positions)
+        cmds.select(clear=True)
+
+    # Creates real locators for the markers listed in the indices field, on every selected marker node
+    def expandMarkers(self):
+        selection = cmds.ls(selection=True, long=True) or []
+        markerNodes = [node for node in selection if cmds.attributeQuery("markerPositions", node=node, exists=True)]
+        if not markerNodes:
+            openErrorWindow("Select a marker node.")
+            raise ValueError("Select a marker node.")
+
+        indices = getIndexRanges(self.markerIndicesInput.text())
+        if not indices:
+            openErrorWindow("Enter marker indices to expand, e.g. 0-9, 42.")
+            raise ValueError("Enter marker indices to expand, e.g. 0-9, 42.")
+        self.checkGroups("locator")
 
+        positions = []
+        for markerNode in markerNodes:
+            markerPositions = cmds.getAttr(f"{markerNode}.markerPositions") or []
+            positions.extend(markerPositions[index] for index in indices if index < len(markerPositions))
+        self.createLocatorsAtPositions(positions)
         cmds.select(clear=True)
     
+    def setCenterMode(self):
+        centerModeIndex = self.centerModeSelector.currentIndex()
+
+        centerModeDictionary = {
+            0 : "average",
+            1 : "boundingBox",
+            2 : "area",
+        }
+
+        self.centerModeChoice = centerModeDictionary[centerModeIndex]
+        return self.centerModeChoice
+
+    def setCenterPerIsland(self):
+        self.centerPerIslandChoice = self.centerPerIslandCheckbox.isChecked()
+        return self.centerPerIslandChoice
+
+    # The center is computed from the meshes' point arrays, so no cluster or constraint is created and evaluated.
+    # In per island mode every connected island of the selection gets its own locator, parented in one call.
     def locatorAtCenterVerts(self):
-        self.selectVertices()
-        if len(self.vertexArray) < 2:
-            openErrorWindow(f"A minimum of 2 vertices is required. Found {len(self.vertexArray)}")
-            raise ValueError(f"Minimum of 2 vertices required, found {len(self.vertexArray)}")
+        meshVertices = getSelectedMeshVertices()
+        vertexCount = sum(len(indices) for dagPath, indices in meshVertices)
+        if vertexCount < 2:
+            openErrorWindow(f"A minimum of 2 vertices is required. Found {vertexCount}")
+            raise ValueError(f"Minimum of 2 vertices required, found {vertexCount}")
         
         self.checkGroups("locator")
         
-        tempCluster, tempHandle = cmds.cluster(self.vertexArray)
-        centeredLoc = cmds.spaceLocator()
-        tempConstraint = cmds.pointConstraint(tempHandle, centeredLoc, maintainOffset = False)
-        cmds.delete(tempConstraint,tempCluster)
-        self.vertexArray = []
-
-        cmds.parent(centeredLoc, self.groupType)
+        if self.centerPerIslandChoice:
+            centers = getVertexIslandCenters(meshVertices, self.centerModeChoice)
+        else:
+            centers = [getVerticesCenter(meshVertices, self.centerModeChoice)]
+        self.createLocatorsAtPositions(centers)
 
     def setUseCustomColor(self):
         self.useCustomColorChoice = self.useCustomColorCheckBox.isChecked()
@@ -755,141 +1117,260 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
         self.customColorDialog.setStyleSheet(indexDictionary[self.customColorSliderIndex])
         return self.customColorSliderIndex
 
-    # Changes color of selected nurbs curve
+    def setColorScope(self):
+        colorScopeIndex = self.colorScopeSelector.currentIndex()
+
+        colorScopeDictionary = {
+            0 : "selection",
+            1 : "hierarchy",
+        }
+
+        self.colorScopeChoice = colorScopeDictionary[colorScopeIndex]
+        return self.colorScopeChoice
+
+    # Switches between palette index and RGB override colors and shows the active color in the swatch
+    def setColorOverride(self):
+        colorOverrideIndex = self.colorOverrideSelector.currentIndex()
+
+        colorOverrideDictionary = {
+            0 : "index",
+            1 : "rgb",
+        }
+
+        self.colorOverrideChoice = colorOverrideDictionary[colorOverrideIndex]
+        if self.colorOverrideChoice == "rgb":
+            red, green, blue = (int(round(channel * 255)) for channel in self.customRGBChoice)
+            self.customColorDialog.setStyleSheet(f"background-Color: rgb({red},{green},{blue});")
+        else:
+            self.setColorSlider()
+        return self.colorOverrideChoice
+
+    def pickRGBColor(self):
+        red, green, blue = (int(round(channel * 255)) for channel in self.customRGBChoice)
+        pickedColor = QtWidgets.QColorDialog.getColor(QtGui.QColor(red, green, blue), self, "Custom RGB Color")
+        if not pickedColor.isValid():
+            return self.customRGBChoice
+        self.customRGBChoice = (pickedColor.redF(), pickedColor.greenF(), pickedColor.blueF())
+        if self.colorOverrideSelector.currentIndex() == 1:
+            self.setColorOverride()
+        else:
+            self.colorOverrideSelector.setCurrentIndex(1)
+        return self.customRGBChoice
+
+    # Returns the palette index or RGB color chosen in the UI
+    def getControlColor(self):
+        if self.colorOverrideChoice == "rgb":
+            self.customColorChoice = self.customRGBChoice
+        else:
+            self.customColorChoice = self.setColorSlider()
+        return self.customColorChoice
+
+    # Changes color of selected nurbs curves, or of every curve under the selection in hierarchy scope.
+    # All curve shapes are resolved with one listRelatives call.
     def setCustomControlColor(self):
-        currentSelection = cmds.ls(selection = True)
+        currentSelection = cmds.ls(selection = True, long = True)
         if not currentSelection:
             openErrorWindow("Select a NURBS Curve to change its color.")
             raise ValueError("Select a NURBS Curve to change its color.")
-        for sel in currentSelection:
-            shape = cmds.listRelatives(sel, shapes = True)
-            if shape:
-                # set color choice to UI's current color selection
-                self.customColorChoice = self.setColorSlider()
-                for s in shape:
-                    type = cmds.objectType(s)
-                    if type != "nurbsCurve":
-                        openErrorWindow(f"{sel} is not a nurbs curve")
-                        raise ValueError(f"{sel} is not a nurbs curve")
-                    else:
-                        
-                        cmds.setAttr((f"{s}.overrideEnabled"),True)
-                        cmds.setAttr((f"{s}.overrideColor"), self.customColorChoice)
-            else:
-                openErrorWindow(f"{sel} has no shape node. Select at least 1 Nurbs Curve")
-                raise ValueError(f"{sel} has no shape node")
-        
+
+        if self.colorScopeChoice == "hierarchy":
+            curveShapes = cmds.listRelatives(currentSelection, allDescendents=True, fullPath=True, type="nurbsCurve") or []
+            if not curveShapes:
+                openErrorWindow("No NURBS curves found under the selection.")
+                raise ValueError("No NURBS curves found under the selection.")
+        else:
+            curveShapes = cmds.listRelatives(currentSelection, shapes=True, fullPath=True, type="nurbsCurve") or []
+            curveTransforms = {shape.rsplit("|", 1)[0] for shape in curveShapes}
+            for sel in currentSelection:
+                if sel not in curveTransforms:
+                    openErrorWindow(f"{sel} is not a nurbs curve")
+                    raise ValueError(f"{sel} is not a nurbs curve")
+
+        setCurveColors(curveShapes, self.getControlColor())
         cmds.select(clear=True)
 
-    # Create Global control
-    def createGlobalControl(self):
-        positions = [
-            (-1, 0, -1),
-            (-1, 0, -3),
-            (-2, 0, -3),
-            (0, 0, -5),
-            (2, 0, -3),
-            (1, 0, -3),
-            (1, 0, -1),
-            (3, 0, -1),
-            (3, 0, -2),
-            (5, 0, 0),
-            (3, 0, 2),
-            (3, 0, 1), 
-            (1, 0, 1), 
-            (1, 0, 3), 
-            (2, 0, 3), 
-            (0, 0, 5), 
-            (-2, 0, 3), 
-            (-1, 0, 3), 
-            (-1, 0, 1), 
-            (-3, 0, 1), 
-            (-3, 0, 2), 
-            (-5, 0, 0), 
-            (-3, 0, -2), 
-            (-3, 0, -1), 
-            (-1, 0, -1)
-        ]
-        
-        self.checkGroups("control")
+    def setColorPreset(self):
+        self.colorPresetChoice = self.colorPresetSelector.currentText()
+        return self.colorPresetChoice
 
-        groupNumber = 0
-
-        while True:
-            groupName = f"GlobalConrol_{groupNumber}_Ctrl_Grp"
-            nullGroupName = f"GlobalControl_{groupNumber}_Ctrl_Null_Grp"
-            controlName = f"GlobalControl_{groupNumber}_Ctrl"
-            if not cmds.objExists(groupName):
-                globalControlGroup = cmds.group(empty=True, name=groupName)
-                globalControlNullGroup = cmds.group(empty=True, name=nullGroupName)
-                globalControlCurve = cmds.curve(degree = 1, p=positions, name=controlName)
-                cmds.parent(globalControlNullGroup, globalControlGroup)
-                cmds.parent(globalControlCurve, globalControlNullGroup)
-                break
-            else:
-                groupNumber += 1
+    # Colors curves by name with the chosen preset, under the selection or across the whole scene
+    def applyColorPreset(self):
+        self.setColorPreset()
+        presetRules = self.colorPresetRegistry[self.colorPresetChoice]
 
-        cmds.parent(globalControlGroup, self.groupType)
+        currentSelection = cmds.ls(selection=True, long=True)
+        if currentSelection:
+            curveShapes = cmds.listRelatives(currentSelection, allDescendents=True, fullPath=True, type="nurbsCurve") or []
+        else:
+            curveTransforms = self.sceneIndex.transformsOfType("nurbsCurve")
+            curveShapes = []
+            if curveTransforms:
+                curveShapes = cmds.listRelatives(curveTransforms, shapes=True, fullPath=True, type="nurbsCurve") or []
+
+        colorGroups = {}
+        for shape in curveShapes:
+            curveName = shape.rsplit("|", 2)[-2]
+            for pattern, color in presetRules:
+                if fnmatch.fnmatchcase(curveName, pattern):
+                    colorGroups.setdefault(color, []).append(shape)
+                    break
+        if not colorGroups:
+            openErrorWindow(f"No NURBS curves match the {self.colorPresetChoice} preset.")
+            raise ValueError(f"No NURBS curves match the {self.colorPresetChoice} preset.")
 
-        if self.useCustomColorChoice:
-            self.customColorChoice = self.setColorSlider()
-            controlShape = cmds.listRelatives(globalControlCurve, shapes=True)[0]
-            cmds.setAttr((f"{controlShape}.overrideEnabled"),True)
-            cmds.setAttr((f"{controlShape}.overrideColor"), self.customColorChoice)
+        for color, shapes in colorGroups.items():
+            setCurveColors(shapes, color)
+        cmds.select(clear=True)
 
+    # Create Global control
+    def createGlobalControl(self):
+        color = self.getControlColor() if self.useCustomColorChoice else None
+        self.createControls("global", "GlobalControl", [(0, 0, 0)], color)
+
+    def setControlShape(self):
+        self.controlShapeChoice = self.controlShapeSelector.currentText()
+        return self.controlShapeChoice
+
+    # Creates a library control at each selected transform, or one at the origin when nothing is selected
+    def createLibraryControls(self):
+        self.setControlShape()
+        if self.controlShapeChoice not in self.controlShapes.names():
+            openErrorWindow(f"Control shape {self.controlShapeChoice} is not in the shape library.")
+            raise ValueError(f"Control shape {self.controlShapeChoice} is not in the shape library.")
+
+        selectedTransforms = cmds.ls(selection=True, type="transform", long=True) or []
+        positions = getWorldPositions(selectedTransforms)
+        color = self.getControlColor() if self.useCustomColorChoice else None
+        prefix = self.controlShapeChoice[0].upper() + self.controlShapeChoice[1:]
+        self.createControls(self.controlShapeChoice, prefix, positions or [(0, 0, 0)], color)
+
+    # Creates a control per position as {prefix}_{n}_Ctrl_Grp > {prefix}_{n}_Ctrl_Null_Grp > {prefix}_{n}_Ctrl,
+    # with the top group placed at the position. All names are reserved up front.
+    def createControls(self, shapeName, prefix, positions, color=None):
+        curves = self.controlShapes.curvesOf(shapeName)
+        self.checkGroups("control")
+        indices = self.nameAllocator.reserve(f"{prefix}_{{}}_Ctrl", len(positions))
+
+        controls = []
+        controlGroups = []
+        for index, position in zip(indices, positions):
+            control = createShapeCurve(curves, f"{prefix}_{index}_Ctrl")
+            controlNull = cmds.group(control, name=f"{prefix}_{index}_Ctrl_Null_Grp")
+            # Placed at world first so the positions stay world space whatever the controls group is moved to
+            controlGroup = cmds.group(controlNull, name=f"{prefix}_{index}_Ctrl_Grp", world=True)
+            cmds.setAttr(f"{controlGroup}.translate", position[0], position[1], position[2])
+            controls.append(control)
+            controlGroups.append(controlGroup)
+        if controlGroups:
+            cmds.parent(controlGroups, self.groupType)
+        if color is not None and controls:
+            setCurveColors(cmds.listRelatives(controls, shapes=True, fullPath=True) or [], color)
         cmds.select(clear=True)
+        return controls
     
-    # Combines selected curves under a single transform to create custom animation controls
-    def createCustomControl(self):
-        selectedTransforms = cmds.ls(selection=True, type="transform")
+    def setCustomControlMode(self):
+        customControlModeIndex = self.customControlModeSelector.currentIndex()
 
-        selectedCurves = [
-            transform for transform in selectedTransforms
-            if cmds.listRelatives(transform, type="nurbsCurve", children=True)
-        ]
-        
-        if len(selectedCurves) < 2:
-            openErrorWindow("Select a minimum of 2 NURBS curves")
-            raise ValueError("Select a minimum of 2 NURBS curves.")
-        
-        #freeze transforms
-        cmds.makeIdentity(selectedCurves, apply = True)
-        cmds.DeleteHistory(selectedCurves)
+        customControlModeDictionary = {
+            0 : "selection",
+            1 : "prefix",
+            2 : "set",
+        }
 
-        tempShapes = cmds.listRelatives(selectedCurves, shapes = True)
-        
-        customControlGroupName = f"{selectedTransforms[0]}_Ctrl"
-        customControl = cmds.group(empty = True, name=customControlGroupName)
+        self.customControlModeChoice = customControlModeDictionary[customControlModeIndex]
+        return self.customControlModeChoice
 
-        cmds.parent(tempShapes, customControl, relative=True, shape=True)
-        cmds.delete(selectedCurves)
-        cmds.xform(customControl, centerPivots=True)
-        cmds.move(0,0,0, customControl, rotatePivotRelative=True)
-        
-        customControlNullName = f"{customControl}_Null_Grp"
-        customControlNull = cmds.group(empty=True, name=customControlNullName)
-        
-        tempConstraint = cmds.parentConstraint(customControlNull, customControl, maintainOffset = True)
-        cmds.delete(tempConstraint)
-        cmds.makeIdentity(customControl, apply=True)
-        
-        # Update viewport, otherwise while curve has been created correctly, it doesn't look that way.
-        cmds.ogs(reset=True)
+    # Combines selected curves under a single transform to create custom animation controls.
+    # Batch modes make one control per name prefix or per selected set in the same pass.
+    def createCustomControl(self):
+        # Transforms among the given nodes that have a NURBS curve shape, found with one query
+        def getCurveTransforms(nodes):
+            if not nodes:
+                return set()
+            curveShapes = cmds.listRelatives(nodes, shapes=True, type="nurbsCurve", fullPath=True) or []
+            return {shape.rsplit("|", 1)[0] for shape in curveShapes}
+
+        if self.customControlModeChoice == "set":
+            curveSets = cmds.ls(selection=True, type="objectSet") or []
+            setMembers = [(curveSet, cmds.ls(cmds.sets(curveSet, query=True) or [], long=True)) for curveSet in curveSets]
+            curveTransforms = getCurveTransforms([member for curveSet, members in setMembers for member in members])
+            curveGroups = []
+            for curveSet, members in setMembers:
+                setCurves = [member for member in members if member in curveTransforms]
+                if setCurves:
+                    curveGroups.append((f"{curveSet}_Ctrl", setCurves))
+            if not curveGroups:
+                openErrorWindow("Select one or more sets containing NURBS curves.")
+                raise ValueError("Select one or more sets containing NURBS curves.")
+        else:
+            selectedTransforms = cmds.ls(selection=True, type="transform", long=True) or []
+            curveTransforms = getCurveTransforms(selectedTransforms)
+            selectedCurves = [transform for transform in selectedTransforms if transform in curveTransforms]
+
+            if self.customControlModeChoice == "prefix":
+                if not selectedCurves:
+                    openErrorWindow("Select NURBS curves to combine.")
+                    raise ValueError("Select NURBS curves to combine.")
+                prefixGroups = {}
+                for curve in selectedCurves:
+                    prefix = curve.rsplit("|", 1)[-1].rsplit("_", 1)[0]
+                    prefixGroups.setdefault(prefix, []).append(curve)
+                curveGroups = [(f"{prefix}_Ctrl", curves) for prefix, curves in prefixGroups.items()]
+            else:
+                if len(selectedCurves) < 2:
+                    openErrorWindow("Select a minimum of 2 NURBS curves")
+                    raise ValueError("Select a minimum of 2 NURBS curves.")
+                curveGroups = [(f"{selectedTransforms[0].rsplit('|', 1)[-1]}_Ctrl", selectedCurves)]
+
+        self.combineCurveGroups(curveGroups)
+
+    # Combines each (control name, curves) group into one control under a null group, batching every step
+    # that Maya accepts for many nodes at once.
+    def combineCurveGroups(self, curveGroups):
+        # A curve in several groups (e.g. in two selected sets) can only be combined once, so it goes to the first
+        seenCurves = set()
+        uniqueGroups = []
+        for controlName, curves in curveGroups:
+            groupCurves = [curve for curve in dict.fromkeys(curves) if curve not in seenCurves]
+            seenCurves.update(groupCurves)
+            if groupCurves:
+                uniqueGroups.append((controlName, groupCurves))
+        curveGroups = uniqueGroups
+        allCurves = [curve for controlName, curves in curveGroups for curve in curves]
+
+        #freeze transforms
+        cmds.makeIdentity(allCurves, apply = True)
+        cmds.DeleteHistory(allCurves)
+
+        customControls = []
+        for controlName, curves in curveGroups:
+            tempShapes = cmds.listRelatives(curves, shapes = True, fullPath = True)
+            customControl = cmds.group(empty = True, name=controlName)
+            cmds.parent(tempShapes, customControl, relative=True, shape=True)
+            customControls.append(customControl)
+        cmds.delete(allCurves)
+
+        cmds.xform(customControls, centerPivots=True)
+        for customControl in customControls:
+            cmds.move(0,0,0, customControl, rotatePivotRelative=True)
+        cmds.makeIdentity(customControls, apply=True)
 
         self.checkGroups("control")
 
-        cmds.parent(customControlNull, self.groupType)
-            
-        cmds.parent(customControl, customControlNull)
+        for customControl in customControls:
+            cmds.group(customControl, name=f"{customControl}_Null_Grp", parent=self.groupType)
 
+        controlShapes = cmds.listRelatives(customControls, shapes=True, fullPath=True) or []
         if self.useCustomColorChoice:
-            self.customColorChoice = self.setColorSlider()
-            controlShapes = cmds.listRelatives(customControl, shapes=True)
-            for s in controlShapes:
-                cmds.setAttr((f"{s}.overrideEnabled"),True)
-                cmds.setAttr((f"{s}.overrideColor"), self.customColorChoice)
+            setCurveColors(controlShapes, self.getControlColor())
+
+        # Reparented shapes can draw stale until Viewport 2.0 updates them. Dirtying just those shapes is
+        # enough, where a full ogs reset rebuilds every viewport. Fix Viewport in UI Tools still does the full reset.
+        cmds.dgdirty(controlShapes)
+        cmds.refresh(currentView=True)
 
         cmds.select(clear=True)
+        return customControls
     
     # Selection Tools Methods___________________________
     def getSearchCurrent(self):
@@ -899,6 +1380,57 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
     def getAddToSelection(self):
         self.addToSelectionChoice = self.selectAddToCheckbox.isChecked()
         return self.addToSelectionChoice
+
+    def getChunkedSelection(self):
+        self.chunkedSelectionChoice = self.selectChunkedCheckbox.isChecked()
+        return self.chunkedSelectionChoice
+
+    # Runs processBatch over the items returned by gather and passes the combined results to finish.
+    # gather returns None when it has already reported that there is nothing to search.
+    # In chunked mode gathering and the batches run in time slices on the Qt event loop, reporting progress and allowing cancellation.
+    def runSelectionTask(self, gather, processBatch, finish, label):
+        self.cancelSelectionTask(quiet=True)
+
+        if not self.chunkedSelectionChoice:
+            items = gather()
+            if items is not None:
+                finish(processBatch(items))
+            return
+
+        # Later time slices run outside the action that started them, so keep charging their calls to it
+        gather = self.commandRecorder.resume(gather)
+        processBatch = self.commandRecorder.resume(processBatch)
+        finish = self.commandRecorder.resume(finish)
+
+        def progress(processed, total, found):
+            self.selectFeedbackOutput.setText(f"Searching {label} : {processed} / {total} ({found} found)")
+
+        def complete(results):
+            self.chunkedTask = None
+            self.selectCancelButton.setEnabled(False)
+            if results is not None:
+                finish(results)
+
+        def fail(error):
+            self.chunkedTask = None
+            self.selectCancelButton.setEnabled(False)
+            self.selectFeedbackOutput.setText(f"Searching {label} failed.")
+            openErrorWindow(f"Searching {label} failed: {error}")
+            print(f"Searching {label} failed: {error}")
+
+        self.chunkedTask = ChunkedTask(gather, processBatch, complete, progress, fail, parent=self)
+        self.selectCancelButton.setEnabled(True)
+        self.selectFeedbackOutput.setText(f"Searching {label} ...")
+        self.chunkedTask.start()
+
+    def cancelSelectionTask(self, quiet=False):
+        if not self.chunkedTask:
+            return
+        self.chunkedTask.cancel()
+        self.chunkedTask = None
+        self.selectCancelButton.setEnabled(False)
+        if not quiet:
+            self.selectFeedbackOutput.setText("Selection cancelled.")
     
     def selectHierarchy(self):
         currentSelection = cmds.ls(selection=True)
@@ -911,449 +1443,311 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
             cmds.select(hierarchy=True, add=True)
 
     def findRoot(self):
-        currentSelection = cmds.ls(selection=True)
-        rootNode = None
+        currentSelection = cmds.ls(selection=True, long=True)
         if not currentSelection:
             openErrorWindow("Select an object to find its root node.")
             raise ValueError("Select an object to find its root node.")
-        else:
-            rootNode = currentSelection[0]
 
-        while True:
-            parentNode = cmds.listRelatives(rootNode, parent=True)
-            if parentNode and rootNode:
-                rootNode = parentNode[0]
-            else:
-                break
-        
+        # Every long name starts with its root, so all roots come from the one ls call
+        rootNodes = list(dict.fromkeys(getRootPath(obj) for obj in currentSelection))
+
         if not self.addToSelectionChoice:
-            cmds.select(rootNode)
+            cmds.select(rootNodes)
         else:
-            cmds.select(rootNode, add=True)
+            cmds.select(rootNodes, add=True)
 
-    def selectAllMeshes(self):
-        # Helper function to select parents of meshes
-        def getMeshParents(meshes):
-            parents = []
-            for mesh in meshes:
-                parent = cmds.listRelatives(mesh, parent=True)
-                if parent:
-                    parents.append(parent[0])
-            return parents
+        number = len(rootNodes)
+        self.selectFeedbackOutput.setText(f"{number} Root objects selected.")
 
-        # If 'selectSearchCurrentChoice' is False, select all meshes in the scene
+    # Shared engine for selecting the transforms of a shape type, scene wide or under the current selection
+    def selectAllOfType(self, shapeType, label):
+        # If 'selectSearchCurrentChoice' is False, select every transform of this type in the scene
         if not self.selectSearchCurrentChoice:
-            if not self.addToSelectionChoice:
-                cmds.select(clear=True)
+            def gather():
+                shapes = self.sceneIndex.nodesOfType(shapeType)
+                if not shapes:
+                    if not self.addToSelectionChoice:
+                        cmds.select(clear=True)
+                    self.selectFeedbackOutput.setText(f"0 {label} found.")
+                    return None
+                return shapes
+
+            def finish(parents):
+                parents = list(dict.fromkeys(parents))
+                # Select all parents in one go
+                if not self.addToSelectionChoice:
+                    cmds.select(parents, replace=True)
+                else:
+                    cmds.select(parents, add=True)
 
-            allMeshes = cmds.ls(type="mesh")
-            if not allMeshes:
-                self.selectFeedbackOutput.setText("0 Polygon Meshes found.")
-                return  # Early exit since there are no meshes
+                number = len(parents)
+                self.selectFeedbackOutput.setText(f"{number} {label} in scene.")
 
-            # Select all mesh parents in one go
-            parents = getMeshParents(allMeshes)
-            cmds.select(parents, add=True)
-            
-            number = len(parents)
-            self.selectFeedbackOutput.setText(f"{number} Polygon Meshes in scene.")
-        
         # If 'selectSearchCurrentChoice' is True, search descendants of selected objects
         else:
-            selection = cmds.ls(selection=True)
+            selection = cmds.ls(selection=True, long=True)
             if not selection:
-                openErrorWindow("Select an object to search its descendants for Polygon Meshes")
-                return  # Early exit if nothing is selected
-
-            polySet = set()
-            for obj in selection:
-                descendants = cmds.listRelatives(obj, allDescendents=True, type="mesh")
-                if descendants:
-                    polySet.update(descendants)
-            
-            if not polySet:
-                self.selectFeedbackOutput.setText("No descendant Polygon Meshes found.")
-                return  # Early exit if no descendant meshes found
-
-            # Select all mesh parents in one go
-            parents = getMeshParents(polySet)
-            cmds.select(parents, replace=True)
-
-            if self.addToSelectionChoice:
-                cmds.select(selection, add=True)
-
-            number = len(parents)
-            self.selectFeedbackOutput.setText(f"{number} Meshes under selection.")
-
-    def selectAllCurves(self):
-        def getCurveParents(curves):
-            parents = []
-            for curve in curves:
-                parent = cmds.listRelatives(curve, parent=True)
-                if parent:
-                    parents.append(parent[0])
-            return parents
-        # If 'selectSearchCurrentChoice' is False, select all meshes in the scene
-        if not self.selectSearchCurrentChoice:
-            if not self.addToSelectionChoice:
-                cmds.select(clear=True)
-            
-            allCurves = cmds.ls(type = "nurbsCurve")
-            if not allCurves:
-                self.selectFeedbackOutput.setText("0 Curves found.")
+                openErrorWindow(f"Select an object to search its descendants for {label}.")
                 return
 
-            parents = getCurveParents(allCurves)
-            cmds.select(parents, add=True)
+            def gather():
+                shapes = self.sceneIndex.descendantsOf(selection, shapeType)
+                if not shapes:
+                    self.selectFeedbackOutput.setText(f"No descendant {label} found.")
+                    return None
+                return shapes
 
-            number = len(parents)
-            self.selectFeedbackOutput.setText(f"{number} Curves in scene.")
+            def finish(parents):
+                parents = list(dict.fromkeys(parents))
+                if not self.addToSelectionChoice:
+                    cmds.select(parents, replace=True)
+                else:
+                    cmds.select(parents + selection, replace=True)
 
-        # If 'selectSearchCurrentChoice' is True, search descendants of selected objects
-        else:
-            selection = cmds.ls(selection=True)
-            if not selection:
-                openErrorWindow("Select an object to search its descendants for Curves.")
-                return
-            curveSet = set()
-            for obj in selection:
-                descendants = cmds.listRelatives(obj, allDescendents = True, type="nurbsCurve")
-                if descendants:
-                    curveSet.update(descendants)
-            
-            if not curveSet:
-                self.selectFeedbackOutput.setText("No descendant Curves found.")
-                return
-            
-            parents = getCurveParents(curveSet)
-            cmds.select(parents, replace=True)
+                number = len(parents)
+                self.selectFeedbackOutput.setText(f"{number} {label} under selection.")
 
-            if self.addToSelectionChoice:
-                cmds.select(selection, add=True)
+        self.runSelectionTask(gather, self.sceneIndex.parentsOf, finish, label)
+
+    def selectAllMeshes(self):
+        self.selectAllOfType("mesh", "Polygon Meshes")
 
-            number = len(parents)
-            self.selectFeedbackOutput.setText(f"{number} Curves under selection.")
+    def selectAllCurves(self):
+        self.selectAllOfType("nurbsCurve", "Curves")
 
     def selectAllNurbsSurfaces(self):
-        def getCurveParents(curves):
-            parents = []
-            for curve in curves:
-                parent = cmds.listRelatives(curve, parent=True)
-                if parent:
-                    parents.append(parent[0])
-            return parents
-        # If 'selectSearchCurrentChoice' is False, select all meshes in the scene
-        if not self.selectSearchCurrentChoice:
+        self.selectAllOfType("nurbsSurface", "NURBS")
+
+    # Selects the lights of the given renderers in one pass and reports the number found per renderer.
+    # Renderers whose plugin isn't loaded have no registered types and are reported as not loaded.
+    def selectLights(self, renderers, label):
+        lightCounts = {}
+
+        def gather():
+            lightRenderers = {}
+            for renderer, lightTypes in self.lightTypeRegistry.items():
+                if renderer not in renderers:
+                    continue
+                registeredTypes = self.sceneIndex.resolveTypes(lightTypes)
+                if not registeredTypes:
+                    lightCounts[renderer] = None
+                    continue
+                lightCounts[renderer] = 0
+                for light in self.sceneIndex.nodesOfType(registeredTypes):
+                    if light not in lightRenderers:
+                        lightRenderers[light] = renderer
+                        lightCounts[renderer] += 1
+
+            if not lightRenderers:
+                self.selectFeedbackOutput.setText(self.lightFeedback(lightCounts, label))
+                return None
+            return list(lightRenderers)
+
+        def finish(parents):
+            parents = list(dict.fromkeys(parents))
             if not self.addToSelectionChoice:
-                cmds.select(clear=True)
-            
-            allSurfaces = cmds.ls(type = "nurbsSurface")
-            if not allSurfaces:
-                self.selectFeedbackOutput.setText("0 NURBS found.")
-                return
-
-            parents = getCurveParents(allSurfaces)
-            cmds.select(parents, add=True)
-
-            number = len(parents)
-            self.selectFeedbackOutput.setText(f"{number} NURBS in scene.")
-
-        # If 'selectSearchCurrentChoice' is True, search descendants of selected objects
-        else:
-            selection = cmds.ls(selection=True)
-            if not selection:
-                openErrorWindow("Select an object to search its descendants for NURBS.")
-                return
-            nurbsSet = set()
-            for obj in selection:
-                descendants = cmds.listRelatives(obj, allDescendents = True, type="nurbsSurface")
-                if descendants:
-                    nurbsSet.update(descendants)
-            
-            if not nurbsSet:
-                self.selectFeedbackOutput.setText("No descendant NURBS found.")
-                return
-            
-            parents = getCurveParents(nurbsSet)
-            cmds.select(parents, replace=True)
-
-            if self.addToSelectionChoice:
-                cmds.select(selection, add=True)
-
-            number = len(parents)
-            self.selectFeedbackOutput.setText(f"{number} NURBS under selection.")
-        
-    def selectLights(self, lightTypes):
-        selectedLights = set()
-        
-        for lightType in lightTypes:
-            lights = cmds.ls(type=lightType)
-            if lights:
-                selectedLights.update(lights)
-        
-        if not selectedLights:
-            if any(light.startswith("light") for light in lightTypes):
-                self.selectFeedbackOutput.setText("No Maya Lights found")
-
-            if any(light.startswith("Redshift") for light in lightTypes):
-                self.selectFeedbackOutput.setText("No Redshift Lights found")
-
-            if any(light.startswith("VRay") for light in lightTypes):
-                self.selectFeedbackOutput.setText("No VRay Lights found")
+                cmds.select(parents, replace=True)
+            else:
+                cmds.select(parents, add=True)
+            self.selectFeedbackOutput.setText(self.lightFeedback(lightCounts, label))
 
-            if any(light.startswith("light") for light in lightTypes) and any(light.startswith("Redshift") for light in lightTypes) and any(light.startswith("VRay") for light in lightTypes):
-                self.selectFeedbackOutput.setText("No Lights found")
-            return set()
+        self.runSelectionTask(gather, self.sceneIndex.parentsOf, finish, label)
 
-        if not self.addToSelectionChoice:
-            cmds.select(clear=True)
-        
-        for light in selectedLights:
-            currentRelative = cmds.listRelatives(light, parent=True)
-            if currentRelative:
-                cmds.select(currentRelative, add=True)
-        
-        return selectedLights
+    # Builds the feedback text from the per-renderer counts of selectLights
+    def lightFeedback(self, lightCounts, label):
+        if all(count is None for count in lightCounts.values()):
+            return f"{label} plugin not loaded."
+        total = sum(count for count in lightCounts.values() if count)
+        if len(lightCounts) == 1:
+            return f"{total} {label} in scene."
+        details = ", ".join(f"{renderer} {count}" for renderer, count in lightCounts.items() if count is not None)
+        return f"{total} {label} in scene ({details})."
 
     def selectAllMayaLights(self):
-        self.allMayaLights = self.selectLights(["light"])
-        number = str(len(self.allMayaLights))
-        self.selectFeedbackOutput.setText(f"{number} Maya Lights in scene.")
+        self.selectLights(["Maya"], "Maya Lights")
 
     def selectAllRedshiftLights(self):
-        lightTypes = ["RedshiftPhysicalLight", "RedshiftDomeLight", "RedshiftIESLight", "RedshiftPortalLight" ]
-        self.redshiftLightsSet = self.selectLights(lightTypes)
-        number = str(len(self.redshiftLightsSet))
-        self.selectFeedbackOutput.setText(f"{number} Redshift Lights in scene.")
+        self.selectLights(["Redshift"], "Redshift Lights")
 
     def selectAllVRayLights(self):
-        lightTypes = ["VRayLightRectShape", "VRayLightDomeShape", "VRayLightIESShape", "VRayLightSphereShape"]
-        self.vRayLightsSet = self.selectLights(lightTypes)
-        number = str(len(self.vRayLightsSet))
-        self.selectFeedbackOutput.setText(f"{number} VRay Lights in scene.")
+        self.selectLights(["VRay"], "VRay Lights")
 
     def selectAllLights(self):
+        self.selectLights(list(self.lightTypeRegistry), "Lights")
 
-        allLightTypes = [
-            "light",                    # Maya lights
-            "RedshiftPhysicalLight",    #Redshift lights
-            "RedshiftDomeLight", 
-            "RedshiftIESLight", 
-            "RedshiftPortalLight",          
-            "VRayLightRectShape",       #VRay lights
-            "VRayLightDomeShape", 
-            "VRayLightIESShape", 
-            "VRayLightSphereShape"          
-        ]
+    def setAnimPlaybackRange(self):
+        self.animPlaybackRangeChoice = self.selectAnimRangeCheckbox.isChecked()
+        return self.animPlaybackRangeChoice
 
-        if not self.addToSelectionChoice:
-            cmds.select(clear=True)
+    def setAnimCurveType(self):
+        animCurveTypeIndex = self.selectAnimTypeSelector.currentIndex()
+
+        curveTypeDictionary = {
+            0 : None,
+            1 : ["animCurveTL"],
+            2 : ["animCurveTA"],
+            3 : ["animCurveTU"],
+            4 : ["animCurveTL", "animCurveTA", "animCurveTU"],
+        }
 
-        everyLight = self.selectLights(allLightTypes)
+        self.animCurveTypeChoice = curveTypeDictionary[animCurveTypeIndex]
+        return self.animCurveTypeChoice
 
-        totalLights = str(len(everyLight))
-        self.selectFeedbackOutput.setText(f"{totalLights} Lights in scene.")
+    # Applies the optional curve type and playback range filters with one query each
+    def filterAnimationCurves(self, animCurves):
+        if animCurves and self.animCurveTypeChoice:
+            animCurves = cmds.ls(animCurves, type=self.animCurveTypeChoice) or []
+        if animCurves and self.animPlaybackRangeChoice:
+            start = cmds.playbackOptions(query=True, minTime=True)
+            end = cmds.playbackOptions(query=True, maxTime=True)
+            # Querying names over a time range only returns curves keyed within it
+            animCurves = cmds.keyframe(animCurves, query=True, name=True, time=(start, end)) or []
+        return animCurves
 
     def selectAnimationCurves(self):
         if not self.selectSearchCurrentChoice: # Search entire scene
-            allAnimCurves = cmds.ls(type="animCurve")
+            allAnimCurves = self.filterAnimationCurves(self.sceneIndex.nodesOfType("animCurve"))
             if not allAnimCurves:
                 self.selectFeedbackOutput.setText("No Animation found.")
+                return
             if not self.addToSelectionChoice:
                 cmds.select(allAnimCurves)
             else:
                 cmds.select(allAnimCurves, add=True)
+
+            number = len(allAnimCurves)
+            self.selectFeedbackOutput.setText(f"{number} Animation Curves in scene.")
         else:
-            selection = cmds.ls(selection=True)
-            # Initialize a set to hold the selection's  and descendents' anim curves
+            selection = cmds.ls(selection=True, long=True)
             if not selection:
                 openErrorWindow("Select an object to search its descendents for animation")
                 return
             
-            animCurvesSet = set()
-            
-            for obj in selection:
-                # make sure selected object is included
-                objAnim = cmds.listConnections(obj, type="animCurve")
-                if objAnim:
-                    animCurvesSet.update(objAnim)
-                
-                children = cmds.listRelatives(obj, allDescendents = True)
-                if children:
-                    for c in children:
-                        animCurve = cmds.listConnections(c, type="animCurve")
-                        if animCurve:
-                            animCurvesSet.update(animCurve)
-            cmds.select(animCurvesSet)
+            # Gather the selection and all descendants once, then query their connections in a single call
+            def gather():
+                descendants = self.sceneIndex.descendantsOf(selection)
+                return list(dict.fromkeys(selection + descendants))
+
+            def findAnimCurves(nodes):
+                return cmds.listConnections(nodes, type="animCurve") or []
+
+            def finish(animCurves):
+                animCurves = self.filterAnimationCurves(list(dict.fromkeys(animCurves)))
+                if not animCurves:
+                    self.selectFeedbackOutput.setText("No descendant Animation found.")
+                    return
+                if not self.addToSelectionChoice:
+                    cmds.select(animCurves)
+                else:
+                    cmds.select(animCurves, add=True)
+
+                number = len(animCurves)
+                self.selectFeedbackOutput.setText(f"{number} Animation Curves under selection.")
+
+            self.runSelectionTask(gather, findAnimCurves, finish, "Animation")
 
     def selectAllJointRoots(self):
         # If 'selectSearchCurrentChoice' is False, select all joint roots in the scene
         if not self.selectSearchCurrentChoice:
-            if not self.addToSelectionChoice:
-                cmds.select(clear=True)
-            allJoints = cmds.ls(type="joint")
-            if not allJoints:
-                self.selectFeedbackOutput.setText("0 Joints found in scene.")
-            visitedJoints = set()
-            
-            for j in allJoints:
-                rootJoint = j
-                
-                while True:
-                    parentJoint = cmds.listRelatives(rootJoint, parent=True, type="joint")
-                    if parentJoint:
-                        rootJoint = parentJoint[0]
-                    else:
-                        break
-                
-                if rootJoint not in visitedJoints:
-                    cmds.select(rootJoint, add=True)
-                    visitedJoints.add(rootJoint)
-
-            number = str(len(visitedJoints))
-            self.selectFeedbackOutput.setText(f"{number} Joint Chains in scene.")
+            def findJoints():
+                allJoints = self.sceneIndex.nodesOfType("joint")
+                if not allJoints:
+                    if not self.addToSelectionChoice:
+                        cmds.select(clear=True)
+                    self.selectFeedbackOutput.setText("0 Joints found in scene.")
+                    return None
+                return allJoints
+            feedback = "in scene"
         # If 'selectSearchCurrentChoice' is True, search descendants of selected objects
         else:
-            selection = cmds.ls(selection=True)
+            selection = cmds.ls(selection=True, long=True)
             if not selection:
                 openErrorWindow("Select an object to search its descendants for Joints")
                 return
             
-            jointSet = set()
-            for obj in selection:
-                descendants = cmds.listRelatives(obj, allDescendents=True, type="joint")
-                if descendants:
-                    jointSet.update(descendants)
-            if not jointSet:
-                self.selectFeedbackOutput.setText("No descendant Joints found.")
-                return
-            visitedJoints = set()
-            
-            for j in jointSet:
-                rootJoint = j
-                while True:
-                    parentJoint = cmds.listRelatives(rootJoint, parent=True, type="joint")
-                    if parentJoint:
-                        rootJoint = parentJoint[0]
-                    else:
-                        break
-                if rootJoint not in visitedJoints:
-                    cmds.select(rootJoint, add=True)
-                    visitedJoints.add(rootJoint)
-            number = str(len(visitedJoints))
-            self.selectFeedbackOutput.setText(f"{number} Joint Chains under selection.")
-
-    def selectBlendshapeMeshes(self):
-        currentSelection = cmds.ls(selection=True)
-        
-        targetMeshes = []
-        if currentSelection:
+            def findJoints():
+                jointSet = self.sceneIndex.descendantsOf(selection, "joint")
+                if not jointSet:
+                    self.selectFeedbackOutput.setText("No descendant Joints found.")
+                    return None
+                return jointSet
+            feedback = "under selection"
+
+        # Every joint in the scene is known, so roots resolve without further queries.
+        # The memo is shared between batches so each joint is still only visited once.
+        sceneJoints = set()
+        resolvedRoots = {}
+
+        def gather():
+            sceneJoints.update(self.sceneIndex.nodesOfType("joint"))
+            return findJoints()
+
+        def resolveRoots(joints):
+            return getJointRoots(joints, sceneJoints, resolvedRoots)
+
+        def finish(rootJoints):
+            rootJoints = list(dict.fromkeys(rootJoints))
+            if not self.addToSelectionChoice and not self.selectSearchCurrentChoice:
+                cmds.select(rootJoints, replace=True)
+            else:
+                cmds.select(rootJoints, add=True)
 
-            for obj in currentSelection:
-                historyNodes = cmds.listHistory(obj)
+            number = str(len(rootJoints))
+            self.selectFeedbackOutput.setText(f"{number} Joint Chains {feedback}.")
 
-                blendshapeNodes = cmds.ls(historyNodes, type="blendShape")
-                
-                for bsn in blendshapeNodes:
+        self.runSelectionTask(gather, resolveRoots, finish, "Joints")
 
-                    targetNames = cmds.blendShape(bsn, query=True, target=True)
+    def selectBlendshapeMeshes(self):
+        currentSelection = cmds.ls(selection=True, long=True)
 
-                    if targetNames:
-                        targetMeshes.extend(targetNames)
-                    else:
-                        # Let user know which object in the selection has missing target meshes.
-                        openErrorWindow(f"{obj} has a blendShape node, but targets may have been deleted.\nAll other blendShape targets selected.")
-                        print(f"{obj} has a blendShape node, but targets may have been deleted.\nAll other blendShape targers selected.")
-            
-            # If we found any target meshes, select them accounting for if "Add To Selection" is checked
-            if targetMeshes:
-                if not self.addToSelectionChoice:
-                    cmds.select(targetMeshes)
-                else:
-                    cmds.select(targetMeshes, add=True)
-            else:
-                # If the selection has a blendshape node, but no targets, let the user know which object's target meshes are missing
-                if blendshapeNodes:
-                    for bsn in blendshapeNodes:
-                        if not targetNames:
-                            openErrorWindow(f"{currentSelection[0]} has a blendShape node, but targets may have been deleted")
-                            print(f"{currentSelection[0]} has a blendShape node, but targets may have been deleted.")
-                else:
-                    openErrorWindow("No blendShape target meshes found on current seleciton.")
-                    print("No blendShape not found on current selection.")
-        
-            number = str(len(targetMeshes))
-            self.selectFeedbackOutput.setText(f"{number} BlendShape Objects in scene.")
-        else:
+        if not currentSelection:
             openErrorWindow("Select an object to begin search.")
-            allMeshes = cmds.ls(type="mesh")
-            if allMeshes:
-                allMeshesHistoryNodes = cmds.listHistory(allMeshes)
-                allMeshesBlendshapeNodes = cmds.ls(allMeshesHistoryNodes, type="blendShape")
-                number = str(len(allMeshesBlendshapeNodes))
-            else:
-                number = 0
+            number = str(len(self.sceneIndex.nodesOfType("blendShape")))
             self.selectFeedbackOutput.setText(f"{number} BlendShape Nodes in scene.")
             print("Select an object to begin search.")
+            return
 
-    def selectAllLocators(self):
-        # Helper function to select parents of meshes
-        def getLocatorParents(locators):
-            parents = []
-            for loc in locators:
-                parent = cmds.listRelatives(loc, parent=True)
-                if parent:
-                    parents.append(parent[0])
-            return parents
-
-        # If 'selectSearchCurrentChoice' is False, select all meshes in the scene
-        if not self.selectSearchCurrentChoice:
-            if not self.addToSelectionChoice:
-                cmds.select(clear=True)
-
-            allLocators = cmds.ls(type="locator")
-            if not allLocators:
-                self.selectFeedbackOutput.setText("0 Locators found.")
+        blendshapeNodes = self.blendShapeIndex.blendShapesOf(currentSelection)
 
-            # Select all mesh parents in one go
-            parents = getLocatorParents(allLocators)
-            cmds.select(parents, add=True)
-            
-            number = len(parents)
-            self.selectFeedbackOutput.setText(f"{number} Locators in scene.")
-        
-        # If 'selectSearchCurrentChoice' is True, search descendants of selected objects
-        else:
-            selection = cmds.ls(selection=True)
-            if not selection:
-                openErrorWindow("Select an object to search its descendants for Locators")
-                return  # Early exit if nothing is selected
-
-            locatorSet = set()
-            for obj in selection:
-                descendants = cmds.listRelatives(obj, allDescendents=True, type="locator")
-                if descendants:
-                    locatorSet.update(descendants)
-            
-            if not locatorSet:
-                self.selectFeedbackOutput.setText("No descendant Locators found.")
+        targetMeshes = []
+        missingTargets = []
+        for obj, bsn in blendshapeNodes:
+            targetNames, missingCount = self.blendShapeIndex.targetsOf(bsn)
+            targetMeshes.extend(targetNames)
+            if missingCount:
+                missingTargets.append(f"{obj.rpartition('|')[2]} : {bsn} is missing {missingCount} target(s).")
+
+        # Let user know which objects in the selection have missing target meshes.
+        if missingTargets:
+            message = "\n".join(missingTargets)
+            if targetMeshes:
+                message += "\nAll other blendShape targets selected."
+            openErrorWindow(message)
+            print(message)
 
-            # Select all mesh parents in one go
-            parents = getLocatorParents(locatorSet)
-            cmds.select(parents, replace=True)
+        # If we found any target meshes, select them accounting for if "Add To Selection" is checked
+        targetMeshes = list(dict.fromkeys(targetMeshes))
+        if targetMeshes:
+            if not self.addToSelectionChoice:
+                cmds.select(targetMeshes)
+            else:
+                cmds.select(targetMeshes, add=True)
+        elif not blendshapeNodes:
+            openErrorWindow("No blendShape target meshes found on current seleciton.")
+            print("No blendShape not found on current selection.")
 
-            if self.addToSelectionChoice:
-                cmds.select(selection, add=True)
+        number = str(len(targetMeshes))
+        self.selectFeedbackOutput.setText(f"{number} BlendShape Objects in scene.")
 
-            number = len(parents)
-            self.selectFeedbackOutput.setText(f"{number} Locators under selection.")
+    def selectAllLocators(self):
+        self.selectAllOfType("locator", "Locators")
 
     def selectAllConstraints(self):
         # If 'selectSearchCurrentChoice' is False, select all constraints in the scene
         if not self.selectSearchCurrentChoice:
             if not self.addToSelectionChoice:
                 cmds.select(clear=True)
-            allConstraints = cmds.ls(type="constraint")
+            allConstraints = self.sceneIndex.nodesOfType("constraint")
             if not allConstraints:
                 self.selectFeedbackOutput.setText("0 Constraints found")
                 return
@@ -1364,16 +1758,12 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
             number = str(len(allConstraints))
             self.selectFeedbackOutput.setText(f"{number} Constraints in scene.")
         else:
-            selection = cmds.ls(selection=True)
+            selection = cmds.ls(selection=True, long=True)
             if not selection:
                 openErrorWindow("Select an object to search its descendants for Constraints")
                 return
             
-            constraintSet = set()
-            for obj in selection:
-                descendants = cmds.listRelatives(obj, allDescendents=True, type="constraint")
-                if descendants:
-                    constraintSet.update(descendants)
+            constraintSet = self.sceneIndex.descendantsOf(selection, "constraint")
 
             if not constraintSet:
                 self.selectFeedbackOutput.setText("No descendant Constraints found.")
@@ -1391,7 +1781,7 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
         if not self.selectSearchCurrentChoice:
             if not self.addToSelectionChoice:
                 cmds.select(clear=True)
-            allIKHandles = cmds.ls(type="ikHandle")
+            allIKHandles = self.sceneIndex.nodesOfType("ikHandle")
             if not allIKHandles:
                 self.selectFeedbackOutput.setText("0 IK Handles found")
                 return
@@ -1402,16 +1792,12 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
             number = str(len(allIKHandles))
             self.selectFeedbackOutput.setText(f"{number} IK Handles in scene.")
         else:
-            selection = cmds.ls(selection=True)
+            selection = cmds.ls(selection=True, long=True)
             if not selection:
                 openErrorWindow("Select an object to search its descendants for IK Handles")
                 return
             
-            ikHandleSet = set()
-            for obj in selection:
-                descendants = cmds.listRelatives(obj, allDescendents=True, type="ikHandle")
-                if descendants:
-                    ikHandleSet.update(descendants)
+            ikHandleSet = self.sceneIndex.descendantsOf(selection, "ikHandle")
 
             if not ikHandleSet:
                 self.selectFeedbackOutput.setText("No descendant IK Handles found.")
@@ -1429,51 +1815,84 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
         self.objectCleanup = self.cleanupObjectsCheckbox.isChecked()
         return self.objectCleanup
     
+    def setCurveFit(self):
+        curveFitIndex = self.curveFitSelector.currentIndex()
+
+        curveFitDictionary = {
+            0 : "none",
+            1 : "count",
+            2 : "tolerance",
+        }
+
+        self.curveFitChoice = curveFitDictionary[curveFitIndex]
+        self.curveFitCountInput.setEnabled(self.curveFitChoice == "count")
+        self.curveFitToleranceInput.setEnabled(self.curveFitChoice == "tolerance")
+        return self.curveFitChoice
+
+    # Half typed values are ignored until they are valid again
+    def setCurveFitCount(self):
+        if self.curveFitCountInput.hasAcceptableInput():
+            self.curveFitCountChoice = int(self.curveFitCountInput.text())
+        return self.curveFitCountChoice
+
+    def setCurveFitTolerance(self):
+        if self.curveFitToleranceInput.hasAcceptableInput():
+            self.curveFitToleranceChoice = float(self.curveFitToleranceInput.text())
+        return self.curveFitToleranceChoice
+
+    # Locators, joints, geometry and empty transforms all contribute their world position.
+    # In the fit modes the positions are approximated by a cubic curve with fewer CVs instead of used as CVs.
     def createCurveAtObjects(self, cleanup = False):
-        objectPositions = []
         cleanup = self.objectCleanup
-        currentSelection = cmds.ls(selection=True, type="transform")
+        currentSelection = cmds.ls(selection=True, type="transform", long=True)
         
         if len(currentSelection) < 4:
             openErrorWindow(f"A minimum of 4 objects is required. Found {len(currentSelection)}.")
             raise ValueError(f"Minimum of 4 objects required, found {len(currentSelection)}")
         
+        if self.curveFitChoice != "none" and np is None:
+            openErrorWindow("Curve fitting requires NumPy.")
+            raise ValueError("Curve fitting requires NumPy.")
+
         self.checkGroups("curve")
-        # Handle postions of CVs for locator, joint, and geomety cases
-        for obj in currentSelection:
-            shapes = cmds.listRelatives(obj, shapes=True)
-            if shapes:
-                shapeTypes = [cmds.objectType(shape) for shape in shapes]
-                if "locator" in shapeTypes:
-                    locPos = cmds.pointPosition(obj)
-                    objectPositions.append(locPos)
-                else:
-                    objPosition = cmds.xform(obj, query=True, worldSpace=True, translation=True)
-                    objectPositions.append(objPosition)
-            else:
-                if cmds.objectType(obj) == "joint":
-                    jointPos = cmds.xform(obj, query=True, worldSpace=True, translation=True)
-                    objectPositions.append(jointPos)
+        objectPositions = getWorldPositions(currentSelection)
         
-        curveNumber = 0
-        
-        while True:
-            curveName = f"ObjectCurve_{curveNumber}_Crv"
-            if not cmds.objExists(curveName):
-                objectCurve = cmds.curve(p=objectPositions, name = curveName)
-                break
+        curveName = self.nameAllocator.reserveNames("ObjectCurve_{}_Crv")[0]
+        if self.curveFitChoice == "none":
+            objectCurve = cmds.curve(p=objectPositions, name = curveName)
+        else:
+            if self.curveFitChoice == "count":
+                cvs, knots, fitError = fitCubicCurve(objectPositions, self.setCurveFitCount())
             else:
-                curveNumber += 1
+                cvs, knots, fitError = fitCubicCurveToTolerance(objectPositions, self.setCurveFitTolerance())
+            objectCurve = cmds.curve(p=cvs, knot=knots, degree=3, name = curveName)
+            # Shown in Maya's command line like other tool feedback, as a warning when the curve misses the tolerance
+            fitMessage = f"{objectCurve} fitted with {len(cvs)} CVs. Objects are at most {fitError:.4g} units from the curve."
+            if self.curveFitChoice == "tolerance" and fitError > self.curveFitToleranceChoice:
+                cmds.warning(f"{fitMessage} This is more than the {self.curveFitToleranceChoice:g} tolerance.")
+            else:
+                om.MGlobal.displayInfo(fitMessage)
 
         cmds.parent(objectCurve, self.groupType)
         if cleanup:
             cmds.delete(currentSelection)
 
-    # Creates a cluster at each CV of selected curve
+    def setClusterMode(self):
+        clusterModeIndex = self.clusterModeSelector.currentIndex()
+
+        clusterModeDictionary = {
+            0 : "cluster",
+            1 : "skin",
+        }
+
+        self.clusterModeChoice = clusterModeDictionary[clusterModeIndex]
+        return self.clusterModeChoice
+
+    # Creates a cluster at each CV of selected curve, or a joint at each CV bound with one skinCluster.
+    # CVs are addressed by index instead of flattening the CV list, and all handles or joints are parented at once.
     def clusterAtCV(self):
         selectedTransforms = cmds.ls(selection=True, type="transform")
         selectedCurve = None
-        groupNumber = 0
         
         if len(selectedTransforms) != 1:
             openErrorWindow("Please select exactly 1 Nurbs curve.")
@@ -1484,30 +1903,49 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
                 selectedCurve = transform
                 break
 
-        # Get CVs of the selected curve
-        curveCVs = cmds.ls(f'{selectedCurve}.cv[*]', flatten=True)
+        if not selectedCurve:
+            openErrorWindow("Please select exactly 1 Nurbs curve.")
+            raise ValueError("Please select exactly 1 curve.")
+
+        cvPositions = getCurveCVPositions(selectedCurve)
 
-        if not curveCVs or len(curveCVs) < 4:
+        if len(cvPositions) < 4:
             openErrorWindow(f"A minimum of 4 CVs is needed on {selectedCurve}.")
             raise ValueError(f"A minimum of 4 CVs is needed on {selectedCurve}")
 
-        # Create a cluster group
-        while True:
-            clusterGroupName = f"{selectedCurve}_{groupNumber}_Cluster_Grp"
-            if not cmds.objExists(clusterGroupName):
-                clusterGroup = cmds.group(empty=True, name = clusterGroupName)
-                break
-            else:
-                groupNumber += 1
-
         self.checkGroups("cluster")
 
-        cmds.parent(clusterGroup, self.groupType)
+        # Create a cluster group
+        clusterGroupName = self.nameAllocator.reserveNames(f"{selectedCurve}_{{}}_Cluster_Grp")[0]
+        clusterGroup = cmds.group(empty=True, name = clusterGroupName, parent = self.groupType)
+
+        if self.clusterModeChoice == "skin":
+            self.skinCurveToCVJoints(selectedCurve, cvPositions, clusterGroup)
+            return
 
         # Create clusters for each CV and parent them to the cluster group
-        for cv in curveCVs:
-            curveCluster, handle = cmds.cluster(cv)
-            cmds.parent(handle, clusterGroup)
+        clusterHandles = []
+        for index in range(len(cvPositions)):
+            curveCluster, handle = cmds.cluster(f"{selectedCurve}.cv[{index}]")
+            clusterHandles.append(handle)
+        cmds.parent(clusterHandles, clusterGroup)
+
+    # Creates a joint at each CV position and binds the curve to them with one skinCluster. With a single influence
+    # per CV, each CV binds fully to the joint placed on it.
+    def skinCurveToCVJoints(self, curve, cvPositions, jointGroup):
+        jointNames = self.nameAllocator.reserveNames(f"{curve}_{{}}_CV_Jnt", len(cvPositions))
+        cvJoints = []
+        for position, jointName in zip(cvPositions, jointNames):
+            cvJoint = cmds.createNode("joint", name=jointName, skipSelect=True)
+            cmds.setAttr(f"{cvJoint}.translate", position[0], position[1], position[2])
+            cvJoints.append(cvJoint)
+        cmds.parent(cvJoints, jointGroup)
+
+        skinName = self.nameAllocator.reserveNames(f"{curve}_{{}}_skinCluster")[0]
+        curveSkin = cmds.skinCluster(cvJoints, curve, toSelectedBones=True, bindMethod=0, maximumInfluences=1,
+                                     obeyMaxInfluences=True, name=skinName)[0]
+        cmds.select(clear=True)
+        return cvJoints, curveSkin
     
     # Joint Tools Methods__________
     def jointsAtCVs(self):
@@ -1522,109 +1960,88 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
             if cmds.listRelatives(transform, type="nurbsCurve", children=True):
                 selectedCurve = transform
                 break
+
+        if selectedCurve is None:
+            openErrorWindow("Select exactly 1 NURBS Curve.")
+            raise ValueError("Select exactly 1 NURBS curve.")
         
-        curveCVs = cmds.ls(f"{selectedCurve}.cv[*]", flatten=True)
+        cvPositions = getCurveCVPositions(selectedCurve)
 
-        if not curveCVs:
+        if not cvPositions:
             openErrorWindow(f"No CVs found on {selectedCurve}.")
             raise ValueError(f"No CVs on {selectedCurve}")
+
+        # Even spacing follows the curve itself, sampled densely from its CVs and knots, not the CV hull
+        if self.jointResampleChoice:
+            jointCount = self.getResampleCount()
+            curvePoints = getCurveSamplePoints(selectedCurve, max(jointCount, len(cvPositions)) * 8)
+            cvPositions = resamplePolyline(curvePoints, jointCount)
         
         self.checkGroups("joint")
-        
-        previousJoint = None
-        chainNumber = 0
-        groupNumber = 0
-
-        while True:
-            groupName = f"{selectedCurve}_{groupNumber}_Joint_Grp"
-            if not cmds.objExists(groupName):
-                jointGroup = cmds.group(empty=True, name=groupName)
-                break
-            else:
-                groupNumber += 1
-
-        for cv in curveCVs:
-            cmds.select(clear=True)
-            cvPosition = cmds.pointPosition(cv, world=True)
-            while True:
-                jointName = f"{selectedCurve}_{chainNumber}_Jnt"
-                if not cmds.objExists(jointName):
-                    currentJoint = cmds.joint(position = cvPosition, name=jointName)
-                    break
-                else:
-                    chainNumber += 1                          
-            
-            if previousJoint:
-                cmds.parent(currentJoint, previousJoint)
-                cmds.joint(previousJoint, edit = True, zeroScaleOrient = True, orientJoint = self.jointOrientationChoice, secondaryAxisOrient = self.jointSecondaryChoice)
 
-            previousJoint=currentJoint
-        
-        endJoint = cmds.ls(selection = True)
-        rootJoint = endJoint
-        
-        while True:
-            parentJoint = cmds.listRelatives(rootJoint, parent=True, type="joint")
-            if parentJoint:
-                rootJoint=parentJoint[0]
-            else:
-                break
-        
-        cmds.parent(rootJoint, jointGroup)
+        groupName = self.nameAllocator.reserveNames(f"{selectedCurve}_{{}}_Joint_Grp")[0]
+        jointGroup = cmds.group(empty=True, name=groupName)
+        jointNames = self.nameAllocator.reserveNames(f"{selectedCurve}_{{}}_Jnt", len(cvPositions))
 
-        cmds.parent(jointGroup, self.groupType)
+        self.buildJointChain(cvPositions, jointNames, jointGroup, self.jointOrientationChoice, self.jointSecondaryChoice)
     
     # Places a joint at the center of each selected object
     def jointsAtObjects(self):
-        currentSelection = cmds.ls(selection=True, type="transform")
+        currentSelection = cmds.ls(selection=True, type="transform", long=True)
         if not currentSelection:
             openErrorWindow("Select at least one object to place joints.")
             raise ValueError("Select at least one object to place joints.")
+        objectPositions = getWorldPositions(currentSelection)
+        if self.jointResampleChoice:
+            objectPositions = resamplePolyline(objectPositions, self.getResampleCount())
+
         self.checkGroups("joint")
-        previousJoint = None
-        chainNumber = 0
-        groupNumber = 0
-        while True:
-            groupName = f"JointChain_{groupNumber}_Joint_Grp"
-            if not cmds.objExists(groupName):
-                jointGroup = cmds.group(empty=True, name=groupName)
-                break
-            else:
-                groupNumber += 1
-        
-        for obj in currentSelection:
-            pos = cmds.xform(obj, query=True, worldSpace=True, translation=True)
-            while True:
-                jointName = f"jointChain_{groupNumber}_{chainNumber}_Jnt"
-                if not cmds.objExists(jointName):
-                    currentJoint = cmds.joint(position=(pos), name = jointName)
-                    break
-                else:
-                    chainNumber += 1
-            if previousJoint:
-                cmds.joint(previousJoint, edit = True, zeroScaleOrient = True, orientJoint = self.jointOrientationChoice, secondaryAxisOrient = self.jointSecondaryChoice)
-            
-            previousJoint = currentJoint
+        groupNumber = self.nameAllocator.reserve("JointChain_{}_Joint_Grp")[0]
+        jointGroup = cmds.group(empty=True, name=f"JointChain_{groupNumber}_Joint_Grp")
+        jointNames = self.nameAllocator.reserveNames(f"jointChain_{groupNumber}_{{}}_Jnt", len(objectPositions))
+
+        self.buildJointChain(objectPositions, jointNames, jointGroup, self.jointOrientationChoice, self.jointSecondaryChoice)
+
+    def setJointResample(self):
+        self.jointResampleChoice = self.jointResampleCheckbox.isChecked()
+        return self.jointResampleChoice
 
+    # Even spacing uses the Number of Joints field, and needs at least the two end joints
+    def getResampleCount(self):
+        if not self.jointNumberInput.hasAcceptableInput() or int(self.jointNumberInput.text()) < 2:
+            openErrorWindow("Number of Joints must be at least 2 for even spacing.")
+            raise ValueError("Number of Joints must be at least 2 for even spacing.")
+        self.setJointNumber()
+        return self.jointNumberChoice
+
+    # Builds a chain through the world positions in one pass. The root is created inside the new joint group,
+    # which still sits at the origin, and each later joint is created as a child of the previous one, so nothing
+    # is reparented. The whole chain is oriented with one edit at the end, then the group is moved under the
+    # current group type.
+    def buildJointChain(self, positions, jointNames, jointGroup, jointOrient, secondAxis):
+        if not positions:
+            cmds.parent(jointGroup, self.groupType)
+            return []
+        rootJoint = cmds.createNode("joint", name=jointNames[0], parent=jointGroup)
+        cmds.setAttr(f"{rootJoint}.translate", positions[0][0], positions[0][1], positions[0][2])
+        # createNode leaves the new joint selected, and joint creates a child of the selected joint
+        chainJoints = [rootJoint]
+        for position, jointName in zip(positions[1:], jointNames[1:]):
+            chainJoints.append(cmds.joint(position=position, name=jointName))
+
+        cmds.joint(rootJoint, edit=True, children=True, zeroScaleOrient=True, orientJoint=jointOrient, secondaryAxisOrient=secondAxis)
         cmds.parent(jointGroup, self.groupType)
         cmds.select(clear=True)
+        return chainJoints
 
     # Selects entire hierarchy of joints from anywhere within a joint chain
     def selectJointHierarchy(self):
-        currentSelection = cmds.ls(selection=True, type = "joint")
+        currentSelection = cmds.ls(selection=True, type = "joint", long=True)
         if currentSelection and len(currentSelection) == 1:
-            endJoint = cmds.ls(selection = True)
-            rootJoint = endJoint
+            rootJoint = getJointRoots(currentSelection)[0]
         else:
             openErrorWindow("Select exactly 1 joint object.")
             raise ValueError("Select exactly 1 joint object")    
-        
-        while True:
-            parentJoint = cmds.listRelatives(rootJoint, parent=True, type="joint")
-            if parentJoint:
-                rootJoint=parentJoint[0]
-            else:
-                break
 
         cmds.select(rootJoint)
         cmds.select(hierarchy=True)
@@ -1704,37 +2121,13 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
 
         self.checkGroups("joint")
 
-        previousJoint = None
-        chainNumber = 0
-        groupNumber = 0
         # create a uniquely named group for this joint chain
-        while True:
-            groupName = f"JointChain_{groupNumber}_Joint_Grp"
-            if not cmds.objExists(groupName):
-                jointGroup = cmds.group(empty=True, name=groupName)
-                break
-            else:
-                groupNumber += 1
-        
-        for i in range(number):
-            if i == 0:
-                currentJoint = cmds.joint(position=(0, 0, 0), name=f"jointChain_{groupNumber}_{chainNumber}_Jnt")
-            else:
-                jointPosition = axisDictionary[direction](i)
-                while True:
-                    jointName = f"jointChain_{groupNumber}_{chainNumber}_Jnt"
-                    if not cmds.objExists(jointName):
-                        currentJoint = cmds.joint(position=jointPosition, name=jointName)
-                        cmds.joint(previousJoint, edit=True, zeroScaleOrient=True, orientJoint=jointOrient, secondaryAxisOrient=secondAxis)
-                        break
-                    else:
-                        chainNumber += 1
-                
-            previousJoint = currentJoint
-
-        cmds.parent(jointGroup, self.groupType)
+        groupNumber = self.nameAllocator.reserve("JointChain_{}_Joint_Grp")[0]
+        jointGroup = cmds.group(empty=True, name=f"JointChain_{groupNumber}_Joint_Grp")
+        jointNames = self.nameAllocator.reserveNames(f"jointChain_{groupNumber}_{{}}_Jnt", number)
+        jointPositions = [axisDictionary[direction](i) for i in range(number)]
 
-        cmds.select(clear=True)
+        self.buildJointChain(jointPositions, jointNames, jointGroup, jointOrient, secondAxis)
 
     def resetJointTools(self):
         self.jointAxisSelector.setCurrentIndex(0)
@@ -2186,6 +2579,44 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
             self.sceneOSVersionFeedback.setText("unsaved scene")
             self.sceneCutFeedback.setText("unsaved scene")
 
+        self.sceneIndexFeedback.setText(self.sceneIndex.stats())
+
+    # Swaps the module's cmds for the recorder while recording, so every Maya command a tool runs is counted and timed
+    def setInstrumentCalls(self):
+        self.instrumentCallsChoice = self.instrumentCallsCheckbox.isChecked()
+        if self.instrumentCallsChoice:
+            self.commandRecorder.install(self, self.showRecordedActions)
+        else:
+            self.commandRecorder.uninstall()
+        self.showRecordedActions()
+        return self.instrumentCallsChoice
+
+    def setInstrumentHistory(self):
+        instrumentHistoryIndex = self.instrumentHistorySelector.currentIndex()
+
+        historyDictionary = {
+            0 : 5,
+            1 : 10,
+            2 : 25,
+        }
+
+        self.instrumentHistoryChoice = historyDictionary[instrumentHistoryIndex]
+        self.commandRecorder.setHistorySize(self.instrumentHistoryChoice)
+        self.showRecordedActions()
+        return self.instrumentHistoryChoice
+
+    def clearRecordedActions(self):
+        self.commandRecorder.clear()
+        self.showRecordedActions()
+
+    def showRecordedActions(self):
+        if not self.instrumentCallsChoice:
+            self.instrumentActionsFeedback.setText("Recording off")
+        elif not self.commandRecorder.actions:
+            self.instrumentActionsFeedback.setText("No actions recorded yet")
+        else:
+            self.instrumentActionsFeedback.setText("\n".join(action.summary() for action in self.commandRecorder.actions))
+
     # Handles scene group creations and parenting 
     def checkGroups(self, mode):
         sceneDeformersGroup = "Deformers_Grp"
@@ -2200,19 +2631,40 @@ class HybridToolboxGUI(QtWidgets.QMainWindow):
 
         if mode in modeDictionary:
             groupName = modeDictionary[mode]
-            if not cmds.objExists(groupName):
-                self.groupType = cmds.group(empty=True, name=groupName)
-            else:
-                self.groupType = groupName
-            
-        if cmds.objExists(sceneDeformersGroup):
-            self.deformersGroup = sceneDeformersGroup
-            children = cmds.listRelatives(self.deformersGroup, children=True) or []
-            if self.groupType not in children:
+            self.groupType = self.getGroupPath(groupName)
+            if not self.groupType:
+                self.groupType = self.getGroupPath(cmds.group(empty=True, name=groupName))
+
+        # A group already under Deformers_Grp proves it exists, so the common case needs no further queries
+        groupParent = self.groupType.rsplit("|", 1)[0] if self.groupType else ""
+        if groupParent.rsplit("|", 1)[-1] == sceneDeformersGroup:
+            self.deformersGroup = groupParent
+            return
+
+        self.deformersGroup = self.getGroupPath(sceneDeformersGroup)
+        if self.deformersGroup:
+            if self.groupType:
                 cmds.parent(self.groupType, self.deformersGroup)
+                self.groupType = f"{self.deformersGroup}|{self.groupType.rsplit('|', 1)[-1]}"
         else:
             cmds.warning("Deformers_Grp does not exist. Check project settings.")
 
+    # Returns the long path of a group, resolved through its cached UUID so renames and reparenting are followed
+    # with a single ls call. Falls back to a name lookup, and returns None when no such group exists.
+    def getGroupPath(self, groupName):
+        groupUuid = self.groupHandles.get(groupName)
+        if groupUuid:
+            groupPaths = cmds.ls(groupUuid, long=True)
+            if groupPaths and groupPaths[0].rsplit("|", 1)[-1] == groupName:
+                return groupPaths[0]
+
+        groupPaths = cmds.ls(groupName, long=True)
+        if not groupPaths:
+            self.groupHandles.pop(groupName, None)
+            return None
+        self.groupHandles[groupName] = cmds.ls(groupPaths[0], uuid=True)[0]
+        return groupPaths[0]
+
 class HybridToolboxErrorGUI(QtWidgets.QMainWindow):
     def __init__(self, windowName, errorMessage, parent = None):
         super().__init__(parent)
@@ -2236,6 +2688,71 @@ class HybridToolboxErrorGUI(QtWidgets.QMainWindow):
         self.move(500,200)
         self.show()
 
+# Processes a list in time-sliced batches on the Qt event loop so the per-node work of long searches doesn't
+# freeze the UI. The first slice gathers the items, so the action returns before the scene is queried, but that
+# query itself still runs in one piece. Each later slice runs batches until its time budget is spent, reports
+# progress, then yields back to Qt. gather may return None when it has nothing to search, which finishes with None.
+class ChunkedTask(QtCore.QObject):
+    def __init__(self, gather, processBatch, finish, progress=None, fail=None, batchSize=2000, sliceTime=0.05, parent=None):
+        super().__init__(parent)
+        self.gather = gather
+        self.items = None
+        self.processBatch = processBatch
+        self.finish = finish
+        self.progress = progress
+        self.fail = fail
+        self.batchSize = batchSize
+        self.sliceTime = sliceTime
+        self.index = 0
+        self.results = []
+        self.cancelled = False
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self.step)
+
+    def start(self):
+        self.timer.start()
+
+    def cancel(self):
+        self.stop()
+
+    def step(self):
+        if self.cancelled:
+            return
+        # A failing batch would fail again on every tick, so stop and report it once
+        try:
+            if self.items is None:
+                items = self.gather()
+                if items is None:
+                    self.stop()
+                    self.finish(None)
+                    return
+                self.items = list(items)
+
+            deadline = time.perf_counter() + self.sliceTime
+            while self.index < len(self.items) and time.perf_counter() < deadline:
+                batch = self.items[self.index:self.index + self.batchSize]
+                self.results.extend(self.processBatch(batch))
+                self.index += len(batch)
+        except Exception as error:
+            self.stop()
+            if self.fail:
+                self.fail(error)
+            return
+
+        if self.progress:
+            self.progress(self.index, len(self.items), len(self.results))
+
+        if self.index >= len(self.items):
+            self.stop()
+            self.finish(self.results)
+
+    def stop(self):
+        self.cancelled = True
+        self.timer.stop()
+        self.deleteLater()
+
 def checkWindow(qtObjectName):
     if cmds.window(qtObjectName, exists=True):
         cmds.deleteUI(qtObjectName, wnd=True)
@@ -2253,4 +2770,1080 @@ def openErrorWindow(message):
     windowName = "Hybrid Toolbox error"
     errorMessage = message
     checkWindow(windowName)
-    HybridtoolboxErrorWindow = HybridToolboxErrorGUI(windowName, errorMessage, getMayaMain())
\ No newline at end of file
+    HybridtoolboxErrorWindow = HybridToolboxErrorGUI(windowName, errorMessage, getMayaMain())
+
+# Maya call instrumentation________________________
+# Calls and time spent in each Maya command during one toolbox action
+class RecordedAction(object):
+    def __init__(self, name):
+        self.name = name
+        self.counts = {}
+        self.times = {}
+        self.totalTime = 0.0
+        self.error = None
+
+    def add(self, command, seconds):
+        self.counts[command] = self.counts.get(command, 0) + 1
+        self.times[command] = self.times.get(command, 0.0) + seconds
+
+    def topCommands(self, limit=3):
+        return sorted(self.times, key=lambda command: self.times[command], reverse=True)[:limit]
+
+    def summary(self, limit=3):
+        calls = sum(self.counts.values())
+        top = ", ".join(f"{command} x{self.counts[command]} {self.times[command]:.3f}s" for command in self.topCommands(limit))
+        error = f" [{self.error}]" if self.error else ""
+        return f"{self.name}{error} : {self.totalTime:.3f}s, {calls} calls ({top})"
+
+# Stands in for maya.cmds while recording. Toolbox methods are wrapped on the window instance so each button press
+# becomes one RecordedAction, and every command looked up during that action is counted and timed.
+# Nothing is wrapped or timed while recording is off.
+class CommandRecorder(object):
+    def __init__(self, commands, historySize=10):
+        self.commands = commands
+        self.historySize = historySize
+        self.actions = []
+        self.current = None
+        self.toolbox = None
+        self.wrappedMethods = {}
+        self.onAction = None
+
+    def __getattr__(self, name):
+        command = getattr(self.commands, name)
+        if self.current is None or not callable(command):
+            return command
+
+        def timedCommand(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return command(*args, **kwargs)
+            finally:
+                if self.current is not None:
+                    self.current.add(name, time.perf_counter() - start)
+        return timedCommand
+
+    def install(self, toolbox, onAction=None):
+        global cmds
+        if self.toolbox:
+            self.uninstall()
+        self.toolbox = toolbox
+        self.onAction = onAction
+        skipped = {"setInstrumentCalls", "setInstrumentHistory", "clearRecordedActions", "showRecordedActions"}
+        for name, member in vars(type(toolbox)).items():
+            if name.startswith("_") or name.endswith("CreateGUI") or name in skipped or not callable(member):
+                continue
+            # Methods already wrapped on the instance, e.g. by the UndoRunner, are restored on uninstall
+            self.wrappedMethods[name] = vars(toolbox).get(name)
+            setattr(toolbox, name, self.action(name, getattr(toolbox, name)))
+        cmds = self
+
+    def uninstall(self):
+        global cmds
+        if cmds is self:
+            cmds = self.commands
+        if self.toolbox:
+            for name, previous in self.wrappedMethods.items():
+                if previous is None:
+                    self.toolbox.__dict__.pop(name, None)
+                else:
+                    self.toolbox.__dict__[name] = previous
+        self.toolbox = None
+        self.wrappedMethods = {}
+        self.onAction = None
+        self.current = None
+
+    def setHistorySize(self, historySize):
+        self.historySize = historySize
+        del self.actions[historySize:]
+
+    def clear(self):
+        self.actions = []
+
+    # Wraps a toolbox method so calling it records one action. Nested toolbox methods are part of the outer action.
+    def action(self, name, method):
+        def recordedMethod(*args, **kwargs):
+            if self.current is not None:
+                return method(*args, **kwargs)
+            self.current = RecordedAction(name)
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            except Exception as error:
+                self.current.error = type(error).__name__
+                raise
+            finally:
+                recorded = self.current
+                self.current = None
+                recorded.totalTime += time.perf_counter() - start
+                if recorded.counts:
+                    self.keep(recorded)
+        return recordedMethod
+
+    # Wraps a callback that runs after the current action has returned, e.g. a later time slice of a ChunkedTask,
+    # so its commands and time are added to that action
+    def resume(self, function):
+        recorded = self.current
+        if recorded is None:
+            return function
+
+        def resumedFunction(*args, **kwargs):
+            if self.current is not None or not self.toolbox:
+                return function(*args, **kwargs)
+            self.current = recorded
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.current = None
+                recorded.totalTime += time.perf_counter() - start
+                self.keep(recorded)
+        return resumedFunction
+
+    def keep(self, recorded):
+        if recorded not in self.actions:
+            self.actions.insert(0, recorded)
+            del self.actions[self.historySize:]
+        if self.onAction:
+            self.onAction()
+
+# Undo handling________________________
+# Runs toolbox actions as one undo chunk each, or in fast bulk mode with undo recording turned off, which clears the
+# undo history, and optionally viewport refresh suspended. Actions called from inside another action run as part of it, and the undo and refresh
+# state is restored even when an action raises.
+class UndoRunner(object):
+    def __init__(self, mode="chunk", suspendRefresh=False):
+        self.mode = mode
+        self.suspendRefresh = suspendRefresh
+        self.depth = 0
+
+    # Wraps the named methods on the toolbox instance
+    def install(self, toolbox, names):
+        for name in names:
+            setattr(toolbox, name, self.action(name, getattr(toolbox, name)))
+
+    def action(self, name, method):
+        def undoableMethod(*args, **kwargs):
+            return self.run(name, method, *args, **kwargs)
+        return undoableMethod
+
+    def run(self, name, function, *args, **kwargs):
+        if self.depth:
+            return function(*args, **kwargs)
+
+        mode = self.mode
+        undoWasOn = False
+        refreshSuspended = False
+        self.depth += 1
+        try:
+            if mode == "suspend":
+                # Turning undo off flushes the queue. Keeping it would let a later undo replay earlier steps
+                # against a scene this unrecorded action has changed underneath them.
+                undoWasOn = cmds.undoInfo(query=True, state=True)
+                if undoWasOn:
+                    cmds.undoInfo(state=False)
+                if self.suspendRefresh:
+                    cmds.refresh(suspend=True)
+                    refreshSuspended = True
+            else:
+                cmds.undoInfo(openChunk=True, chunkName=name)
+            return function(*args, **kwargs)
+        finally:
+            self.depth -= 1
+            if refreshSuspended:
+                cmds.refresh(suspend=False)
+                cmds.refresh(currentView=True)
+            if mode == "suspend":
+                if undoWasOn:
+                    cmds.undoInfo(state=True)
+            else:
+                cmds.undoInfo(closeChunk=True)
+
+# Scene query helpers________________________
+# Parses text such as "0-9, 42" into a sorted list of unique indices. Returns an empty list for invalid text.
+def getIndexRanges(text):
+    indices = set()
+    for part in text.replace(" ", "").split(","):
+        if not part:
+            continue
+        start, separator, end = part.partition("-")
+        if not start.isdigit() or (separator and not end.isdigit()):
+            return []
+        indices.update(range(int(start), int(end if separator else start) + 1))
+    return sorted(indices)
+
+# Returns the top-most DAG ancestor of a long name. Components are reduced to their node, DG nodes return themselves.
+def getRootPath(path):
+    path = path.split(".")[0]
+    if not path.startswith("|"):
+        return path
+    return "|" + path.split("|")[1]
+
+# Returns (dagPath, vertex indices) for each mesh with selected vertices. Indices are read from the active
+# selection's components, so large selections are never expanded into one name per vertex.
+def getSelectedMeshVertices():
+    selection = om.MGlobal.getActiveSelectionList()
+    meshVertices = {}
+    for i in range(selection.length()):
+        try:
+            dagPath, component = selection.getComponent(i)
+        except (RuntimeError, TypeError):
+            continue
+        if component.isNull() or not component.hasFn(om.MFn.kMeshVertComponent):
+            continue
+        elements = om.MFnSingleIndexedComponent(component).getElements()
+        meshVertices.setdefault(dagPath.fullPathName(), (dagPath, set()))[1].update(elements)
+    return [(dagPath, sorted(indices)) for dagPath, indices in meshVertices.values()]
+
+# Each polygon's area is shared evenly between its vertices. Polygons are fan triangulated from their first vertex.
+# points is an (n, 3) array when NumPy is available, otherwise a list of tuples.
+def getVertexAreas(points, polygonCounts, polygonConnects):
+    if np is not None:
+        counts = np.asarray(polygonCounts, dtype=np.int64)
+        connects = np.asarray(polygonConnects, dtype=np.int64)
+        starts = np.cumsum(counts) - counts
+        triangleCounts = np.maximum(counts - 2, 0)
+        triangleFaces = np.repeat(np.arange(len(counts)), triangleCounts)
+        triangleOffsets = np.arange(triangleCounts.sum()) - np.repeat(np.cumsum(triangleCounts) - triangleCounts, triangleCounts) + 1
+        first = points[connects[starts[triangleFaces]]]
+        second = points[connects[starts[triangleFaces] + triangleOffsets]]
+        third = points[connects[starts[triangleFaces] + triangleOffsets + 1]]
+        triangleAreas = 0.5 * np.linalg.norm(np.cross(second - first, third - first), axis=1)
+        faceAreas = np.bincount(triangleFaces, weights=triangleAreas, minlength=len(counts))
+        return np.bincount(connects, weights=np.repeat(faceAreas / np.maximum(counts, 1), counts), minlength=len(points))
+
+    areas = [0.0] * len(points)
+    start = 0
+    for count in polygonCounts:
+        face = polygonConnects[start:start + count]
+        start += count
+        first = points[face[0]]
+        area = 0.0
+        for j in range(1, count - 1):
+            second, third = points[face[j]], points[face[j + 1]]
+            u = [second[k] - first[k] for k in range(3)]
+            v = [third[k] - first[k] for k in range(3)]
+            cross = (u[1] * v[2] - u[2] * v[1], u[2] * v[0] - u[0] * v[2], u[0] * v[1] - u[1] * v[0])
+            area += 0.5 * sum(c * c for c in cross) ** 0.5
+        for vertex in face:
+            areas[vertex] += area / count
+    return areas
+
+# Center of a set of points. mode is "average", "boundingBox" or "area", where area uses weights.
+# Falls back to the average when every weight is zero, e.g. for vertices without faces.
+def getPointsCenter(points, mode="average", weights=None):
+    if np is not None:
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        if mode == "boundingBox":
+            center = (points.min(axis=0) + points.max(axis=0)) * 0.5
+        elif mode == "area" and weights is not None and np.sum(weights) > 0.0:
+            center = np.average(points, axis=0, weights=weights)
+        else:
+            center = points.mean(axis=0)
+        return tuple(float(value) for value in center)
+
+    if mode == "boundingBox":
+        return tuple((min(p[k] for p in points) + max(p[k] for p in points)) * 0.5 for k in range(3))
+    if mode == "area" and weights is not None and sum(weights) > 0.0:
+        totalWeight = sum(weights)
+        return tuple(sum(p[k] * w for p, w in zip(points, weights)) / totalWeight for k in range(3))
+    return tuple(sum(p[k] for p in points) / len(points) for k in range(3))
+
+# Reads a mesh's world space points, as an (n, 3) array when NumPy is available, and optionally its polygon vertex lists
+def getMeshPointData(dagPath, withPolygons=False):
+    meshFn = om.MFnMesh(dagPath)
+    meshPoints = meshFn.getPoints(om.MSpace.kWorld)
+    if np is not None:
+        points = np.array(meshPoints, dtype=np.float64)[:, :3]
+    else:
+        points = [(point.x, point.y, point.z) for point in meshPoints]
+    polygons = meshFn.getVertices() if withPolygons else None
+    return points, polygons
+
+def takeItems(values, indices):
+    if np is not None:
+        return values[np.asarray(indices, dtype=np.int64)]
+    return [values[index] for index in indices]
+
+def joinItems(parts):
+    if np is not None:
+        return np.concatenate(parts)
+    return [item for part in parts for item in part]
+
+# World space positions of the vertices returned by getSelectedMeshVertices, as (x, y, z) lists
+def getSelectedVertexPositions(meshVertices):
+    positions = []
+    for dagPath, indices in meshVertices:
+        selectedPoints = takeItems(getMeshPointData(dagPath)[0], indices)
+        positions.extend(selectedPoints.tolist() if np is not None else selectedPoints)
+    return positions
+
+# World space center of the vertices returned by getSelectedMeshVertices, across all their meshes.
+# Each mesh's points, and for the area mode its polygon vertex lists, are fetched once.
+def getVerticesCenter(meshVertices, mode="average"):
+    selectedPoints = []
+    selectedWeights = []
+    for dagPath, indices in meshVertices:
+        points, polygons = getMeshPointData(dagPath, mode == "area")
+        selectedPoints.append(takeItems(points, indices))
+        if polygons:
+            selectedWeights.append(takeItems(getVertexAreas(points, *polygons), indices))
+    return getPointsCenter(joinItems(selectedPoints), mode, joinItems(selectedWeights) if selectedWeights else None)
+
+# Splits vertex indices into islands connected by polygon edges between selected vertices, using union-find.
+# Edges are taken from the polygon vertex lists, so no per edge queries are needed.
+def getVertexIslands(indices, polygonCounts, polygonConnects):
+    if not indices:
+        return []
+    parents = {index: index for index in indices}
+
+    def findRoot(index):
+        while parents[index] != index:
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+    if np is not None:
+        counts = np.asarray(polygonCounts, dtype=np.int64)
+        connects = np.asarray(polygonConnects, dtype=np.int64)
+        nextPositions = np.arange(1, len(connects) + 1)
+        nextPositions[np.cumsum(counts)[counts > 0] - 1] = (np.cumsum(counts) - counts)[counts > 0]
+        selected = np.zeros(max(int(connects.max()) if len(connects) else 0, max(indices)) + 1, dtype=bool)
+        selected[np.asarray(indices, dtype=np.int64)] = True
+        edgeStarts, edgeEnds = connects, connects[nextPositions]
+        mask = selected[edgeStarts] & selected[edgeEnds]
+        edges = zip(edgeStarts[mask].tolist(), edgeEnds[mask].tolist())
+    else:
+        edges = []
+        start = 0
+        for count in polygonCounts:
+            face = polygonConnects[start:start + count]
+            start += count
+            edges.extend((face[j], face[(j + 1) % count]) for j in range(count) if face[j] in parents and face[(j + 1) % count] in parents)
+
+    for first, second in edges:
+        firstRoot, secondRoot = findRoot(first), findRoot(second)
+        if firstRoot != secondRoot:
+            parents[max(firstRoot, secondRoot)] = min(firstRoot, secondRoot)
+
+    islands = {}
+    for index in indices:
+        islands.setdefault(findRoot(index), []).append(index)
+    return list(islands.values())
+
+# One world space center per connected island of the selected vertices, in the same modes as getVerticesCenter
+def getVertexIslandCenters(meshVertices, mode="average"):
+    centers = []
+    for dagPath, indices in meshVertices:
+        points, polygons = getMeshPointData(dagPath, True)
+        weights = getVertexAreas(points, *polygons) if mode == "area" else None
+        for island in getVertexIslands(indices, *polygons):
+            islandWeights = takeItems(weights, island) if weights is not None else None
+            centers.append(getPointsCenter(takeItems(points, island), mode, islandWeights))
+    return centers
+
+# World positions of transforms, joints and locators, in the order given. Reads each object's world matrix through
+# the API instead of running a query command per object, and includes every transform, with or without a shape.
+# Locators add their shape's localPosition, like pointPosition.
+def getWorldPositions(objects):
+    # One selection list for all objects. It merges repeated paths, so each object is added once.
+    uniqueObjects = list(dict.fromkeys(objects))
+    selection = om.MSelectionList()
+    for obj in uniqueObjects:
+        try:
+            selection.add(obj)
+        except RuntimeError:
+            openErrorWindow(f"{obj} does not exist or is not unique.")
+            raise ValueError(f"{obj} does not exist or is not unique.")
+
+    objectPositions = {}
+    for i, obj in enumerate(uniqueObjects):
+        dagPath = selection.getDagPath(i)
+        point = om.MPoint()
+        shapePath = om.MDagPath(dagPath)
+        try:
+            shapePath.extendToShape()
+        except RuntimeError:
+            shapePath = None
+        if shapePath is not None and shapePath.hasFn(om.MFn.kLocator):
+            localPosition = om.MFnDependencyNode(shapePath.node()).findPlug("localPosition", False)
+            point = om.MPoint(*(localPosition.child(axis).asDouble() for axis in range(3)))
+        worldPoint = point * dagPath.inclusiveMatrix()
+        objectPositions[obj] = (worldPoint.x, worldPoint.y, worldPoint.z)
+    return [objectPositions[obj] for obj in objects]
+
+# World positions of every CV of a NURBS curve in one call, one per cv[] index. Periodic curves repeat their
+# first degree CVs at the end, which have no index of their own and are left out.
+def getCurveCVPositions(curve):
+    dagPath = om.MSelectionList().add(curve).getDagPath(0)
+    curveFn = om.MFnNurbsCurve(dagPath)
+    positions = [(point.x, point.y, point.z) for point in curveFn.cvPositions(om.MSpace.kWorld)]
+    if curveFn.form == om.MFnNurbsCurve.kPeriodic:
+        positions = positions[:-curveFn.degree]
+    return positions
+
+# Curve fitting________________________
+# Chord length parameters in [0, 1]: each point's share of the polyline length up to it
+def getChordLengthParameters(points):
+    chordLengths = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    totalLength = chordLengths.sum()
+    if totalLength <= 0.0:
+        return np.linspace(0.0, 1.0, len(points))
+    return np.concatenate(([0.0], np.cumsum(chordLengths) / totalLength))
+
+# Clamped cubic knot vector with the interior knots averaged from the parameters, so every knot span holds data
+# (The NURBS Book, eq. 9.68/9.69)
+def getFitKnots(parameters, cvCount, degree=3):
+    spanCount = cvCount - degree
+    step = len(parameters) / float(spanCount)
+    interior = []
+    for j in range(1, spanCount):
+        i = int(j * step)
+        alpha = j * step - i
+        interior.append((1.0 - alpha) * parameters[i - 1] + alpha * parameters[i])
+    return np.concatenate((np.zeros(degree + 1), interior, np.ones(degree + 1)))
+
+# B-spline basis functions of every parameter, as a (parameters, CVs) matrix, via Cox-de Boor for all parameters at once
+def getBSplineBasis(parameters, knots, cvCount, degree=3):
+    t = parameters[:, None]
+    left = knots[None, :-1]
+    right = knots[None, 1:]
+    basis = ((t >= left) & (t < right)).astype(np.float64)
+    # The end parameter belongs to the last non-empty span
+    basis[parameters >= knots[-1], cvCount - 1] = 1.0
+    for k in range(1, degree + 1):
+        spanCount = len(knots) - 1 - k
+        leftWidth = knots[k:k + spanCount] - knots[:spanCount]
+        rightWidth = knots[k + 1:k + 1 + spanCount] - knots[1:1 + spanCount]
+        leftWeight = np.divide(t - knots[:spanCount], leftWidth, out=np.zeros((len(parameters), spanCount)), where=leftWidth > 0)
+        rightWeight = np.divide(knots[k + 1:k + 1 + spanCount] - t, rightWidth, out=np.zeros((len(parameters), spanCount)), where=rightWidth > 0)
+        basis = leftWeight * basis[:, :spanCount] + rightWeight * basis[:, 1:spanCount + 1]
+    return basis[:, :cvCount]
+
+# Least squares cubic fit with the end CVs pinned to the first and last point.
+# Returns the CVs, the knots in Maya's format (without the outer knots) and the largest distance between a point
+# and the curve at the point's parameter, an upper bound of its distance to the curve.
+def fitCubicCurve(points, cvCount):
+    points = np.asarray(points, dtype=np.float64)
+    cvCount = max(4, min(int(cvCount), len(points)))
+    parameters = getChordLengthParameters(points)
+    knots = getFitKnots(parameters, cvCount)
+    basis = getBSplineBasis(parameters, knots, cvCount)
+
+    cvs = np.empty((cvCount, 3))
+    cvs[0] = points[0]
+    cvs[-1] = points[-1]
+    target = points - np.outer(basis[:, 0], points[0]) - np.outer(basis[:, -1], points[-1])
+    cvs[1:-1] = np.linalg.lstsq(basis[:, 1:-1], target, rcond=None)[0]
+
+    fitError = float(np.linalg.norm(basis @ cvs - points, axis=1).max())
+    return cvs.tolist(), knots[1:-1].tolist(), fitError
+
+# Fewest CVs whose fit keeps every point within the tolerance. CV counts are doubled until the fit is good enough,
+# then bisected, so large point sets only pay for a few small solves.
+def fitCubicCurveToTolerance(points, tolerance):
+    low = 4
+    best = fitCubicCurve(points, low)
+    if best[2] <= tolerance:
+        return best
+    high = low
+    while high < len(points):
+        low = high
+        high = min(high * 2, len(points))
+        best = fitCubicCurve(points, high)
+        if best[2] <= tolerance:
+            break
+    while high - low > 1:
+        middle = (low + high) // 2
+        fit = fitCubicCurve(points, middle)
+        if fit[2] <= tolerance:
+            high, best = middle, fit
+        else:
+            low = middle
+    return best
+
+# Points on a NURBS curve at evenly spaced parameters, evaluated here from its CVs and knots with de Boor's
+# algorithm instead of one pointOnCurve query per sample. Weights of rational curves are ignored.
+def getCurveSamplePoints(curve, sampleCount):
+    dagPath = om.MSelectionList().add(curve).getDagPath(0)
+    curveFn = om.MFnNurbsCurve(dagPath)
+    cvs = [(point.x, point.y, point.z) for point in curveFn.cvPositions(om.MSpace.kWorld)]
+    degree = curveFn.degree
+    # Maya leaves out the first and last knot of the full knot vector
+    mayaKnots = list(curveFn.knots())
+    knots = [mayaKnots[0]] + mayaKnots + [mayaKnots[-1]]
+    start, end = curveFn.knotDomain
+    parameters = [start + (end - start) * i / float(sampleCount - 1) for i in range(sampleCount)]
+
+    if np is not None:
+        cvs = np.asarray(cvs, dtype=np.float64)
+        knots = np.asarray(knots, dtype=np.float64)
+        t = np.asarray(parameters)
+        spans = np.clip(np.searchsorted(knots, t, side="right") - 1, degree, len(cvs) - 1)
+        points = cvs[spans[:, None] - degree + np.arange(degree + 1)]
+        for r in range(1, degree + 1):
+            for j in range(degree, r - 1, -1):
+                left = knots[spans - degree + j]
+                width = knots[spans + 1 + j - r] - left
+                alpha = np.divide(t - left, width, out=np.zeros_like(t), where=width > 0)[:, None]
+                points[:, j] = (1.0 - alpha) * points[:, j - 1] + alpha * points[:, j]
+        return points[:, degree]
+
+    points = []
+    for t in parameters:
+        span = min(max(bisect.bisect_right(knots, t) - 1, degree), len(cvs) - 1)
+        local = [cvs[span - degree + j] for j in range(degree + 1)]
+        for r in range(1, degree + 1):
+            for j in range(degree, r - 1, -1):
+                left = knots[span - degree + j]
+                width = knots[span + 1 + j - r] - left
+                alpha = (t - left) / width if width > 0 else 0.0
+                local[j] = tuple((1.0 - alpha) * a + alpha * b for a, b in zip(local[j - 1], local[j]))
+        points.append(local[degree])
+    return points
+
+# Positions of count points evenly spaced by length along the polyline through points. The cumulative length
+# table is built once, and each target length is found in it by binary search.
+def resamplePolyline(points, count):
+    if np is not None:
+        points = np.asarray(points, dtype=np.float64)
+        lengths = np.concatenate(([0.0], np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1))))
+        if lengths[-1] <= 0.0:
+            return [tuple(points[0].tolist())] * count
+        targets = np.linspace(0.0, lengths[-1], count)
+        segments = np.clip(np.searchsorted(lengths, targets, side="right") - 1, 0, len(points) - 2)
+        segmentLengths = lengths[segments + 1] - lengths[segments]
+        alpha = np.divide(targets - lengths[segments], segmentLengths, out=np.zeros_like(targets), where=segmentLengths > 0)
+        resampled = points[segments] + alpha[:, None] * (points[segments + 1] - points[segments])
+        return [tuple(point) for point in resampled.tolist()]
+
+    lengths = [0.0]
+    for a, b in zip(points, points[1:]):
+        lengths.append(lengths[-1] + sum((b[k] - a[k]) ** 2 for k in range(3)) ** 0.5)
+    if lengths[-1] <= 0.0:
+        return [tuple(points[0])] * count
+    resampled = []
+    for i in range(count):
+        target = lengths[-1] * i / float(count - 1)
+        segment = min(max(bisect.bisect_right(lengths, target) - 1, 0), len(points) - 2)
+        segmentLength = lengths[segment + 1] - lengths[segment]
+        alpha = (target - lengths[segment]) / segmentLength if segmentLength > 0 else 0.0
+        resampled.append(tuple(a + alpha * (b - a) for a, b in zip(points[segment], points[segment + 1])))
+    return resampled
+
+# Resolves the root joint of each joint from full DAG paths instead of walking up with listRelatives.
+# A joint's root is its parent's root when the parent is a joint. Resolved roots are memoized for every
+# joint on the way up, so each joint is visited once even across calls sharing the same roots dictionary.
+# sceneJoints can be passed when it already holds every joint in the scene, which skips the ancestor type check.
+def getJointRoots(joints, sceneJoints=None, roots=None):
+    if not joints:
+        return []
+
+    if sceneJoints is not None:
+        jointPaths = sceneJoints if isinstance(sceneJoints, set) else set(sceneJoints)
+    else:
+        jointPaths = set(joints)
+        ancestors = set()
+        for path in joints:
+            parent = path.rpartition("|")[0]
+            while parent and parent not in jointPaths and parent not in ancestors:
+                ancestors.add(parent)
+                parent = parent.rpartition("|")[0]
+        # One query decides which ancestors outside the given joints are joints themselves
+        if ancestors:
+            jointPaths.update(cmds.ls(list(ancestors), type="joint", long=True) or [])
+
+    roots = {} if roots is None else roots
+    result = []
+    for path in joints:
+        chain = []
+        current = path
+        while current not in roots:
+            parent = current.rpartition("|")[0]
+            if parent in jointPaths:
+                chain.append(current)
+                current = parent
+            else:
+                roots[current] = current
+        for joint in chain:
+            roots[joint] = roots[current]
+        result.append(roots[current])
+
+    return list(dict.fromkeys(result))
+
+# Caches type, parent and child lookups for the whole scene so repeated selections don't re-query Maya.
+# Any node added, removed, reparented or renamed marks the cache dirty, which the backend reports through callbacks.
+# While dirty, type lookups run one typed query each and are cached until the next change, so the toolbox's own
+# edits don't cost a dump of the whole scene. Only hierarchy lookups rebuild the full index, with a constant
+# number of bulk calls.
+class SceneIndex(object):
+    def __init__(self, backend=None):
+        self.backend = backend or MayaSceneBackend()
+        self.nodeTypes = {}
+        self.typeNodes = {}
+        self.parents = {}
+        self.children = {}
+        self.derivedTypes = {}
+        # Typed query results keyed by resolved types, only used while the index is dirty
+        self.typeQueries = {}
+        self.callbackIds = []
+        self.dirty = True
+        self.changes = 0
+        self.typesChanges = 0
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.rebuilds = 0
+
+    def install(self):
+        if not self.callbackIds:
+            self.callbackIds = self.backend.addCallbacks(self.invalidate)
+
+    def uninstall(self):
+        if self.callbackIds:
+            self.backend.removeCallbacks(self.callbackIds)
+            self.callbackIds = []
+
+    def invalidate(self):
+        self.dirty = True
+        self.changes += 1
+        self.typeQueries = {}
+
+    def rebuild(self):
+        self.nodeTypes = {}
+        self.typeNodes = {}
+        self.parents = {}
+        self.children = {}
+        self.typeQueries = {}
+
+        for path, nodeType in self.backend.listNodes():
+            self.nodeTypes[path] = nodeType
+            self.typeNodes.setdefault(nodeType, []).append(path)
+            # DAG paths start with "|", everything else is a DG node without parents
+            if path.startswith("|"):
+                parent = path.rpartition("|")[0]
+                if parent:
+                    self.parents[path] = parent
+                    self.children.setdefault(parent, []).append(path)
+
+        self.dirty = False
+        self.generation += 1
+        self.rebuilds += 1
+
+    def ensure(self):
+        if self.dirty:
+            self.misses += 1
+            self.rebuild()
+        else:
+            self.hits += 1
+
+    # Expands abstract types such as "light" or "constraint" into every registered type deriving from them.
+    # Plugins may be loaded or unloaded between scene changes, so expansions are kept until the next change.
+    def resolveTypes(self, nodeTypes):
+        if self.changes != self.typesChanges:
+            self.derivedTypes = {}
+            self.typesChanges = self.changes
+        if isinstance(nodeTypes, str):
+            nodeTypes = [nodeTypes]
+        resolved = []
+        for nodeType in nodeTypes:
+            if nodeType not in self.derivedTypes:
+                self.derivedTypes[nodeType] = self.backend.derivedTypes(nodeType)
+            resolved.extend(self.derivedTypes[nodeType])
+        return list(dict.fromkeys(resolved))
+
+    def nodesOfType(self, nodeTypes):
+        resolved = self.resolveTypes(nodeTypes)
+        if self.dirty:
+            key = tuple(resolved)
+            if key in self.typeQueries:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self.typeQueries[key] = self.backend.listNodesOfType(resolved) if resolved else []
+            return list(self.typeQueries[key])
+
+        self.hits += 1
+        nodes = []
+        for nodeType in resolved:
+            nodes.extend(self.typeNodes.get(nodeType, []))
+        return nodes
+
+    # Parents come straight from the long names, so this never needs the index
+    def parentsOf(self, paths):
+        return list(dict.fromkeys(p.rpartition("|")[0] for p in paths if p.startswith("|") and p.rpartition("|")[0]))
+
+    def transformsOfType(self, shapeTypes):
+        return self.parentsOf(self.nodesOfType(shapeTypes))
+
+    def childrenOf(self, path):
+        self.ensure()
+        return list(self.children.get(path, []))
+
+    # Collects every descendant path of the given long names, optionally limited to a type
+    def descendantsOf(self, paths, nodeTypes=None):
+        self.ensure()
+        allowedTypes = set(self.resolveTypes(nodeTypes)) if nodeTypes else None
+        descendants = []
+        visited = set()
+        stack = list(reversed(paths))
+        while stack:
+            for child in reversed(self.children.get(stack.pop(), [])):
+                if child in visited:
+                    continue
+                visited.add(child)
+                stack.append(child)
+                if allowedTypes is None or self.nodeTypes[child] in allowedTypes:
+                    descendants.append(child)
+        return descendants
+
+    def stats(self):
+        return f"{len(self.nodeTypes)} nodes, {self.hits} hits, {self.misses} misses, {self.rebuilds} rebuilds"
+
+# Control curve shapes by name. Shapes are read from a JSON file next to the toolbox on first use, where each
+# curve is stored compactly as {"d": degree, "p": [x, y, z, x, y, z, ...], "c": 1 when periodic}.
+# The file is only re-read when it changes on disk, and shapes in it override the built-in ones.
+class ControlShapeLibrary(object):
+    builtInShapes = {
+        "global": [{"d": 1, "p": [
+            -1, 0, -1, -1, 0, -3, -2, 0, -3, 0, 0, -5, 2, 0, -3, 1, 0, -3, 1, 0, -1, 3, 0, -1, 3, 0, -2,
+            5, 0, 0, 3, 0, 2, 3, 0, 1, 1, 0, 1, 1, 0, 3, 2, 0, 3, 0, 0, 5, -2, 0, 3, -1, 0, 3,
+            -1, 0, 1, -3, 0, 1, -3, 0, 2, -5, 0, 0, -3, 0, -2, -3, 0, -1, -1, 0, -1,
+        ]}],
+    }
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(os.path.dirname(os.path.abspath(__file__)), "hybrid_toolbox_shapes.json")
+        self.records = None
+        self.modified = None
+        self.curves = {}
+
+    def load(self):
+        try:
+            modified = os.path.getmtime(self.path)
+        except OSError:
+            modified = None
+        if self.records is not None and modified == self.modified:
+            return
+
+        self.records = dict(self.builtInShapes)
+        self.curves = {}
+        self.modified = modified
+        if modified is None:
+            return
+
+        # A broken shape file falls back to the built-in shapes rather than keeping the toolbox from opening
+        try:
+            with open(self.path) as shapeFile:
+                data = json.load(shapeFile)
+            if not isinstance(data, dict) or not isinstance(data.get("shapes"), dict):
+                raise ValueError("expected an object with a \"shapes\" object")
+            shapes = data["shapes"]
+        except (OSError, ValueError) as error:
+            cmds.warning(f"Could not read control shapes from {self.path} ({error}). Using the built-in shapes.")
+            return
+
+        for name, records in shapes.items():
+            if isinstance(records, list) and records and all(self.isValidCurve(record) for record in records):
+                self.records[name] = records
+            else:
+                cmds.warning(f"Skipping control shape \"{name}\" in {self.path}: every curve needs a degree \"d\" and x, y, z points \"p\".")
+
+    # A curve record needs a degree and enough points for it, given as a flat list of x, y, z values
+    @staticmethod
+    def isValidCurve(record):
+        if not isinstance(record, dict) or not isinstance(record.get("d"), int) or not isinstance(record.get("p"), list):
+            return False
+        points = record["p"]
+        return (record["d"] >= 1 and len(points) % 3 == 0 and len(points) // 3 > record["d"]
+                and all(isinstance(value, (int, float)) for value in points))
+
+    def names(self):
+        self.load()
+        return sorted(self.records)
+
+    # Returns (degree, points, periodic) for each curve of a shape
+    def curvesOf(self, name):
+        self.load()
+        if name not in self.records:
+            openErrorWindow(f"Control shape \"{name}\" not found in {self.path}.")
+            raise ValueError(f"Control shape \"{name}\" not found.")
+        if name not in self.curves:
+            self.curves[name] = [
+                (record["d"], [tuple(record["p"][i:i + 3]) for i in range(0, len(record["p"]), 3)], bool(record.get("c")))
+                for record in self.records[name]
+            ]
+        return self.curves[name]
+
+# Builds one curve transform from ControlShapeLibrary curves. Extra curves become additional shapes of the first.
+def createShapeCurve(curves, name):
+    pieces = []
+    for degree, points, periodic in curves:
+        if periodic:
+            # Periodic curves repeat their first degree points and use a uniform knot vector
+            knots = list(range(-degree + 1, len(points) + degree))
+            pieces.append(cmds.curve(degree=degree, periodic=True, point=points + points[:degree], knot=knots, name=name))
+        else:
+            pieces.append(cmds.curve(degree=degree, point=points, name=name))
+    if len(pieces) > 1:
+        shapes = cmds.listRelatives(pieces[1:], shapes=True, fullPath=True)
+        cmds.parent(shapes, pieces[0], relative=True, shape=True)
+        cmds.delete(pieces[1:])
+    return pieces[0]
+
+# Sets the drawing override color of curve shapes. The color is a palette index or an (r, g, b) tuple of 0-1 floats.
+# Index colors also turn RGB overrides off, so curves switch cleanly between the two.
+# Current values are read through the API, which isn't a command, and only plugs holding another value are
+# written. The writes stay setAttr calls so they are part of the tool's undo chunk.
+def setCurveColors(shapes, color):
+    shapes = list(dict.fromkeys(shapes))
+    if not shapes:
+        return
+    useRGB = isinstance(color, (tuple, list))
+    selection = om.MSelectionList()
+    for shape in shapes:
+        selection.add(shape)
+
+    for i, shape in enumerate(shapes):
+        shapeNode = om.MFnDependencyNode(selection.getDependNode(i))
+        if not shapeNode.findPlug("overrideEnabled", False).asBool():
+            cmds.setAttr(f"{shape}.overrideEnabled", True)
+        if shapeNode.findPlug("overrideRGBColors", False).asBool() != useRGB:
+            cmds.setAttr(f"{shape}.overrideRGBColors", useRGB)
+        if useRGB:
+            colorPlug = shapeNode.findPlug("overrideColorRGB", False)
+            if any(abs(colorPlug.child(axis).asFloat() - color[axis]) > 1e-6 for axis in range(3)):
+                cmds.setAttr(f"{shape}.overrideColorRGB", color[0], color[1], color[2])
+        elif shapeNode.findPlug("overrideColor", False).asInt() != color:
+            cmds.setAttr(f"{shape}.overrideColor", color)
+
+# Hands out free numbered names for templates such as "JointChain_{}_Joint_Grp", lowest free index first.
+# The indices in use are found with one wildcard ls per template and kept in memory along with every index
+# handed out since, so reserving many names costs one query. Any scene change reported through the scene index
+# drops the cached indices, since nodes may have been created, renamed or deleted outside the toolbox.
+# Changes made while an installed toolbox action runs are the action's own nodes, named from reserved indices,
+# so they keep the cache, and an action that reserves names between creating nodes still scans only once.
+class NameAllocator(object):
+    def __init__(self, sceneIndex):
+        self.sceneIndex = sceneIndex
+        self.usedIndices = {}
+        self.changes = None
+        self.depth = 0
+        self.ownChanges = False
+
+    # Wraps the named methods on the toolbox instance
+    def install(self, toolbox, names):
+        for name in names:
+            setattr(toolbox, name, self.action(getattr(toolbox, name)))
+
+    def action(self, method):
+        def allocatingMethod(*args, **kwargs):
+            if self.depth:
+                return method(*args, **kwargs)
+            self.depth += 1
+            self.ownChanges = self.changes == self.sceneIndex.changes
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.depth -= 1
+                if self.ownChanges:
+                    self.changes = self.sceneIndex.changes
+                self.ownChanges = False
+        return allocatingMethod
+
+    def reserve(self, template, count=1):
+        if self.changes != self.sceneIndex.changes:
+            if not self.ownChanges:
+                self.usedIndices = {}
+                # A scan during an action sees the scene as it is now, so the rest of the action's changes are its own
+                self.ownChanges = self.depth > 0
+            self.changes = self.sceneIndex.changes
+        if template not in self.usedIndices:
+            self.usedIndices[template] = self.scan(template)
+        usedIndices = self.usedIndices[template]
+
+        indices = []
+        index = 0
+        while len(indices) < count:
+            if index not in usedIndices:
+                indices.append(index)
+            index += 1
+        usedIndices.update(indices)
+        return indices
+
+    def reserveNames(self, template, count=1):
+        return [template.format(index) for index in self.reserve(template, count)]
+
+    def scan(self, template):
+        prefix, suffix = template.split("{}")
+        pattern = re.compile(f"{re.escape(prefix)}(\\d+){re.escape(suffix)}")
+        usedIndices = set()
+        for name in cmds.ls(f"{prefix}*{suffix}") or []:
+            match = pattern.fullmatch(name.rsplit("|", 1)[-1])
+            if match:
+                usedIndices.add(int(match.group(1)))
+        return usedIndices
+
+# Reads the Maya scene for SceneIndex and reports scene changes through API message callbacks
+class MayaSceneBackend(object):
+    # Returns (path, type) pairs for every node with one entry per DAG path, so instances keep all their parents
+    def listNodes(self):
+        allNodes = cmds.ls(long=True, showType=True) or []
+        dagPaths = cmds.ls(dag=True, allPaths=True, long=True, showType=True) or []
+        nodes = dict(zip(allNodes[::2], allNodes[1::2]))
+        nodes.update(zip(dagPaths[::2], dagPaths[1::2]))
+        return list(nodes.items())
+
+    # One path per DAG path of the nodes of the given types, in the same form as listNodes
+    def listNodesOfType(self, nodeTypes):
+        nodes = cmds.ls(type=nodeTypes, long=True) or []
+        dagPaths = cmds.ls(type=nodeTypes, dag=True, allPaths=True, long=True) or []
+        return list(dict.fromkeys(nodes + dagPaths))
+
+    def derivedTypes(self, nodeType):
+        try:
+            return cmds.nodeType(nodeType, derived=True, isTypeName=True) or []
+        except RuntimeError:
+            # Type isn't registered, usually because its plugin isn't loaded
+            return []
+
+    def addCallbacks(self, function):
+        return [
+            om.MDGMessage.addNodeAddedCallback(lambda *args: function(), "dependNode"),
+            om.MDGMessage.addNodeRemovedCallback(lambda *args: function(), "dependNode"),
+            om.MDagMessage.addAllDagChangesCallback(lambda *args: function()),
+            om.MNodeMessage.addNameChangedCallback(om.MObject(), lambda *args: function()),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, lambda *args: function()),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew, lambda *args: function()),
+        ]
+
+    def removeCallbacks(self, callbackIds):
+        om.MMessage.removeCallbacks(callbackIds)
+
+# Maps deformed shapes to the blendShape nodes driving them, and blendShape nodes to their targets.
+# Built from the scene index's blendShape nodes by following outputGeometry connections downstream,
+# and rebuilt only after the scene index has changed, so repeated lookups don't walk any history.
+# Connecting or disconnecting a target or adding or removing a weight doesn't change the scene index,
+# so an attribute callback on each indexed blendShape marks the index stale as well.
+class BlendShapeIndex(object):
+    targetChangeMessages = ("kConnectionMade", "kConnectionBroken", "kAttributeAdded", "kAttributeRemoved",
+                            "kAttributeRenamed", "kAttributeArrayAdded", "kAttributeArrayRemoved")
+
+    def __init__(self, sceneIndex, maxStackDepth=64):
+        self.sceneIndex = sceneIndex
+        self.maxStackDepth = maxStackDepth
+        self.changes = None
+        self.blendShapeNames = []
+        self.blendShapes = set()
+        self.blendShapeNodes = om.MSelectionList()
+        self.shapeBlendShapes = {}
+        self.blendShapeTargets = {}
+        self.callbackIds = []
+
+    def ensure(self):
+        if self.changes != self.sceneIndex.changes:
+            self.rebuild(self.sceneIndex.nodesOfType("blendShape"))
+            self.changes = self.sceneIndex.changes
+
+    def uninstall(self):
+        if self.callbackIds:
+            om.MMessage.removeCallbacks(self.callbackIds)
+            self.callbackIds = []
+
+    def install(self):
+        messageMask = 0
+        for message in self.targetChangeMessages:
+            messageMask |= getattr(om.MNodeMessage, message)
+
+        def attributeChanged(message, plug, otherPlug, clientData):
+            if message & messageMask:
+                self.changes = None
+
+        for i in range(self.blendShapeNodes.length()):
+            self.callbackIds.append(om.MNodeMessage.addAttributeChangedCallback(self.blendShapeNodes.getDependNode(i), attributeChanged))
+
+    def rebuild(self, blendShapes):
+        self.uninstall()
+        # blendShapes are DG nodes with unique names, so the selection list keeps them in order
+        blendShapes = list(dict.fromkeys(blendShapes))
+        self.blendShapeNames = blendShapes
+        self.blendShapes = set(blendShapes)
+        self.blendShapeNodes = om.MSelectionList()
+        self.shapeBlendShapes = {}
+        self.blendShapeTargets = {}
+        if not blendShapes:
+            return
+        for bsn in blendShapes:
+            self.blendShapeNodes.add(bsn)
+        if self.sceneIndex.callbackIds:
+            self.install()
+
+        # Walk the rest of each deformer stack one level at a time. Every level is a single query for
+        # all nodes on it, so the number of calls follows stack depth rather than node count.
+        origins = {bsn: [bsn] for bsn in blendShapes}
+        frontier = list(blendShapes)
+        visited = set(frontier)
+        shapeOrigins = {}
+        for depth in range(self.maxStackDepth):
+            if not frontier:
+                break
+            # Full node names keep shapes with the same short name apart
+            connections = cmds.listConnections(
+                [f"{node}.outputGeometry" for node in frontier],
+                source=False, destination=True, connections=True, shapes=True, fullNodeName=True
+            ) or []
+
+            downstream = {}
+            for plug, destination in zip(connections[::2], connections[1::2]):
+                downstream.setdefault(destination, []).extend(origins[plug.split(".")[0]])
+
+            shapes = set(cmds.ls(list(downstream), type="deformableShape", long=True) or [])
+            frontier = []
+            for node, nodeOrigins in downstream.items():
+                if node in shapes:
+                    shapeOrigins.setdefault(node, []).extend(nodeOrigins)
+                elif node not in visited:
+                    visited.add(node)
+                    origins[node] = nodeOrigins
+                    frontier.append(node)
+                else:
+                    origins[node].extend(nodeOrigins)
+
+        # Shapes are keyed by full path so they can be matched against the scene index
+        for shapePath, bsnOrigins in shapeOrigins.items():
+            self.shapeBlendShapes[shapePath] = list(dict.fromkeys(bsnOrigins))
+
+    # Returns (object, blendShape) pairs for the given long names, which may be transforms, shapes or blendShape nodes
+    def blendShapesOf(self, objects):
+        self.ensure()
+        pairs = []
+        for obj in objects:
+            if obj in self.blendShapes:
+                pairs.append((obj, obj))
+                continue
+            for shape in [obj] + self.sceneIndex.childrenOf(obj):
+                pairs.extend((obj, bsn) for bsn in self.shapeBlendShapes.get(shape, []))
+        return list(dict.fromkeys(pairs))
+
+    # Reads the targets of every indexed blendShape at once: one listConnections on inputTarget for the live
+    # target meshes, and the size of each weight array through the API rather than a blendShape query per node
+    def readTargets(self):
+        blendShapes = self.blendShapeNames
+        targets = {bsn: [] for bsn in blendShapes}
+        connections = cmds.listConnections(
+            [f"{bsn}.inputTarget" for bsn in blendShapes], source=True, destination=False, connections=True
+        ) or []
+        for plug, target in zip(connections[::2], connections[1::2]):
+            targets[plug.split(".")[0]].append(target)
+
+        for i, bsn in enumerate(blendShapes):
+            weightCount = om.MFnDependencyNode(self.blendShapeNodes.getDependNode(i)).findPlug("weight", False).evaluateNumElements()
+            # In-between targets connect the same mesh more than once
+            targetNames = list(dict.fromkeys(targets[bsn]))
+            self.blendShapeTargets[bsn] = (targetNames, max(weightCount - len(targetNames), 0))
+
+    # Returns the live target meshes of a blendShape and how many of its weights have lost their target
+    def targetsOf(self, blendShape):
+        self.ensure()
+        if blendShape not in self.blendShapeTargets:
+            self.readTargets()
+        return self.blendShapeTargets.get(blendShape, ([], 0))
@@ -0,0 +1,1622 @@
+# Hybrid Toolbox benchmark suite
+# Runs the toolbox against an in-memory stand-in for maya.cmds so scaling can be measured without a Maya session.
+# Requires PySide2 or PySide6 to be importable. Usage:
+#   python hybrid_toolbox_bench.py            (default scene sizes)
+#   python hybrid_toolbox_bench.py --size 2000 --check
+
+import argparse
+import fnmatch
+import os
+import re
+import sys
+import time
+import types
+import uuid
+
+# Node type inheritance used by ls(type=...), listRelatives(type=...) and nodeType(derived=True)
+NODE_TYPE_PARENTS = {
+    "dagNode": None,
+    "transform": "dagNode",
+    "joint": "transform",
+    "ikHandle": "transform",
+    "constraint": "transform",
+    "parentConstraint": "constraint",
+    "pointConstraint": "constraint",
+    "orientConstraint": "constraint",
+    "scaleConstraint": "constraint",
+    "shape": "dagNode",
+    "deformableShape": "shape",
+    "controlPoint": "deformableShape",
+    "surfaceShape": "controlPoint",
+    "mesh": "surfaceShape",
+    "nurbsSurface": "surfaceShape",
+    "curveShape": "controlPoint",
+    "nurbsCurve": "curveShape",
+    "particle": "deformableShape",
+    "locator": "shape",
+    "clusterHandle": "shape",
+    "light": "shape",
+    "ambientLight": "light",
+    "directionalLight": "light",
+    "pointLight": "light",
+    "spotLight": "light",
+    "areaLight": "light",
+    "volumeLight": "light",
+    "RedshiftPhysicalLight": "shape",
+    "RedshiftDomeLight": "shape",
+    "RedshiftIESLight": "shape",
+    "RedshiftPortalLight": "shape",
+    "VRayLightRectShape": "shape",
+    "VRayLightDomeShape": "shape",
+    "VRayLightIESShape": "shape",
+    "VRayLightSphereShape": "shape",
+    "animCurve": None,
+    "animCurveTL": "animCurve",
+    "animCurveTA": "animCurve",
+    "animCurveTU": "animCurve",
+    "animCurveTT": "animCurve",
+    "animCurveUL": "animCurve",
+    "animCurveUA": "animCurve",
+    "animCurveUU": "animCurve",
+    "geometryFilter": None,
+    "weightGeometryFilter": "geometryFilter",
+    "cluster": "weightGeometryFilter",
+    "blendShape": "geometryFilter",
+    "skinCluster": "geometryFilter",
+    "tweak": "geometryFilter",
+    "groupParts": None,
+    "decomposeMatrix": None,
+    "multMatrix": None,
+    "objectSet": None,
+}
+
+PLUGIN_NODE_TYPES = {
+    "redshift4maya": ["RedshiftPhysicalLight", "RedshiftDomeLight", "RedshiftIESLight", "RedshiftPortalLight"],
+    "vrayformaya": ["VRayLightRectShape", "VRayLightDomeShape", "VRayLightIESShape", "VRayLightSphereShape"],
+}
+
+COMPONENT_PATTERN = re.compile(r"^(?P<node>[^.]+)\.(?P<kind>vtx|cv|e|f)\[(?P<start>\*|\d+)(?::(?P<end>\d+))?\]$")
+
+
+def isTypeOf(nodeType, queryType):
+    while nodeType:
+        if nodeType == queryType:
+            return True
+        nodeType = NODE_TYPE_PARENTS.get(nodeType)
+    return False
+
+
+def asList(value):
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set)):
+        result = []
+        for v in value:
+            result.extend(asList(v))
+        return result
+    return [value]
+
+
+def addVectors(a, b):
+    return (a[0] + b[0], a[1] + b[1], a[2] + b[2])
+
+
+def subVectors(a, b):
+    return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
+
+
+class StandInNode(object):
+    __slots__ = ("name", "type", "parents", "children", "attrs", "uuid", "isDag")
+
+    def __init__(self, name, nodeType):
+        self.name = name
+        self.type = nodeType
+        self.parents = []
+        self.children = []
+        self.attrs = {}
+        self.uuid = str(uuid.uuid4()).upper()
+        self.isDag = isTypeOf(nodeType, "dagNode")
+
+
+# In-memory scene graph implementing the subset of maya.cmds used by hybrid_toolbox
+class StandInScene(object):
+    def __init__(self):
+        self.nodes = {}
+        self.nodesByUuid = {}
+        self.nodeConnections = {}
+        self.selection = []
+        self.plugins = set()
+        self.callbacks = {"nodeAdded": [], "nodeRemoved": [], "dagChanged": [], "nameChanged": [], "attributeChanged": []}
+        self.undoState = True
+        self.undoChunks = 0
+        self.playbackRange = (1.0, 120.0)
+
+    # Node bookkeeping______________
+    def registeredTypes(self):
+        types = [t for t in NODE_TYPE_PARENTS if not any(t in v for v in PLUGIN_NODE_TYPES.values())]
+        for plugin in self.plugins:
+            types.extend(PLUGIN_NODE_TYPES[plugin])
+        return types
+
+    def uniqueName(self, name):
+        if name not in self.nodes:
+            return name
+        base = name.rstrip("0123456789")
+        number = 1
+        while f"{base}{number}" in self.nodes:
+            number += 1
+        return f"{base}{number}"
+
+    def createNode(self, nodeType, name=None, parent=None):
+        if nodeType not in NODE_TYPE_PARENTS:
+            raise RuntimeError(f"Unknown object type: {nodeType}")
+        node = StandInNode(self.uniqueName(name or f"{nodeType}1"), nodeType)
+        self.nodes[node.name] = node
+        self.nodesByUuid[node.uuid] = node
+        if parent is not None:
+            self.attach(node, parent)
+        self.fire("nodeAdded", node)
+        return node
+
+    def attach(self, child, parent):
+        child.parents.append(parent)
+        parent.children.append(child)
+        self.fire("dagChanged", child)
+
+    def detach(self, child):
+        for parent in child.parents:
+            parent.children.remove(child)
+        child.parents = []
+        self.fire("dagChanged", child)
+
+    def deleteNode(self, node):
+        if node.name not in self.nodes:
+            return
+        for child in list(node.children):
+            if len(child.parents) > 1:
+                child.parents.remove(node)
+                node.children.remove(child)
+            else:
+                self.deleteNode(child)
+        self.detach(node)
+        for connection in self.nodeConnections.pop(node.name, []):
+            other = connection[2] if connection[0] is node else connection[0]
+            if other.name in self.nodeConnections:
+                self.nodeConnections[other.name] = [c for c in self.nodeConnections[other.name] if c is not connection]
+        self.selection = [s for s in self.selection if s[0] is not node]
+        del self.nodes[node.name]
+        del self.nodesByUuid[node.uuid]
+        self.fire("nodeRemoved", node)
+
+    def fire(self, event, node):
+        for callback in list(self.callbacks[event]):
+            callback(node)
+
+    def find(self, name):
+        name = str(name).split(".")[0]
+        node = self.nodes.get(name.rsplit("|", 1)[-1]) or self.nodesByUuid.get(name)
+        if node is None:
+            raise ValueError(f"No object matches name: {name}")
+        return node
+
+    def exists(self, name):
+        try:
+            self.find(name)
+            return True
+        except ValueError:
+            return False
+
+    def longName(self, node):
+        parts = [node.name]
+        current = node
+        while current.parents:
+            current = current.parents[0]
+            parts.append(current.name)
+        return "|" + "|".join(reversed(parts)) if node.isDag else node.name
+
+    def allPaths(self, node):
+        if not node.isDag:
+            return [node.name]
+        if not node.parents:
+            return ["|" + node.name]
+        return [f"{p}|{node.name}" for parent in node.parents for p in self.allPaths(parent)]
+
+    def outName(self, node, long):
+        return self.longName(node) if long else node.name
+
+    def descendants(self, node):
+        result = []
+        stack = list(reversed(node.children))
+        while stack:
+            current = stack.pop()
+            result.append(current)
+            stack.extend(reversed(current.children))
+        return result
+
+    # Geometry______________
+    def worldPosition(self, node):
+        position = (0.0, 0.0, 0.0)
+        current = node
+        while current is not None:
+            position = addVectors(position, current.attrs.get("translate", (0.0, 0.0, 0.0)))
+            current = current.parents[0] if current.parents else None
+        return position
+
+    def setWorldPosition(self, node, position):
+        parentPosition = self.worldPosition(node.parents[0]) if node.parents else (0.0, 0.0, 0.0)
+        node.attrs["translate"] = subVectors(tuple(position), parentPosition)
+
+    def shapeOf(self, node):
+        if isTypeOf(node.type, "shape"):
+            return node
+        for child in node.children:
+            if isTypeOf(child.type, "shape"):
+                return child
+        return None
+
+    def componentPoints(self, node):
+        shape = self.shapeOf(node)
+        if shape is None:
+            return []
+        return shape.attrs.get("points", [])
+
+    def expandComponent(self, name):
+        match = COMPONENT_PATTERN.match(name.rsplit("|", 1)[-1])
+        if not match:
+            return [name]
+        node = self.find(match.group("node"))
+        if match.group("kind") == "e":
+            count = len(node.attrs.get("edges", []) or self.shapeOf(node).attrs.get("edges", []))
+        elif match.group("kind") == "f":
+            count = len(self.shapeOf(node).attrs.get("faces", []))
+        else:
+            count = len(self.componentPoints(node))
+        if match.group("start") == "*":
+            indices = range(count)
+        else:
+            start = int(match.group("start"))
+            end = int(match.group("end")) if match.group("end") else start
+            indices = range(start, min(end, count - 1) + 1)
+        return [f"{match.group('node')}.{match.group('kind')}[{i}]" for i in indices]
+
+    def componentPosition(self, name):
+        match = COMPONENT_PATTERN.match(name.rsplit("|", 1)[-1])
+        node = self.find(match.group("node"))
+        transform = node if not isTypeOf(node.type, "shape") else node.parents[0]
+        local = self.componentPoints(node)[int(match.group("start"))]
+        return addVectors(local, self.worldPosition(transform))
+
+    def connect(self, sourceNode, sourceAttr, destinationNode, destinationAttr):
+        connection = (sourceNode, sourceAttr, destinationNode, destinationAttr)
+        self.nodeConnections.setdefault(sourceNode.name, []).append(connection)
+        if destinationNode is not sourceNode:
+            self.nodeConnections.setdefault(destinationNode.name, []).append(connection)
+        self.fire("attributeChanged", sourceNode)
+        if destinationNode is not sourceNode:
+            self.fire("attributeChanged", destinationNode)
+
+    def connectionsOf(self, node):
+        return self.nodeConnections.get(node.name, [])
+
+    def incoming(self, node):
+        return [c for c in self.connectionsOf(node) if c[2] is node]
+
+    def outgoing(self, node):
+        return [c for c in self.connectionsOf(node) if c[0] is node]
+
+
+# maya.cmds replacement bound to a StandInScene. Every public method is counted when installed.
+class StandInCmds(object):
+    def __init__(self, scene=None):
+        self.scene = scene or StandInScene()
+
+    def _nodes(self, args):
+        return [self.scene.find(n) for n in asList(args)]
+
+    def _typeFilter(self, node, nodeType):
+        if not nodeType:
+            return True
+        return any(isTypeOf(node.type, t) for t in asList(nodeType))
+
+    # Queries______________
+    def ls(self, *args, selection=False, type=None, long=False, showType=False, nodeTypes=False,
+           dag=False, allPaths=False, flatten=False, uuid=False, noIntermediate=False, **kwargs):
+        scene = self.scene
+        if nodeTypes:
+            return scene.registeredTypes()
+        if selection or kwargs.get("sl") or kwargs.get("orderedSelection"):
+            names = [f"{scene.outName(n, long)}{c}" for n, c in scene.selection]
+        elif args:
+            names = []
+            for name in asList(args):
+                if flatten:
+                    names.extend(scene.expandComponent(name))
+                elif "*" in name:
+                    names.extend(n for n in scene.nodes if fnmatch.fnmatchcase(n, name))
+                elif scene.exists(name):
+                    names.append(name)
+            if not flatten:
+                names = [scene.outName(scene.find(n), long) + (n[n.index("."):] if "." in n else "") for n in names]
+        else:
+            nodes = [n for n in scene.nodes.values() if (n.isDag or not dag)]
+            if allPaths:
+                names = [p for n in nodes for p in scene.allPaths(n)]
+            else:
+                names = [scene.outName(n, long) for n in nodes]
+        if type or showType or uuid:
+            filtered = []
+            for name in names:
+                node = scene.find(name)
+                if "." in name.rsplit("|", 1)[-1] and type:
+                    continue
+                if not self._typeFilter(node, type):
+                    continue
+                if uuid:
+                    filtered.append(node.uuid)
+                    continue
+                filtered.append(name)
+                if showType:
+                    filtered.append(node.type)
+            names = filtered
+        return names
+
+    def objExists(self, name):
+        return self.scene.exists(name)
+
+    def listRelatives(self, *args, parent=False, allParents=False, children=False, shapes=False,
+                      allDescendents=False, type=None, fullPath=False, path=False, noIntermediate=False, **kwargs):
+        scene = self.scene
+        result = []
+        for node in self._nodes(args):
+            if parent or allParents:
+                found = node.parents if allParents else node.parents[:1]
+            elif allDescendents:
+                found = list(reversed(scene.descendants(node)))
+            else:
+                found = list(node.children)
+                if shapes:
+                    found = [c for c in found if isTypeOf(c.type, "shape")]
+            found = [f for f in found if self._typeFilter(f, type)]
+            result.extend(scene.outName(f, fullPath or path) for f in found)
+        return result or None
+
+    def listConnections(self, *args, type=None, source=True, destination=True, connections=False,
+                        plugs=False, shapes=False, skipConversionNodes=False, fullNodeName=False, **kwargs):
+        scene = self.scene
+        result = []
+        for name in asList(args):
+            node = scene.find(name)
+            attrFilter = name.split(".", 1)[1] if "." in name else None
+            for sourceNode, sourceAttr, destinationNode, destinationAttr in scene.connectionsOf(node):
+                matches = []
+                if destination and sourceNode is node:
+                    matches.append((sourceAttr, destinationNode, destinationAttr))
+                if source and destinationNode is node:
+                    matches.append((destinationAttr, sourceNode, sourceAttr))
+                for localAttr, other, otherAttr in matches:
+                    if attrFilter and localAttr.split("[")[0] != attrFilter.split("[")[0]:
+                        continue
+                    if not self._typeFilter(other, type):
+                        continue
+                    if isTypeOf(other.type, "shape") and not shapes and not plugs and other.parents:
+                        other = other.parents[0]
+                    otherName = scene.outName(other, fullNodeName)
+                    if connections:
+                        result.append(f"{node.name}.{localAttr}")
+                    result.append(f"{otherName}.{otherAttr}" if plugs else otherName)
+        return result or None
+
+    def listHistory(self, *args, **kwargs):
+        scene = self.scene
+        visited = []
+        seen = set()
+        stack = []
+        for node in self._nodes(args):
+            shape = scene.shapeOf(node) or node
+            stack.extend([node, shape])
+        while stack:
+            node = stack.pop()
+            if node.name in seen:
+                continue
+            seen.add(node.name)
+            visited.append(node.name)
+            stack.extend(c[0] for c in scene.incoming(node))
+        return visited
+
+    def nodeType(self, name, derived=False, isTypeName=False, inherited=False, **kwargs):
+        if isTypeName:
+            if name not in self.scene.registeredTypes():
+                raise RuntimeError(f"Unknown object type: {name}")
+            if derived:
+                return [t for t in self.scene.registeredTypes() if isTypeOf(t, name)]
+            return name
+        return self.scene.find(name).type
+
+    def objectType(self, name, isType=None, **kwargs):
+        nodeType = self.scene.find(name).type
+        if isType:
+            return nodeType == isType
+        return nodeType
+
+    def pointPosition(self, name, world=True, **kwargs):
+        scene = self.scene
+        if "." in name.rsplit("|", 1)[-1]:
+            return list(scene.componentPosition(name))
+        return list(scene.worldPosition(scene.find(name)))
+
+    def xform(self, *args, query=False, worldSpace=False, translation=None, pivots=None,
+              centerPivots=False, boundingBox=False, matrix=None, **kwargs):
+        scene = self.scene
+        nodes = self._nodes(args) if args else [s[0] for s in scene.selection]
+        if query:
+            if translation or kwargs.get("t"):
+                return list(scene.worldPosition(nodes[0]))
+            if matrix:
+                position = scene.worldPosition(nodes[0])
+                return [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, position[0], position[1], position[2], 1]
+            return None
+        for node in nodes:
+            if translation is not None:
+                scene.setWorldPosition(node, translation)
+            if pivots is not None:
+                node.attrs["pivots"] = tuple(pivots)
+        return None
+
+    def filterExpand(self, *args, selectionMask=None, **kwargs):
+        masks = {31: "vtx", 28: "cv", 32: "e", 34: "f"}
+        kind = masks.get(selectionMask)
+        names = asList(args) or [f"{n.name}{c}" for n, c in self.scene.selection]
+        result = []
+        for name in names:
+            if f".{kind}[" in name:
+                result.extend(self.scene.expandComponent(name))
+        return result or None
+
+    # Selection______________
+    def select(self, *args, clear=False, add=False, replace=False, hierarchy=False, deselect=False, **kwargs):
+        scene = self.scene
+        if clear:
+            scene.selection = []
+            return
+        if hierarchy and not args:
+            expanded = []
+            for node, component in scene.selection:
+                expanded.append((node, component))
+                expanded.extend((d, "") for d in scene.descendants(node))
+            scene.selection = expanded
+            return
+        entries = []
+        for name in asList(args):
+            for item in scene.expandComponent(name) if "[" in name and ":" in name else [name]:
+                node = scene.find(item)
+                component = item[item.index("."):] if "." in item.rsplit("|", 1)[-1] else ""
+                entries.append((node, component))
+        if hierarchy:
+            entries = [e for node, c in entries for e in [(node, c)] + [(d, "") for d in scene.descendants(node)]]
+        if deselect:
+            remove = set((n.name, c) for n, c in entries)
+            scene.selection = [s for s in scene.selection if (s[0].name, s[1]) not in remove]
+            return
+        if not add:
+            scene.selection = []
+        present = set((n.name, c) for n, c in scene.selection)
+        for node, component in entries:
+            if (node.name, component) not in present:
+                present.add((node.name, component))
+                scene.selection.append((node, component))
+
+    # Creation______________
+    def group(self, *args, empty=False, name=None, world=False, parent=None, **kwargs):
+        scene = self.scene
+        groupNode = scene.createNode("transform", name or "group1")
+        if parent:
+            scene.attach(groupNode, scene.find(parent))
+        if not empty:
+            members = self._nodes(args) if args else [s[0] for s in scene.selection]
+            for member in members:
+                scene.detach(member)
+                scene.attach(member, groupNode)
+        scene.selection = [(groupNode, "")]
+        return groupNode.name
+
+    def createNode(self, nodeType, name=None, parent=None, skipSelect=False, **kwargs):
+        scene = self.scene
+        parentNode = scene.find(parent) if parent else None
+        if isTypeOf(nodeType, "shape") and parentNode is None:
+            parentNode = scene.createNode("transform", f"{nodeType}1" if not name else f"{name}Transform")
+        node = scene.createNode(nodeType, name, parentNode)
+        if not skipSelect:
+            scene.selection = [(node, "")]
+        return node.name
+
+    def spaceLocator(self, name=None, position=None, **kwargs):
+        scene = self.scene
+        transform = scene.createNode("transform", name or "locator1")
+        scene.createNode("locator", f"{transform.name}Shape", transform)
+        if position:
+            transform.attrs["translate"] = tuple(position)
+        scene.selection = [(transform, "")]
+        return [transform.name]
+
+    def joint(self, *args, edit=False, position=None, name=None, orientJoint=None, zeroScaleOrient=False,
+              secondaryAxisOrient=None, children=False, **kwargs):
+        scene = self.scene
+        if edit:
+            for node in self._nodes(args):
+                targets = [node] + (scene.descendants(node) if children else [])
+                for target in targets:
+                    target.attrs["jointOrient"] = (orientJoint, secondaryAxisOrient)
+            return None
+        parent = None
+        if scene.selection and scene.selection[-1][0].type == "joint":
+            parent = scene.selection[-1][0]
+        jointNode = scene.createNode("joint", name or "joint1", parent)
+        scene.setWorldPosition(jointNode, position or (0.0, 0.0, 0.0))
+        scene.selection = [(jointNode, "")]
+        return jointNode.name
+
+    def curve(self, point=None, p=None, degree=3, name=None, **kwargs):
+        scene = self.scene
+        points = [tuple(x) for x in (p or point)]
+        transform = scene.createNode("transform", name or "curve1")
+        shape = scene.createNode("nurbsCurve", f"{transform.name}Shape", transform)
+        shape.attrs["points"] = points
+        shape.attrs["degree"] = degree
+        shape.attrs["knots"] = kwargs.get("knot") or kwargs.get("k")
+        scene.selection = [(transform, "")]
+        return transform.name
+
+    def cluster(self, *args, name=None, **kwargs):
+        scene = self.scene
+        components = []
+        for item in asList(args):
+            components.extend(scene.expandComponent(item))
+        positions = [scene.componentPosition(c) for c in components]
+        clusterNode = scene.createNode("cluster", name or "cluster1")
+        handle = scene.createNode("transform", f"{clusterNode.name}Handle")
+        scene.createNode("clusterHandle", f"{clusterNode.name}HandleShape", handle)
+        if positions:
+            count = float(len(positions))
+            handle.attrs["translate"] = tuple(sum(p[i] for p in positions) / count for i in range(3))
+        scene.connect(handle, "worldMatrix[0]", clusterNode, "matrix")
+        return [clusterNode.name, handle.name]
+
+    # Binds the last node to the others, each influence connected through its world matrix
+    def skinCluster(self, *args, name=None, **kwargs):
+        scene = self.scene
+        nodes = self._nodes(args)
+        influences, geometry = nodes[:-1], nodes[-1]
+        skinNode = scene.createNode("skinCluster", name or "skinCluster1")
+        for index, influence in enumerate(influences):
+            scene.connect(influence, "worldMatrix[0]", skinNode, f"matrix[{index}]")
+        scene.connect(skinNode, "outputGeometry[0]", scene.shapeOf(geometry) or geometry, "create")
+        return [skinNode.name]
+
+    def _constraint(self, constraintType, args, maintainOffset=False, name=None, **kwargs):
+        scene = self.scene
+        nodes = self._nodes(args) if args else [s[0] for s in scene.selection]
+        targets, child = nodes[:-1], nodes[-1]
+        constraintNode = scene.createNode(constraintType, name or f"{child.name}_{constraintType}1", child)
+        for index, target in enumerate(targets):
+            scene.connect(target, "parentMatrix[0]", constraintNode, f"target[{index}].targetParentMatrix")
+        scene.connect(constraintNode, "constraintTranslateX", child, "translateX")
+        scene.connect(child, "parentInverseMatrix[0]", constraintNode, "constraintParentInverseMatrix")
+        if constraintType in ("pointConstraint", "parentConstraint") and not maintainOffset:
+            count = float(len(targets))
+            positions = [scene.worldPosition(t) for t in targets]
+            scene.setWorldPosition(child, tuple(sum(p[i] for p in positions) / count for i in range(3)))
+        return [constraintNode.name]
+
+    def parentConstraint(self, *args, **kwargs):
+        return self._constraint("parentConstraint", args, **kwargs)
+
+    def pointConstraint(self, *args, **kwargs):
+        return self._constraint("pointConstraint", args, **kwargs)
+
+    def orientConstraint(self, *args, **kwargs):
+        return self._constraint("orientConstraint", args, **kwargs)
+
+    def scaleConstraint(self, *args, **kwargs):
+        return self._constraint("scaleConstraint", args, **kwargs)
+
+    # Editing______________
+    def parent(self, *args, world=False, relative=False, shape=False, addObject=False, **kwargs):
+        scene = self.scene
+        names = asList(args)
+        if world:
+            children, parentNode = self._nodes(names), None
+        else:
+            children, parentNode = self._nodes(names[:-1]), scene.find(names[-1])
+        result = []
+        for child in children:
+            if child.parents and parentNode is not None and child.parents[0] is parentNode and not addObject:
+                raise RuntimeError(f"{child.name} is already a child of {parentNode.name}.")
+            worldPosition = scene.worldPosition(child)
+            if not addObject:
+                scene.detach(child)
+            if parentNode is not None:
+                scene.attach(child, parentNode)
+            if not relative and not isTypeOf(child.type, "shape"):
+                scene.setWorldPosition(child, worldPosition)
+            result.append(child.name)
+        return result
+
+    def delete(self, *args, **kwargs):
+        for node in self._nodes(args):
+            self.scene.deleteNode(node)
+
+    def rename(self, old, new):
+        scene = self.scene
+        node = scene.find(old)
+        del scene.nodes[node.name]
+        node.name = scene.uniqueName(new)
+        scene.nodes[node.name] = node
+        scene.fire("nameChanged", node)
+        return node.name
+
+    def move(self, *args, absolute=True, relative=False, rotatePivotRelative=False, worldSpace=True, **kwargs):
+        scene = self.scene
+        values = [a for a in args if isinstance(a, (int, float))]
+        nodes = self._nodes([a for a in args if not isinstance(a, (int, float))]) or [s[0] for s in scene.selection]
+        if rotatePivotRelative:
+            return
+        for node in nodes:
+            if relative:
+                scene.setWorldPosition(node, addVectors(scene.worldPosition(node), tuple(values)))
+            else:
+                scene.setWorldPosition(node, tuple(values))
+
+    def setAttr(self, plug, *values, type=None, **kwargs):
+        nodeName, attr = plug.split(".", 1)
+        node = self.scene.find(nodeName)
+        if type is not None and type.endswith("Array"):
+            # Array data is passed as a count followed by the elements
+            node.attrs[attr] = [tuple(value) if isinstance(value, (list, tuple)) else value for value in values[1:]]
+            return
+        node.attrs[attr] = values[0] if len(values) == 1 else tuple(values)
+
+    def getAttr(self, plug, **kwargs):
+        nodeName, attr = plug.split(".", 1)
+        node = self.scene.find(nodeName)
+        if attr in node.attrs:
+            return node.attrs[attr]
+        if attr in ("translate", "t"):
+            return [node.attrs.get("translate", (0.0, 0.0, 0.0))]
+        return 0
+
+    def addAttr(self, *args, longName=None, **kwargs):
+        node = self.scene.find(args[0])
+        node.attrs.setdefault(longName, kwargs.get("defaultValue", 0))
+
+    def attributeQuery(self, attr, node=None, exists=False, **kwargs):
+        return attr in self.scene.find(node).attrs
+
+    def connectAttr(self, source, destination, force=False, **kwargs):
+        scene = self.scene
+        sourceNode, sourceAttr = source.split(".", 1)
+        destinationNode, destinationAttr = destination.split(".", 1)
+        scene.connect(scene.find(sourceNode), sourceAttr, scene.find(destinationNode), destinationAttr)
+
+    def makeIdentity(self, *args, **kwargs):
+        return None
+
+    def DeleteHistory(self, *args, **kwargs):
+        return None
+
+    def sets(self, *args, query=False, name=None, **kwargs):
+        scene = self.scene
+        if query:
+            return list(scene.find(args[0]).attrs.get("members", []))
+        members = self._nodes(args) if args else [s[0] for s in scene.selection]
+        objectSet = scene.createNode("objectSet", name or "set1")
+        objectSet.attrs["members"] = [member.name for member in members]
+        return objectSet.name
+
+    def dgdirty(self, *args, **kwargs):
+        return None
+
+    # Animation______________
+    def keyframe(self, *args, query=False, name=False, time=None, keyframeCount=False, **kwargs):
+        scene = self.scene
+        curves = []
+        for node in self._nodes(args):
+            if isTypeOf(node.type, "animCurve"):
+                curves.append(node)
+            else:
+                curves.extend(c[0] for c in scene.incoming(node) if isTypeOf(c[0].type, "animCurve"))
+        if time:
+            start, end = time if isinstance(time, tuple) else (time, time)
+            curves = [c for c in curves if any(start <= k <= end for k in c.attrs.get("keys", []))]
+        if keyframeCount:
+            return sum(len(c.attrs.get("keys", [])) for c in curves)
+        if name:
+            return list(dict.fromkeys(c.name for c in curves if c.attrs.get("keys")))
+        return None
+
+    def bakeResults(self, *args, t=None, time=None, sampleBy=1, attribute=None, **kwargs):
+        scene = self.scene
+        start, end = t or time or scene.playbackRange
+        keys = [start + i * sampleBy for i in range(int((end - start) / sampleBy) + 1)]
+        curveTypes = {"t": "animCurveTL", "r": "animCurveTA", "s": "animCurveTU"}
+        for node in self._nodes(args):
+            for attr in asList(attribute):
+                curve = scene.createNode(curveTypes.get(attr[0], "animCurveTU"), f"{node.name}_{attr}")
+                curve.attrs["keys"] = list(keys)
+                scene.connect(curve, "output", node, attr)
+
+    def playbackOptions(self, query=False, minTime=False, maxTime=False, animationStartTime=False,
+                        animationEndTime=False, **kwargs):
+        if minTime or animationStartTime:
+            return self.scene.playbackRange[0]
+        return self.scene.playbackRange[1]
+
+    def blendShape(self, *args, query=False, target=False, weightCount=False, geometry=False, **kwargs):
+        scene = self.scene
+        node = scene.find(args[0])
+        if target:
+            targets = [c[0].parents[0].name for c in scene.incoming(node) if c[3].startswith("inputTarget")]
+            return targets or None
+        if weightCount:
+            return len(node.attrs.get("weight", []))
+        if geometry:
+            return [c[2].name for c in scene.outgoing(node) if c[1].startswith("outputGeometry")]
+        return None
+
+    # Session______________
+    def undoInfo(self, query=False, state=None, openChunk=False, closeChunk=False, stateWithoutFlush=None, **kwargs):
+        scene = self.scene
+        if query:
+            return scene.undoState
+        if openChunk:
+            scene.undoChunks += 1
+        if closeChunk:
+            scene.undoChunks -= 1
+        if state is not None:
+            scene.undoState = state
+        if stateWithoutFlush is not None:
+            scene.undoState = stateWithoutFlush
+
+    def refresh(self, suspend=None, force=False, **kwargs):
+        return None
+
+    def ogs(self, reset=False, **kwargs):
+        return None
+
+    def fileInfo(self, *args, query=False, **kwargs):
+        return []
+
+    def warning(self, message):
+        return None
+
+    def window(self, name, exists=False, **kwargs):
+        return False
+
+    def deleteUI(self, *args, **kwargs):
+        return None
+
+    def pluginInfo(self, name, query=False, loaded=False, **kwargs):
+        return name in self.scene.plugins
+
+
+# Counts calls and cumulative time per stand-in command
+class CallCounter(object):
+    def __init__(self):
+        self.counts = {}
+        self.times = {}
+
+    def reset(self):
+        self.counts = {}
+        self.times = {}
+
+    def wrap(self, name, function):
+        def counted(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.counts[name] = self.counts.get(name, 0) + 1
+                self.times[name] = self.times.get(name, 0.0) + time.perf_counter() - start
+        counted.__name__ = name
+        return counted
+
+    def total(self):
+        return sum(self.counts.values())
+
+
+# In-memory stand-in for MayaSceneBackend so SceneIndex can be exercised without a Maya scene.
+# Nodes are (long path, type) pairs and typeParents maps a type to the type it derives from.
+class StandInSceneBackend(object):
+    def __init__(self, nodes=None, typeParents=None):
+        self.nodes = dict(nodes or [])
+        self.typeParents = dict(typeParents or {})
+        self.callbacks = {}
+        self.listCalls = 0
+        self.typedCalls = 0
+
+    def listNodes(self):
+        self.listCalls += 1
+        return list(self.nodes.items())
+
+    def listNodesOfType(self, nodeTypes):
+        self.typedCalls += 1
+        return [path for path, nodeType in self.nodes.items() if nodeType in nodeTypes]
+
+    def derivedTypes(self, nodeType):
+        knownTypes = set(self.nodes.values()) | set(self.typeParents) | set(self.typeParents.values())
+        derived = []
+        for candidate in knownTypes:
+            current = candidate
+            while current and current != nodeType:
+                current = self.typeParents.get(current)
+            if current == nodeType:
+                derived.append(candidate)
+        return sorted(derived)
+
+    def addCallbacks(self, function):
+        callbackId = len(self.callbacks) + 1
+        self.callbacks[callbackId] = function
+        return [callbackId]
+
+    def removeCallbacks(self, callbackIds):
+        for callbackId in callbackIds:
+            self.callbacks.pop(callbackId, None)
+
+    def notify(self):
+        for function in list(self.callbacks.values()):
+            function()
+
+    def addNode(self, path, nodeType):
+        self.nodes[path] = nodeType
+        self.notify()
+
+    def removeNode(self, path):
+        for existing in list(self.nodes):
+            if existing == path or existing.startswith(path + "|"):
+                del self.nodes[existing]
+        self.notify()
+
+    def reparent(self, path, newParent):
+        newPath = f"{newParent}|{path.rpartition('|')[2]}"
+        for existing in list(self.nodes):
+            if existing == path or existing.startswith(path + "|"):
+                self.nodes[newPath + existing[len(path):]] = self.nodes.pop(existing)
+        self.notify()
+
+
+# Stand-in for maya.api.OpenMaya covering the message callbacks and mesh queries the toolbox uses.
+# Mesh queries are reported to the counter like commands, e.g. as "MFnMesh.getPoints".
+def buildOpenMayaModule(standIn, counter):
+    om = types.ModuleType("maya.api.OpenMaya")
+    registry = {}
+
+    def register(event, function):
+        def callback(node):
+            function(node, None) if event != "dagChanged" else function(0, node, None, None)
+        callbackId = len(registry) + 1
+        registry[callbackId] = (event, callback)
+        standIn.scene.callbacks[event].append(callback)
+        return callbackId
+
+    class MDGMessage(object):
+        @staticmethod
+        def addNodeAddedCallback(function, nodeType="dependNode", clientData=None):
+            return register("nodeAdded", function)
+
+        @staticmethod
+        def addNodeRemovedCallback(function, nodeType="dependNode", clientData=None):
+            return register("nodeRemoved", function)
+
+    class MDagMessage(object):
+        @staticmethod
+        def addAllDagChangesCallback(function, clientData=None):
+            return register("dagChanged", function)
+
+    class MNodeMessage(object):
+        kConnectionMade = 0x01
+        kConnectionBroken = 0x02
+        kAttributeSet = 0x08
+        kAttributeAdded = 0x40
+        kAttributeRemoved = 0x80
+        kAttributeRenamed = 0x100
+        kAttributeArrayAdded = 0x1000
+        kAttributeArrayRemoved = 0x2000
+
+        @staticmethod
+        def addNameChangedCallback(node, function, clientData=None):
+            def renamed(changedNode, clientData):
+                function(changedNode, "", clientData)
+            return register("nameChanged", renamed)
+
+        # Stand-in scenes only report new connections
+        @staticmethod
+        def addAttributeChangedCallback(node, function, clientData=None):
+            def changed(changedNode, clientData):
+                if changedNode is node:
+                    function(MNodeMessage.kConnectionMade, None, None, clientData)
+            return register("attributeChanged", changed)
+
+    class MSceneMessage(object):
+        kAfterOpen = 1
+        kAfterNew = 2
+
+        @staticmethod
+        def addCallback(message, function, clientData=None):
+            callbackId = len(registry) + 1
+            registry[callbackId] = (None, None)
+            return callbackId
+
+    class MMessage(object):
+        @staticmethod
+        def removeCallbacks(callbackIds):
+            for callbackId in callbackIds:
+                event, callback = registry.pop(callbackId, (None, None))
+                if event:
+                    standIn.scene.callbacks[event].remove(callback)
+
+    class MObject(object):
+        pass
+
+    class MSpace(object):
+        kObject = 2
+        kWorld = 4
+
+    class MFn(object):
+        kLocator = 281
+        kMeshVertComponent = 550
+
+    class MPoint(object):
+        def __init__(self, x=0.0, y=0.0, z=0.0, w=1.0):
+            self.x, self.y, self.z, self.w = x, y, z, w
+
+        def __len__(self):
+            return 4
+
+        def __getitem__(self, index):
+            return (self.x, self.y, self.z, self.w)[index]
+
+        def __mul__(self, matrix):
+            return MPoint(*addVectors((self.x, self.y, self.z), matrix.translation))
+
+    # Stand-in transforms only translate, so a matrix is its world translation
+    class MMatrix(object):
+        def __init__(self, translation=(0.0, 0.0, 0.0)):
+            self.translation = tuple(translation)
+
+    class MPlug(object):
+        def __init__(self, values):
+            self.values = values
+
+        def child(self, index):
+            return MPlug(self.values[index])
+
+        def asDouble(self):
+            return float(self.values)
+
+        def asFloat(self):
+            return float(self.values)
+
+        def asInt(self):
+            return int(self.values)
+
+        def asBool(self):
+            return bool(self.values)
+
+        def evaluateNumElements(self):
+            return len(self.values)
+
+    class MDagPath(object):
+        def __init__(self, node=None):
+            self.dagNode = node.dagNode if isinstance(node, MDagPath) else node
+
+        def node(self):
+            return self.dagNode
+
+        def fullPathName(self):
+            return standIn.scene.longName(self.dagNode)
+
+        def extendToShape(self):
+            if isTypeOf(self.dagNode.type, "shape"):
+                return self
+            shapes = [child for child in self.dagNode.children if isTypeOf(child.type, "shape")]
+            if len(shapes) != 1:
+                raise RuntimeError("(kInvalidParameter): No unique shape below transform")
+            self.dagNode = shapes[0]
+            return self
+
+        def hasFn(self, fnType):
+            return fnType == MFn.kLocator and isTypeOf(self.dagNode.type, "locator")
+
+        def inclusiveMatrix(self):
+            return MMatrix(standIn.scene.worldPosition(self.dagNode))
+
+    class MFnDependencyNode(object):
+        def __init__(self, node):
+            self.dependNode = node
+
+        # Unset compound plugs read as zero vectors, everything else as zero
+        def findPlug(self, attribute, wantNetworkedPlug=True):
+            default = (0.0, 0.0, 0.0) if attribute in ("localPosition", "overrideColorRGB") else 0
+            return MPlug(self.dependNode.attrs.get(attribute, default))
+
+    # Component kind ("vtx", "cv", ...) and element indices
+    class MComponent(object):
+        def __init__(self, kind=None, elements=()):
+            self.kind = kind
+            self.elements = list(elements)
+
+        def isNull(self):
+            return self.kind is None
+
+        def hasFn(self, fnType):
+            return fnType == MFn.kMeshVertComponent and self.kind == "vtx"
+
+    class MFnSingleIndexedComponent(object):
+        def __init__(self, component):
+            self.component = component
+
+        def getElements(self):
+            return list(self.component.elements)
+
+    class MSelectionList(object):
+        def __init__(self):
+            self.items = []
+
+        def add(self, name):
+            try:
+                node = standIn.scene.find(name)
+            except ValueError:
+                raise RuntimeError(f"(kInvalidParameter): Object does not exist: {name}")
+            self.items.append((node, MComponent()))
+            return self
+
+        def length(self):
+            return len(self.items)
+
+        def getDagPath(self, index):
+            return MDagPath(self.items[index][0])
+
+        def getDependNode(self, index):
+            return self.items[index][0]
+
+        def getComponent(self, index):
+            node, component = self.items[index]
+            if not isTypeOf(node.type, "dagNode"):
+                raise TypeError("item is not a DAG path")
+            return MDagPath(node), component
+
+    class MGlobal(object):
+        @staticmethod
+        def displayInfo(message):
+            return None
+
+        # Components of the same node are merged into one item, like Maya's active selection list
+        @staticmethod
+        def getActiveSelectionList():
+            scene = standIn.scene
+            selection = MSelectionList()
+            merged = {}
+            for node, component in scene.selection:
+                if not component:
+                    selection.items.append((node, MComponent()))
+                    continue
+                for name in scene.expandComponent(f"{node.name}{component}"):
+                    match = COMPONENT_PATTERN.match(name.rsplit("|", 1)[-1])
+                    key = (node.name, match.group("kind"))
+                    if key not in merged:
+                        merged[key] = MComponent(match.group("kind"))
+                        selection.items.append((node, merged[key]))
+                    merged[key].elements.append(int(match.group("start")))
+            return selection
+
+    class MFnMesh(object):
+        def __init__(self, dagPath):
+            scene = standIn.scene
+            node = dagPath.node()
+            self.transform = node if not isTypeOf(node.type, "shape") else node.parents[0]
+            self.shape = scene.shapeOf(node)
+            if self.shape is None or not isTypeOf(self.shape.type, "mesh"):
+                raise RuntimeError("(kInvalidParameter): Object is incompatible with this method")
+
+        def getPoints(self, space=MSpace.kObject):
+            offset = standIn.scene.worldPosition(self.transform) if space == MSpace.kWorld else (0.0, 0.0, 0.0)
+            return [MPoint(*addVectors(point, offset)) for point in self.shape.attrs.get("points", [])]
+
+        def getVertices(self):
+            faces = self.shape.attrs.get("faces", [])
+            return [len(face) for face in faces], [vertex for face in faces for vertex in face]
+
+    class MFnNurbsCurve(object):
+        kOpen = 1
+        kClosed = 2
+        kPeriodic = 3
+
+        def __init__(self, dagPath):
+            scene = standIn.scene
+            node = dagPath.node()
+            self.transform = node if not isTypeOf(node.type, "shape") else node.parents[0]
+            self.shape = scene.shapeOf(node)
+            if self.shape is None or not isTypeOf(self.shape.type, "nurbsCurve"):
+                raise RuntimeError("(kInvalidParameter): Object is incompatible with this method")
+            self.degree = self.shape.attrs.get("degree", 3)
+            self.form = MFnNurbsCurve.kPeriodic if self.shape.attrs.get("periodic") else MFnNurbsCurve.kOpen
+
+        def cvPositions(self, space=MSpace.kObject):
+            offset = standIn.scene.worldPosition(self.transform) if space == MSpace.kWorld else (0.0, 0.0, 0.0)
+            return [MPoint(*addVectors(point, offset)) for point in self.shape.attrs.get("points", [])]
+
+        # Uniform clamped knots in Maya's format unless the curve was created with its own
+        def knots(self):
+            if self.shape.attrs.get("knots"):
+                return list(self.shape.attrs["knots"])
+            spans = len(self.shape.attrs.get("points", [])) - self.degree
+            return [0.0] * self.degree + [float(i) for i in range(1, spans)] + [float(spans)] * self.degree
+
+        @property
+        def knotDomain(self):
+            knots = self.knots()
+            return knots[self.degree - 1], knots[-self.degree]
+
+    MGlobal.getActiveSelectionList = staticmethod(counter.wrap("MGlobal.getActiveSelectionList", MGlobal.getActiveSelectionList))
+    for methodName in ("getPoints", "getVertices"):
+        setattr(MFnMesh, methodName, counter.wrap(f"MFnMesh.{methodName}", getattr(MFnMesh, methodName)))
+    MFnNurbsCurve.cvPositions = counter.wrap("MFnNurbsCurve.cvPositions", MFnNurbsCurve.cvPositions)
+    MDagPath.inclusiveMatrix = counter.wrap("MDagPath.inclusiveMatrix", MDagPath.inclusiveMatrix)
+    MPlug.evaluateNumElements = counter.wrap("MPlug.evaluateNumElements", MPlug.evaluateNumElements)
+
+    om.MDGMessage = MDGMessage
+    om.MDagMessage = MDagMessage
+    om.MNodeMessage = MNodeMessage
+    om.MSceneMessage = MSceneMessage
+    om.MMessage = MMessage
+    om.MObject = MObject
+    om.MSpace = MSpace
+    om.MPoint = MPoint
+    om.MFn = MFn
+    om.MDagPath = MDagPath
+    om.MFnSingleIndexedComponent = MFnSingleIndexedComponent
+    om.MGlobal = MGlobal
+    om.MSelectionList = MSelectionList
+    om.MFnMesh = MFnMesh
+    om.MFnNurbsCurve = MFnNurbsCurve
+    om.MFnDependencyNode = MFnDependencyNode
+    om.MMatrix = MMatrix
+    om.MPlug = MPlug
+    return om
+
+
+# Installs stand-in maya modules into sys.modules. Must run before hybrid_toolbox is imported.
+def installStandIn(scene=None):
+    standIn = StandInCmds(scene)
+    counter = CallCounter()
+
+    cmdsModule = types.ModuleType("maya.cmds")
+    for attrName in dir(StandInCmds):
+        if attrName.startswith("_"):
+            continue
+        setattr(cmdsModule, attrName, counter.wrap(attrName, getattr(standIn, attrName)))
+
+    class MQtUtil(object):
+        @staticmethod
+        def mainWindow():
+            return None
+
+    openMayaUI = types.ModuleType("maya.OpenMayaUI")
+    openMayaUI.MQtUtil = MQtUtil
+    apiModule = types.ModuleType("maya.api")
+    apiModule.OpenMaya = buildOpenMayaModule(standIn, counter)
+    mayaModule = types.ModuleType("maya")
+    mayaModule.cmds = cmdsModule
+    mayaModule.OpenMayaUI = openMayaUI
+    mayaModule.api = apiModule
+
+    sys.modules["maya"] = mayaModule
+    sys.modules["maya.cmds"] = cmdsModule
+    sys.modules["maya.OpenMayaUI"] = openMayaUI
+    sys.modules["maya.api"] = apiModule
+    sys.modules["maya.api.OpenMaya"] = apiModule.OpenMaya
+    return standIn, counter
+
+
+# Scene generators______________
+# Every generator takes a StandInScene and a size so the same case can be measured at several scales.
+def buildMesh(scene, name, parent=None, pointCount=8, position=(0.0, 0.0, 0.0)):
+    transform = scene.createNode("transform", name, parent)
+    transform.attrs["translate"] = position
+    shape = scene.createNode("mesh", f"{name}Shape", transform)
+    shape.attrs["points"] = [(float(i % 2), float((i // 2) % 2), float(i // 4)) for i in range(pointCount)]
+    # Each group of four points forms a separate quad
+    shape.attrs["faces"] = [[i, i + 1, i + 3, i + 2] for i in range(0, pointCount - 3, 4)]
+    return transform
+
+
+def buildMeshScene(scene, size, depth=4):
+    parent = None
+    for level in range(depth):
+        parent = scene.createNode("transform", f"env_{level}_Grp", parent)
+    for i in range(size):
+        buildMesh(scene, f"envMesh_{i}", parent, position=(float(i), 0.0, 0.0))
+    return parent
+
+
+def buildTypedScene(scene, size):
+    buildMeshScene(scene, size)
+    for i in range(size):
+        transform = scene.createNode("transform", f"guideCurve_{i}")
+        scene.createNode("nurbsCurve", f"guideCurve_{i}Shape", transform).attrs["points"] = [(0.0, 0.0, 0.0)] * 4
+        transform = scene.createNode("transform", f"surface_{i}")
+        scene.createNode("nurbsSurface", f"surface_{i}Shape", transform)
+        transform = scene.createNode("transform", f"marker_{i}")
+        scene.createNode("locator", f"marker_{i}Shape", transform)
+
+
+def buildJointChains(scene, chainCount, chainLength, parent=None):
+    roots = []
+    for chain in range(chainCount):
+        previous = parent
+        for i in range(chainLength):
+            joint = scene.createNode("joint", f"chain_{chain}_{i}_Jnt", previous)
+            joint.attrs["translate"] = (1.0, 0.0, 0.0) if i else (0.0, float(chain), 0.0)
+            previous = joint
+            if i == 0:
+                roots.append(joint)
+    return roots
+
+
+def buildJointScene(scene, size):
+    rig = scene.createNode("transform", "crowd_Grp")
+    buildJointChains(scene, max(size // 20, 1), 20, rig)
+    return rig
+
+
+def buildLightScene(scene, size):
+    scene.plugins.add("redshift4maya")
+    mayaTypes = ["pointLight", "spotLight", "directionalLight", "areaLight"]
+    for i in range(size):
+        transform = scene.createNode("transform", f"light_{i}")
+        scene.createNode(mayaTypes[i % len(mayaTypes)], f"light_{i}Shape", transform)
+        transform = scene.createNode("transform", f"rsLight_{i}")
+        scene.createNode("RedshiftPhysicalLight", f"rsLight_{i}Shape", transform)
+
+
+def buildAnimatedHierarchy(scene, size):
+    root = scene.createNode("transform", "character_Grp")
+    parent = root
+    curveTypes = ["animCurveTL", "animCurveTA", "animCurveTU"]
+    for i in range(size):
+        node = scene.createNode("transform", f"ctrl_{i}", parent if i % 10 else root)
+        parent = node
+        for axis, curveType in enumerate(curveTypes):
+            curve = scene.createNode(curveType, f"ctrl_{i}_anim_{axis}")
+            curve.attrs["keys"] = [1.0, 60.0] if i % 2 else [500.0]
+            scene.connect(curve, "output", node, f"attr{axis}")
+    return root
+
+
+def buildConstraintRig(scene, size):
+    drivers = scene.createNode("transform", "drivers_Grp")
+    driven = scene.createNode("transform", "driven_Grp")
+    for i in range(size):
+        driver = scene.createNode("transform", f"driver_{i}", drivers)
+        child = scene.createNode("transform", f"driven_{i}", driven)
+        constraint = scene.createNode("parentConstraint", f"driven_{i}_parentConstraint1", child)
+        scene.connect(driver, "parentMatrix[0]", constraint, "target[0].targetParentMatrix")
+        scene.connect(child, "parentInverseMatrix[0]", constraint, "constraintParentInverseMatrix")
+        ikJoint = scene.createNode("joint", f"ikJoint_{i}", driven)
+        scene.createNode("ikHandle", f"ikHandle_{i}", ikJoint)
+    return driven
+
+
+def buildBlendShapeScene(scene, size):
+    for i in range(size):
+        base = buildMesh(scene, f"face_{i}")
+        blendShape = scene.createNode("blendShape", f"face_{i}_blendShape")
+        tweak = scene.createNode("tweak", f"face_{i}_tweak")
+        skin = scene.createNode("skinCluster", f"face_{i}_skinCluster")
+        for t in range(3):
+            target = buildMesh(scene, f"face_{i}_target_{t}")
+            scene.connect(scene.shapeOf(target), "worldMesh[0]", blendShape, f"inputTarget[0].inputTargetGroup[{t}]")
+        blendShape.attrs["weight"] = [1.0] * 3
+        scene.connect(blendShape, "outputGeometry[0]", tweak, "input[0].inputGeometry")
+        scene.connect(tweak, "outputGeometry[0]", skin, "input[0].inputGeometry")
+        scene.connect(skin, "outputGeometry[0]", scene.shapeOf(base), "inMesh")
+
+
+def buildCurve(scene, name, cvCount):
+    transform = scene.createNode("transform", name)
+    shape = scene.createNode("nurbsCurve", f"{name}Shape", transform)
+    shape.attrs["points"] = [(float(i), float(i % 3), 0.0) for i in range(cvCount)]
+    return transform
+
+
+def buildObjectRow(scene, size):
+    objects = []
+    for i in range(size):
+        kind = i % 3
+        if kind == 0:
+            objects.append(buildMesh(scene, f"prop_{i}", position=(float(i), 0.0, 0.0)))
+        elif kind == 1:
+            transform = scene.createNode("transform", f"prop_{i}")
+            transform.attrs["translate"] = (float(i), 1.0, 0.0)
+            scene.createNode("locator", f"prop_{i}Shape", transform)
+            objects.append(transform)
+        else:
+            joint = scene.createNode("joint", f"prop_{i}")
+            joint.attrs["translate"] = (float(i), 2.0, 0.0)
+            objects.append(joint)
+    return objects
+
+
+def buildProjectGroups(scene):
+    scene.createNode("transform", "Deformers_Grp")
+
+
+def selectNodes(scene, nodes):
+    scene.selection = [(node, "") for node in nodes]
+
+
+# Benchmark cases______________
+# A case builds a scene for a given size, prepares the toolbox window and runs one toolbox action.
+class BenchmarkCase(object):
+    def __init__(self, name, build, run):
+        self.name = name
+        self.build = build
+        self.run = run
+
+
+def selectionCase(name, build, method, searchCurrent=False, select=None):
+    def prepare(scene, size):
+        build(scene, size)
+        buildProjectGroups(scene)
+        return select(scene) if select else None
+
+    def run(gui, scene, selection):
+        gui.selectSearchCurrentChoice = searchCurrent
+        if selection:
+            selectNodes(scene, selection)
+        getattr(gui, method)()
+
+    return BenchmarkCase(name, prepare, run)
+
+
+def creationCase(name, build, run):
+    def prepare(scene, size):
+        buildProjectGroups(scene)
+        return build(scene, size)
+
+    return BenchmarkCase(name, prepare, run)
+
+
+def selectComponents(scene, mesh, count):
+    scene.selection = [(mesh, f".vtx[{i}]") for i in range(count)]
+
+
+def benchmarkCases():
+    def firstRoot(scene):
+        return [scene.find("env_0_Grp")]
+
+    def deepLeaves(scene):
+        return [n for n in scene.nodes.values() if n.type == "transform" and n.name.startswith("envMesh_")]
+
+    def buildVertexMesh(scene, size):
+        return buildMesh(scene, "dense_Mesh", pointCount=size)
+
+    def runOnVertices(method, **choices):
+        def run(gui, scene, mesh):
+            for name, value in choices.items():
+                setattr(gui, name, value)
+            selectComponents(scene, mesh, len(scene.componentPoints(mesh)))
+            getattr(gui, method)()
+        return run
+
+    def repeated(method, divisor):
+        def run(gui, scene, size):
+            for i in range(max(size // divisor, 1)):
+                getattr(gui, method)()
+        return run
+
+    def buildCurvesToCombine(scene, size):
+        return [buildCurve(scene, f"ctrlPiece_{i}", 8) for i in range(max(size // 50, 2))]
+
+    def buildCurvePrefixGroups(scene, size):
+        return [buildCurve(scene, f"faceCtrl{i // 3}_{i % 3}", 8) for i in range(size)]
+
+    def runWithSelection(method):
+        def run(gui, scene, nodes):
+            selectNodes(scene, nodes)
+            getattr(gui, method)()
+        return run
+
+    def buildConstraintSelection(scene, size):
+        buildConstraintRig(scene, size)
+        return [scene.find("driver_0")] + [scene.find(f"driven_{i}") for i in range(size)]
+
+    def runConstraints(gui, scene, nodes):
+        selectNodes(scene, [nodes[0]] + [scene.createNode("transform", f"free_{i}") for i in range(len(nodes) - 1)])
+        gui.createMultipleConstraints()
+
+    def runBake(gui, scene, nodes):
+        selectNodes(scene, nodes[1:])
+        gui.convertConstraintsToAnim()
+
+    def returnSize(scene, size):
+        return size
+
+    return [
+        selectionCase("selectAllMeshes", buildTypedScene, "selectAllMeshes"),
+        selectionCase("selectAllMeshes (search)", buildTypedScene, "selectAllMeshes", True, firstRoot),
+        selectionCase("selectAllCurves", buildTypedScene, "selectAllCurves"),
+        selectionCase("selectAllNurbsSurfaces", buildTypedScene, "selectAllNurbsSurfaces"),
+        selectionCase("selectAllLocators", buildTypedScene, "selectAllLocators"),
+        selectionCase("selectHierarchy", buildMeshScene, "selectHierarchy", select=firstRoot),
+        selectionCase("findRoot", buildMeshScene, "findRoot", select=deepLeaves),
+        selectionCase("selectAllJointRoots", buildJointScene, "selectAllJointRoots"),
+        selectionCase("selectAllJointRoots (search)", buildJointScene, "selectAllJointRoots", True,
+                      lambda scene: [scene.find("crowd_Grp")]),
+        selectionCase("selectJointHierarchy", buildJointScene, "selectJointHierarchy",
+                      select=lambda scene: [scene.find("chain_0_19_Jnt")]),
+        selectionCase("selectAllLights", buildLightScene, "selectAllLights"),
+        selectionCase("selectAllMayaLights", buildLightScene, "selectAllMayaLights"),
+        selectionCase("selectAnimationCurves", buildAnimatedHierarchy, "selectAnimationCurves"),
+        selectionCase("selectAnimationCurves (search)", buildAnimatedHierarchy, "selectAnimationCurves", True,
+                      lambda scene: [scene.find("character_Grp")]),
+        selectionCase("selectAllConstraints", buildConstraintRig, "selectAllConstraints"),
+        selectionCase("selectAllIKHandles", buildConstraintRig, "selectAllIKHandles"),
+        selectionCase("selectBlendshapeMeshes", buildBlendShapeScene, "selectBlendshapeMeshes",
+                      select=lambda scene: [n for n in scene.nodes.values() if n.type == "transform" and n.name.count("_") == 1]),
+        creationCase("createLocatorsAtVerts", buildVertexMesh, runOnVertices("createLocatorsAtVerts")),
+        creationCase("createLocatorsAtVerts (markers)", buildVertexMesh,
+                     runOnVertices("createLocatorsAtVerts", locatorOutputChoice="markers")),
+        creationCase("locatorAtCenterVerts", buildVertexMesh, runOnVertices("locatorAtCenterVerts")),
+        creationCase("locatorAtCenterVerts (per island)", buildVertexMesh,
+                     runOnVertices("locatorAtCenterVerts", centerPerIslandChoice=True, centerModeChoice="area")),
+        creationCase("createGlobalControl (x size/10)", returnSize, repeated("createGlobalControl", 10)),
+        creationCase("createJointChain (x size/50)", returnSize, repeated("createJointChain", 50)),
+        creationCase("createLibraryControls", lambda scene, size: [scene.createNode("transform", f"face_{i}_Loc") for i in range(size)],
+                     runWithSelection("createLibraryControls")),
+        creationCase("createCustomControl", buildCurvesToCombine, runWithSelection("createCustomControl")),
+        creationCase("createCustomControl (by prefix)", buildCurvePrefixGroups,
+                     lambda gui, scene, nodes: (setattr(gui, "customControlModeChoice", "prefix"),
+                                                runWithSelection("createCustomControl")(gui, scene, nodes))),
+        creationCase("setCustomControlColor", lambda scene, size: [buildCurve(scene, f"ctrl_{i}", 4) for i in range(size)],
+                     runWithSelection("setCustomControlColor")),
+        creationCase("createCurveAtObjects", buildObjectRow, runWithSelection("createCurveAtObjects")),
+        creationCase("clusterAtCV", lambda scene, size: [buildCurve(scene, "spine_Crv", size)], runWithSelection("clusterAtCV")),
+        creationCase("clusterAtCV (skin)", lambda scene, size: [buildCurve(scene, "spine_Crv", size)],
+                     lambda gui, scene, nodes: (setattr(gui, "clusterModeChoice", "skin"),
+                                                runWithSelection("clusterAtCV")(gui, scene, nodes))),
+        creationCase("jointsAtCVs", lambda scene, size: [buildCurve(scene, "tail_Crv", size)], runWithSelection("jointsAtCVs")),
+        creationCase("jointsAtObjects", buildObjectRow, runWithSelection("jointsAtObjects")),
+        creationCase("jointsAtCVs (even spacing)", lambda scene, size: [buildCurve(scene, "tail_Crv", size)],
+                     lambda gui, scene, nodes: (gui.jointResampleCheckbox.setChecked(True),
+                                                runWithSelection("jointsAtCVs")(gui, scene, nodes))),
+        creationCase("createMultipleConstraints", buildConstraintSelection, runConstraints),
+        creationCase("convertConstraintsToAnim", buildConstraintSelection, runBake),
+    ]
+
+
+# Runner______________
+def runCase(case, size, standIn, counter, guiClass, undoMode="chunk"):
+    scene = StandInScene()
+    standIn.scene = scene
+    prepared = case.build(scene, size)
+    gui = guiClass("Hybrid Toolbox Benchmark")
+    gui.undoRunner.mode = undoMode
+    result = {"name": case.name, "size": size, "error": None}
+    counter.reset()
+    start = time.perf_counter()
+    try:
+        case.run(gui, scene, prepared)
+    except Exception as error:
+        result["error"] = f"{type(error).__name__}: {error}"
+    result["time"] = time.perf_counter() - start
+    # Every action has to leave undo as it found it, errors included
+    if scene.undoChunks or not scene.undoState:
+        result["error"] = (result["error"] or "") + f" undo left open ({scene.undoChunks} chunks, state {scene.undoState})"
+    result["calls"] = counter.total()
+    result["counts"] = dict(counter.counts)
+    result["nodes"] = len(scene.nodes)
+    gui.close()
+    gui.deleteLater()
+    return result
+
+
+def formatTopCommands(counts, limit=3):
+    top = sorted(counts.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return ", ".join(f"{name} {count}" for name, count in top)
+
+
+# Runs SceneIndex against StandInSceneBackend and checks lookups are served from the cache until a scene
+# callback invalidates it, and that only hierarchy lookups list the whole scene. Returns a description of every mismatch.
+def checkSceneIndex(sceneIndexClass):
+    backend = StandInSceneBackend([
+        ("|rig", "transform"), ("|rig|arm", "joint"), ("|rig|arm|hand", "joint"),
+        ("|rig|ctrl", "transform"), ("|rig|ctrl|ctrlShape", "nurbsCurve"), ("|key", "pointLight"),
+    ], NODE_TYPE_PARENTS)
+    index = sceneIndexClass(backend)
+    index.install()
+    problems = []
+
+    def expect(label, actual, expected):
+        if actual != expected:
+            problems.append(f"SceneIndex {label}: expected {expected!r}, got {actual!r}")
+
+    # Type lookups on a dirty index run one typed query each instead of listing the whole scene
+    expect("joints", index.nodesOfType("joint"), ["|rig|arm", "|rig|arm|hand"])
+    hits = index.hits
+    expect("joints again", index.nodesOfType("joint"), ["|rig|arm", "|rig|arm|hand"])
+    expect("hits for a repeated lookup", index.hits, hits + 1)
+    expect("curve transforms", index.transformsOfType("nurbsCurve"), ["|rig|ctrl"])
+    expect("lights", index.nodesOfType("light"), ["|key"])
+    expect("queries before a hierarchy lookup", (index.rebuilds, backend.listCalls, backend.typedCalls), (0, 0, 3))
+    # Hierarchy lookups build the full index, which then answers type lookups too
+    expect("descendants", index.descendantsOf(["|rig"], "joint"), ["|rig|arm", "|rig|arm|hand"])
+    expect("joints from the index", index.nodesOfType("joint"), ["|rig|arm", "|rig|arm|hand"])
+    expect("queries before a scene change", (index.rebuilds, backend.listCalls, backend.typedCalls), (1, 1, 3))
+
+    backend.addNode("|rig|arm|hand|finger", "joint")
+    expect("changes after adding a node", index.changes, 1)
+    expect("joints after adding a node", index.nodesOfType("joint"), ["|rig|arm", "|rig|arm|hand", "|rig|arm|hand|finger"])
+    backend.reparent("|rig|arm|hand", "|rig|ctrl")
+    expect("children after reparenting", index.childrenOf("|rig|ctrl"), ["|rig|ctrl|ctrlShape", "|rig|ctrl|hand"])
+    backend.removeNode("|rig|ctrl|hand")
+    expect("joints after removing a node", index.nodesOfType("joint"), ["|rig|arm"])
+    expect("queries after scene changes", (index.rebuilds, backend.listCalls, backend.typedCalls), (2, 2, 5))
+
+    index.uninstall()
+    backend.addNode("|loose", "joint")
+    expect("joints after uninstalling", index.nodesOfType("joint"), ["|rig|arm"])
+    expect("callbacks after uninstalling", backend.callbacks, {})
+    return problems
+
+
+# Runs every case at two sizes and flags actions that fail or whose Maya call count grows faster than the scene
+def runBenchmarks(baseSize=200, growth=4, caseFilter=None, tolerance=1.5, stream=sys.stdout, undoMode="chunk"):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    standIn, counter = installStandIn()
+    import hybrid_toolbox
+    app = hybrid_toolbox.QtWidgets.QApplication.instance() or hybrid_toolbox.QtWidgets.QApplication([])
+    # Error windows need Maya's main window, so surface them as exceptions instead
+    def raiseError(message):
+        raise RuntimeError(message)
+    hybrid_toolbox.openErrorWindow = raiseError
+
+    regressions = checkSceneIndex(hybrid_toolbox.SceneIndex)
+    header = f"{'action':<34}{'size':>7}{'time ms':>10}{'calls':>8}{'x size':>8}{'x calls':>9}  top commands"
+    stream.write(header + "\n" + "-" * len(header) + "\n")
+    for case in benchmarkCases():
+        if caseFilter and caseFilter not in case.name:
+            continue
+        small = runCase(case, baseSize, standIn, counter, hybrid_toolbox.HybridToolboxGUI, undoMode)
+        large = runCase(case, baseSize * growth, standIn, counter, hybrid_toolbox.HybridToolboxGUI, undoMode)
+        app.processEvents()
+        callGrowth = large["calls"] / float(max(small["calls"], 1))
+        for result in (small, large):
+            line = (f"{result['name']:<34}{result['size']:>7}{result['time'] * 1000.0:>10.1f}{result['calls']:>8}"
+                    f"{'' if result is small else growth:>8}{'' if result is small else f'{callGrowth:.1f}':>9}"
+                    f"  {result['error'] or formatTopCommands(result['counts'])}")
+            stream.write(line + "\n")
+        # A failing action makes few calls, so errors are regressions of their own
+        for result in (small, large):
+            if result["error"]:
+                regressions.append(f"{case.name} at size {result['size']}: {result['error'].strip()}")
+        if callGrowth > growth * tolerance:
+            regressions.append(f"{case.name}: Maya calls grew {callGrowth:.1f}x for {growth}x scene size")
+    if regressions:
+        stream.write("\nRegressions:\n" + "\n".join(f"  {r}" for r in regressions) + "\n")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark hybrid_toolbox against a stand-in Maya scene.")
+    parser.add_argument("--size", type=int, default=200, help="Base scene size for every case.")
+    parser.add_argument("--growth", type=int, default=4, help="Factor between the small and large run of each case.")
+    parser.add_argument("--case", default=None, help="Only run cases whose name contains this text.")
+    parser.add_argument("--check", action="store_true", help="Exit with an error when any action fails or scales superlinearly.")
+    parser.add_argument("--fast-bulk", action="store_true", help="Run the tools with undo recording turned off, which clears undo history.")
+    args = parser.parse_args(argv)
+    regressions = runBenchmarks(args.size, args.growth, args.case, undoMode="suspend" if args.fast_bulk else "chunk")
+    return 1 if args.check and regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())